@@ -4,18 +4,31 @@ import json
 import pandas as pd
 import hashlib
 import platform
-import uuid
 import base64
 import io
-from reportlab.lib.pagesizes import A4, letter
+import calendar
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm, mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.pdfgen import canvas
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+from record_store import fils_to_kd
+from ledger_file import ledger_exists, ledger_lock, ledger_size, remove_ledger, write_ledger
+from static_site import SITE_DIR, remove_site, site_exists, site_files, write_site
+from report_scheduler import ReportScheduler
+from render_profiler import BUCKETS_MS, RenderProfiler
+from tracing import span, write_metrics
+from pdf_reports import create_pdf_content, create_monthly_report_pdf, create_event_report_pdf, create_all_events_report_pdf, create_budget_report_pdf, create_ytd_report_pdf, create_fundraising_report_pdf
+from report_pack import artifact_cache_key, build_report_pack
+from finance_core import (
+    EVENT_STATUSES, PAYMENT_METHODS, committee_members, use_state, format_kd,
+    add_transaction, get_budget_lines, rename_budget_category, get_archive_summaries, get_report_years, get_closable_years, close_fiscal_year,
+    create_event_budget, get_event, get_event_rollup, update_event_status, get_event_balances, add_event_participant, add_event_expense,
+    parse_roster_csv, import_event_roster, search_participants, get_participant_history, find_duplicate_payments, verify_event_rollups, rebuild_event_rollups,
+    add_fundraising_initiative, get_goal_progress,
+    generate_monthly_report, generate_ytd_report, generate_event_report, generate_all_events_report, generate_fundraising_report, build_report_pack_jobs,
+    build_recurring_report_jobs,
+    build_dashboard_data, build_static_site, build_backup, build_parquet_snapshot, read_backup, restore_backup, load_disk_state, ledger_file_kept
+)
 
 # Set page configuration
 st.set_page_config(
@@ -202,45 +215,28 @@ def get_device_type():
 if 'device_type' not in st.session_state:
     st.session_state.device_type = get_device_type()
 
-if 'transactions' not in st.session_state:
-    st.session_state.transactions = []
-
-if 'budget' not in st.session_state:
-    st.session_state.budget = {
-        "income": {
-            "Fundraising Events": {"budget": 0, "actual": 0},
-            "Merchandise Sales": {"budget": 0, "actual": 0},
-            "Sponsorships": {"budget": 0, "actual": 0},
-            "Trip Payments": {"budget": 0, "actual": 0},  # Added for trip payments
-            "Other Income": {"budget": 0, "actual": 0}
-        },
-        "expenses": {
-            "Event Expenses": {"budget": 0, "actual": 0},
-            "Merchandise Production": {"budget": 0, "actual": 0},
-            "Marketing/Promotion": {"budget": 0, "actual": 0},
-            "Yearbook": {"budget": 0, "actual": 0},
-            "Graduation": {"budget": 0, "actual": 0},
-            "School Trips": {"budget": 0, "actual": 0},
-            "Transportation": {"budget": 0, "actual": 0},  # Added for trip transportation costs
-            "Tickets & Admissions": {"budget": 0, "actual": 0},  # Added for trip tickets
-            "Emergency Reserve": {"budget": 0, "actual": 0},
-            "Other Expenses": {"budget": 0, "actual": 0}
-        }
-    }
+# The bookkeeping state lives in the session (see finance_core.init_state)
+use_state(st.session_state)
 
-if 'events' not in st.session_state:
-    st.session_state.events = []
+# Whether the dashboard, budget and events are published as static files (see static_site)
+if 'static_site' not in st.session_state:
+    st.session_state.static_site = site_exists()
 
-# New session state for event participants (students paying for trips)
-if 'event_participants' not in st.session_state:
-    st.session_state.event_participants = []
+# data_version of the last viewer snapshot this session published
+if 'published_version' not in st.session_state:
+    st.session_state.published_version = 0
 
-# New session state for event expenses (detailed expenses for each event)
-if 'event_expenses' not in st.session_state:
-    st.session_state.event_expenses = []
+# Rendered report pack artifacts, keyed by content hash
+if 'report_pack_cache' not in st.session_state:
+    st.session_state.report_pack_cache = {}
 
-if 'fundraising' not in st.session_state:
-    st.session_state.fundraising = []
+# Recurring reports precomputed for this session's data (see report_scheduler),
+# and the data_version they were last scheduled for
+if 'report_scheduler' not in st.session_state:
+    st.session_state.report_scheduler = ReportScheduler()
+
+if 'scheduled_version' not in st.session_state:
+    st.session_state.scheduled_version = None
 
 # Authentication state variables
 if 'authenticated' not in st.session_state:
@@ -252,388 +248,12 @@ if 'user_role' not in st.session_state:
 if 'username' not in st.session_state:
     st.session_state.username = None
 
-# Committee members
-committee_members = {
-    "Chair": "TBD",
-    "Deputy Chair": "TBD",
-    "Treasurer": "Deema Abououf",
-    "Secretary": "TBD",
-    "Events Coordinator": "TBD"
-}
-
-# Authorization levels based on the matrix
-auth_levels = {
-    "Under 100 KD": ["Chair"],
-    "Over 100 KD": ["Chair", "School Admin"],
-    "New Category": ["Committee Vote"]
-}
+# Render timings of every session of this app process, shown in Settings (see render_profiler)
+@st.cache_resource
+def get_render_profiler():
+    return RenderProfiler()
 
-# PDF Generation Functions
-def create_pdf_content(title, content_elements):
-    """Create PDF content with the given title and elements"""
-    buffer = io.BytesIO()
-    
-    # Create the PDF object, using BytesIO as its "file"
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=letter,
-        leftMargin=inch,
-        rightMargin=inch,
-        topMargin=inch,
-        bottomMargin=inch
-    )
-    
-    # Container for the elements
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
-    
-    # Add title
-    elements.append(Paragraph(title, title_style))
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add date
-    elements.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add content elements
-    elements.extend(content_elements)
-    
-    # Footer
-    elements.append(Spacer(1, 0.5*inch))
-    elements.append(Paragraph("Year 11 Committee Financial Management System", normal_style))
-    
-    # Build the PDF
-    doc.build(elements)
-    
-    # Get the value of the BytesIO buffer
-    pdf = buffer.getvalue()
-    buffer.close()
-    
-    return pdf
-
-def create_monthly_report_pdf(report, month_name, year):
-    """Generate a PDF for the monthly report"""
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
-    
-    elements = []
-    
-    # Add summary section
-    elements.append(Paragraph("Financial Summary", subtitle_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    # Summary data table
-    summary_data = [
-        ["Metric", "Amount"],
-        ["Total Income", f"KD {report['total_income']:.2f}"],
-        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
-        ["Net", f"KD {report['net']:.2f}"],
-        ["Current Balance", f"KD {report['current_balance']:.2f}"],
-        ["Emergency Reserve", f"KD {report['emergency_reserve']:.2f}"],
-        ["Available Funds", f"KD {report['available_funds']:.2f}"]
-    ]
-    
-    # Create the summary table
-    summary_table = Table(summary_data, colWidths=[3*inch, 1.5*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Transactions table if there are any
-    if report['transactions']:
-        elements.append(Paragraph("Transactions", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        # Create a dataframe for easier manipulation
-        transactions_df = pd.DataFrame(report['transactions'])
-        
-        # Prepare table data
-        table_data = [["Date", "Description", "Category", "Income", "Expense", "Authorized By"]]
-        
-        for _, row in transactions_df.iterrows():
-            table_data.append([
-                row.get("date", ""),
-                row.get("description", ""),
-                row.get("category", ""),
-                f"KD {row.get('income', 0):.2f}" if row.get('income', 0) > 0 else "",
-                f"KD {row.get('expense', 0):.2f}" if row.get('expense', 0) > 0 else "",
-                row.get("authorized_by", "")
-            ])
-        
-        # Create the transactions table
-        trans_table = Table(table_data, colWidths=[1*inch, 1.5*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch])
-        trans_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(trans_table)
-    else:
-        elements.append(Paragraph("No transactions for this period.", normal_style))
-    
-    # Generate the PDF
-    title = f"Monthly Financial Report - {month_name} {year}"
-    return create_pdf_content(title, elements)
-
-def create_event_report_pdf(report):
-    """Generate a PDF for an individual event report"""
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
-    
-    elements = []
-    
-    event = report["event"]
-    event_title = f"Event Report: {event['name']}"
-    
-    # Event details section
-    elements.append(Paragraph("Event Details", subtitle_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    details_data = [
-        ["Detail", "Value"],
-        ["Date", event['date']],
-        ["Location", event['location']],
-        ["Type", event.get('event_type', '')],
-        ["Status", event['status']],
-        ["Coordinator", event['coordinator']],
-        ["Price per Person", f"KD {event.get('price_per_person', 0):.2f}"],
-        ["Target Participants", str(event.get('target_participants', 0))]
-    ]
-    
-    details_table = Table(details_data, colWidths=[2*inch, 3*inch])
-    details_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(details_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Financial summary
-    elements.append(Paragraph("Financial Summary", subtitle_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    summary_data = [
-        ["Metric", "Amount"],
-        ["Total Income", f"KD {report['total_payments']:.2f}"],
-        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
-        ["Profit", f"KD {report['profit']:.2f}"],
-        ["Participants", f"{report['participant_count']}"],
-        ["Target", f"{event['target_participants']}"]
-    ]
-    
-    # Calculate participation rate
-    if event['target_participants'] > 0:
-        participation_rate = report['participant_count'] / event['target_participants'] * 100
-        summary_data.append(["Participation Rate", f"{participation_rate:.1f}%"])
-    
-    summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Expense breakdown by category
-    if report["expense_breakdown"]:
-        elements.append(Paragraph("Expense Breakdown", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        expense_data = [["Category", "Amount", "Percentage"]]
-        
-        for category, amount in report["expense_breakdown"].items():
-            percentage = amount / report['total_expenses'] * 100 if report['total_expenses'] > 0 else 0
-            expense_data.append([
-                category,
-                f"KD {amount:.2f}",
-                f"{percentage:.1f}%"
-            ])
-        
-        expense_table = Table(expense_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-        expense_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(expense_table)
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Participant list
-    if report["participants"]:
-        elements.append(Paragraph("Participant List", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        participant_data = [["Name", "Amount", "Date", "Method", "Notes"]]
-        
-        for participant in report["participants"]:
-            participant_data.append([
-                participant.get("participant_name", ""),
-                f"KD {participant.get('payment_amount', 0):.2f}",
-                participant.get("payment_date", ""),
-                participant.get("payment_method", ""),
-                participant.get("notes", "")
-            ])
-        
-        participant_table = Table(participant_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1*inch, 1.5*inch])
-        participant_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(participant_table)
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Expense list
-    if report["expenses"]:
-        elements.append(Paragraph("Expense List", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        expense_list_data = [["Description", "Amount", "Date", "Category", "Paid To", "Receipt #"]]
-        
-        for expense in report["expenses"]:
-            expense_list_data.append([
-                expense.get("description", ""),
-                f"KD {expense.get('amount', 0):.2f}",
-                expense.get("date", ""),
-                expense.get("category", ""),
-                expense.get("paid_to", ""),
-                expense.get("receipt_num", "")
-            ])
-        
-        expense_list_table = Table(expense_list_data, colWidths=[1.5*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch, 0.8*inch])
-        expense_list_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(expense_list_table)
-    
-    # Generate the PDF
-    return create_pdf_content(event_title, elements)
-
-def create_all_events_report_pdf(report):
-    """Generate a PDF for the all events summary report"""
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
-    
-    elements = []
-    
-    # Overall summary
-    elements.append(Paragraph("Financial Summary", subtitle_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    summary_data = [
-        ["Metric", "Amount"],
-        ["Total Income", f"KD {report['total_income']:.2f}"],
-        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
-        ["Total Profit", f"KD {report['total_profit']:.2f}"],
-        ["Total Events", f"{report['event_count']}"]
-    ]
-    
-    summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Events table
-    if report["events"]:
-        elements.append(Paragraph("Event Summary", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        events_data = [["Event Name", "Date", "Type", "Participants", "Income", "Expenses", "Profit", "Status"]]
-        
-        for event in report["events"]:
-            events_data.append([
-                event.get("name", ""),
-                event.get("date", ""),
-                event.get("event_type", ""),
-                str(event.get("participants", 0)),
-                f"KD {event.get('income', 0):.2f}",
-                f"KD {event.get('expenses', 0):.2f}",
-                f"KD {event.get('profit', 0):.2f}",
-                event.get("status", "")
-            ])
-        
-        # Create the events table with adjusted column widths
-        events_table = Table(events_data, colWidths=[1.2*inch, 0.8*inch, 0.8*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.8*inch])
-        events_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(events_table)
-    else:
-        elements.append(Paragraph("No events found.", normal_style))
-    
-    # Generate the PDF
-    title = "All Events Financial Summary"
-    return create_pdf_content(title, elements)
+render_profiler = get_render_profiler()
 
 def get_pdf_download_link(pdf_bytes, filename, button_text="Download PDF Report"):
     """Generate a link to download the PDF file"""
@@ -641,350 +261,12 @@ def get_pdf_download_link(pdf_bytes, filename, button_text="Download PDF Report"
     href = f'<a href="data:application/pdf;base64,{b64}" download="{filename}"><button style="background-color: #4CAF50; color: white; padding: 12px 20px; border: none; border-radius: 4px; cursor: pointer; width: 100%;">{button_text}</button></a>'
     return href
 
-# Helper functions
-def get_balance():
-    total_income = sum(t["income"] for t in st.session_state.transactions)
-    total_expenses = sum(t["expense"] for t in st.session_state.transactions)
-    return total_income - total_expenses
-
-def get_emergency_reserve():
-    # Calculate 15% of total income
-    total_income = sum(t["income"] for t in st.session_state.transactions)
-    return total_income * 0.15
-
-def get_required_authorization(amount, category):
-    # Check if this is a new category
-    is_new_category = True
-    for section in ["income", "expenses"]:
-        if category in st.session_state.budget[section]:
-            is_new_category = False
-            break
-    
-    if is_new_category:
-        return ["Committee Vote"]
-    elif float(amount) > 100:
-        return auth_levels["Over 100 KD"]
-    else:
-        return auth_levels["Under 100 KD"]
-
-def add_transaction(date, description, category, income=0, expense=0, authorized_by="", receipt_num="", notes="", event_id=None):
-    # Validate transaction
-    if not description or not category:
-        return False, "Description and category are required"
-    
-    # Check authorization based on amount
-    amount = max(income, expense)
-    required_auth = get_required_authorization(amount, category)
-    if authorized_by not in required_auth and "Committee Vote" not in required_auth:
-        return False, f"This transaction requires authorization from: {', '.join(required_auth)}"
-    
-    # Add transaction
-    transaction = {
-        "date": date,
-        "description": description,
-        "category": category,
-        "income": float(income),
-        "expense": float(expense),
-        "authorized_by": authorized_by,
-        "receipt_num": receipt_num,
-        "notes": notes,
-        "timestamp": datetime.datetime.now().isoformat(),
-        "event_id": event_id  # Link to event if applicable
-    }
-    st.session_state.transactions.append(transaction)
-    
-    # Update budget actuals
-    if income > 0:
-        if category in st.session_state.budget["income"]:
-            st.session_state.budget["income"][category]["actual"] += float(income)
-        else:
-            st.session_state.budget["income"]["Other Income"]["actual"] += float(income)
-    
-    if expense > 0:
-        if category in st.session_state.budget["expenses"]:
-            st.session_state.budget["expenses"][category]["actual"] += float(expense)
-        else:
-            st.session_state.budget["expenses"]["Other Expenses"]["actual"] += float(expense)
-    
-    # If linked to an event, update the event's actual income/expense
-    if event_id:
-        event = next((e for e in st.session_state.events if e.get("id") == event_id), None)
-        if event:
-            if income > 0:
-                event["actual_income"] += float(income)
-            if expense > 0:
-                event["actual_expenses"] += float(expense)
-    
-    return True, "Transaction added successfully"
-
-def generate_monthly_report(month=None, year=None):
-    now = datetime.datetime.now()
-    month = month or now.month
-    year = year or now.year
-    
-    # Filter transactions for the given month/year
-    monthly_transactions = []
-    for t in st.session_state.transactions:
-        try:
-            t_date = datetime.datetime.fromisoformat(t["timestamp"]).date()
-            if t_date.month == month and t_date.year == year:
-                monthly_transactions.append(t)
-        except (ValueError, KeyError):
-            continue
-    
-    monthly_income = sum(t["income"] for t in monthly_transactions)
-    monthly_expenses = sum(t["expense"] for t in monthly_transactions)
-    
-    report = {
-        "month": month,
-        "year": year,
-        "total_income": monthly_income,
-        "total_expenses": monthly_expenses,
-        "net": monthly_income - monthly_expenses,
-        "transactions": monthly_transactions,
-        "current_balance": get_balance(),
-        "emergency_reserve": get_emergency_reserve(),
-        "available_funds": get_balance() - get_emergency_reserve()
-    }
-    
-    return report
-
-def create_event_budget(event_name, date, location, coordinator, event_type, projected_income=0, projected_expenses=0, price_per_person=0, target_participants=0, description=""):
-    # Generate a unique ID for the event
-    event_id = str(uuid.uuid4())
-    
-    event = {
-        "id": event_id,
-        "name": event_name,
-        "date": date,
-        "location": location,
-        "coordinator": coordinator,
-        "event_type": event_type,  # New field: event type (e.g., "Trip", "Fundraiser", etc.)
-        "price_per_person": float(price_per_person),  # New field for trip pricing
-        "target_participants": int(target_participants),  # New field for target number of participants
-        "description": description,  # New field for event description
-        "projected_income": float(projected_income),
-        "projected_expenses": float(projected_expenses),
-        "actual_income": 0,
-        "actual_expenses": 0,
-        "income_sources": [],
-        "expense_items": [],
-        "status": "Planning",  # Planning, Active, Completed
-        "created_at": datetime.datetime.now().isoformat()
-    }
-    
-    st.session_state.events.append(event)
-    return True, "Event budget created successfully", event_id
-
-def add_event_participant(event_id, participant_name, payment_amount, payment_date, payment_method="Cash", notes=""):
-    """Add a participant payment to an event (e.g., trip participant)"""
-    if not event_id or not participant_name:
-        return False, "Event and participant name are required"
-    
-    # Check if the event exists
-    event = next((e for e in st.session_state.events if e.get("id") == event_id), None)
-    if not event:
-        return False, "Event not found"
-    
-    # Generate unique ID for this participant payment
-    participant_id = str(uuid.uuid4())
-    
-    # Add participant payment record
-    participant = {
-        "id": participant_id,
-        "event_id": event_id,
-        "participant_name": participant_name,
-        "payment_amount": float(payment_amount),
-        "payment_date": payment_date,
-        "payment_method": payment_method,
-        "notes": notes,
-        "timestamp": datetime.datetime.now().isoformat()
-    }
-    
-    st.session_state.event_participants.append(participant)
-    
-    # Update event actual income and create a transaction record
-    event["actual_income"] += float(payment_amount)
-    
-    # Add a transaction for this payment
-    add_transaction(
-        date=payment_date,
-        description=f"Payment from {participant_name} for {event['name']}",
-        category="Trip Payments",
-        income=float(payment_amount),
-        expense=0,
-        authorized_by=event["coordinator"],
-        receipt_num="",
-        notes=f"Participant payment for event: {event['name']}",
-        event_id=event_id
-    )
-    
-    return True, f"Added payment from {participant_name}", participant_id
-
-def add_event_expense(event_id, expense_description, expense_amount, expense_date, expense_category, paid_to="", receipt_num="", notes=""):
-    """Add an expense to an event (e.g., trip expense)"""
-    if not event_id or not expense_description:
-        return False, "Event and expense description are required"
-    
-    # Check if the event exists
-    event = next((e for e in st.session_state.events if e.get("id") == event_id), None)
-    if not event:
-        return False, "Event not found"
-    
-    # Generate unique ID for this expense
-    expense_id = str(uuid.uuid4())
-    
-    # Add expense record
-    expense = {
-        "id": expense_id,
-        "event_id": event_id,
-        "description": expense_description,
-        "amount": float(expense_amount),
-        "date": expense_date,
-        "category": expense_category,
-        "paid_to": paid_to,
-        "receipt_num": receipt_num,
-        "notes": notes,
-        "timestamp": datetime.datetime.now().isoformat()
-    }
-    
-    st.session_state.event_expenses.append(expense)
-    
-    # Update event actual expenses and create a transaction record
-    event["actual_expenses"] += float(expense_amount)
-    
-    # Add a transaction for this expense
-    add_transaction(
-        date=expense_date,
-        description=f"{expense_description} - {event['name']}",
-        category=expense_category,
-        income=0,
-        expense=float(expense_amount),
-        authorized_by=event["coordinator"],
-        receipt_num=receipt_num,
-        notes=f"Expense for event: {event['name']}",
-        event_id=event_id
-    )
-    
-    return True, f"Added expense: {expense_description}", expense_id
-
-def generate_event_report(event_id):
-    """Generate a financial report for a specific event"""
-    event = next((e for e in st.session_state.events if e.get("id") == event_id), None)
-    if not event:
+def get_precomputed_report(name, params=None):
+    """A recurring report precomputed from the current data for these parameters, or None"""
+    result = st.session_state.report_scheduler.get(name, st.session_state.data_version)
+    if result is None or result["params"] != (params or {}):
         return None
-    
-    # Get all participants for this event
-    participants = [p for p in st.session_state.event_participants if p.get("event_id") == event_id]
-    total_participant_payments = sum(p["payment_amount"] for p in participants)
-    
-    # Get all expenses for this event
-    expenses = [e for e in st.session_state.event_expenses if e.get("event_id") == event_id]
-    total_expenses = sum(e["amount"] for e in expenses)
-    
-    # Calculate profit
-    profit = total_participant_payments - total_expenses
-    
-    # Create expense breakdown by category
-    expense_categories = {}
-    for expense in expenses:
-        category = expense.get("category", "Other")
-        if category not in expense_categories:
-            expense_categories[category] = 0
-        expense_categories[category] += expense["amount"]
-    
-    # Generate report
-    report = {
-        "event": event,
-        "participants": participants,
-        "expenses": expenses,
-        "total_payments": total_participant_payments,
-        "total_expenses": total_expenses,
-        "profit": profit,
-        "expense_breakdown": expense_categories,
-        "participant_count": len(participants),
-        "expense_count": len(expenses)
-    }
-    
-    return report
-
-def generate_all_events_report():
-    """Generate a summary report for all events"""
-    if not st.session_state.events:
-        return None
-    
-    events_summary = []
-    total_income = 0
-    total_expenses = 0
-    total_profit = 0
-    
-    for event in st.session_state.events:
-        event_id = event.get("id")
-        
-        # Skip events without ID (shouldn't happen with new code)
-        if not event_id:
-            continue
-        
-        # Get participants for this event
-        participants = [p for p in st.session_state.event_participants if p.get("event_id") == event_id]
-        participant_count = len(participants)
-        participant_income = sum(p["payment_amount"] for p in participants)
-        
-        # Get expenses for this event
-        expenses = [e for e in st.session_state.event_expenses if e.get("event_id") == event_id]
-        expense_amount = sum(e["amount"] for e in expenses)
-        
-        # Calculate profit
-        profit = participant_income - expense_amount
-        
-        # Add to totals
-        total_income += participant_income
-        total_expenses += expense_amount
-        total_profit += profit
-        
-        # Create summary for this event
-        event_summary = {
-            "id": event_id,
-            "name": event["name"],
-            "date": event["date"],
-            "location": event["location"],
-            "event_type": event.get("event_type", ""),
-            "participants": participant_count,
-            "income": participant_income,
-            "expenses": expense_amount,
-            "profit": profit,
-            "status": event["status"]
-        }
-        
-        events_summary.append(event_summary)
-    
-    # Sort by date (most recent first)
-    events_summary.sort(key=lambda x: x["date"], reverse=True)
-    
-    report = {
-        "events": events_summary,
-        "total_income": total_income,
-        "total_expenses": total_expenses,
-        "total_profit": total_profit,
-        "event_count": len(events_summary)
-    }
-    
-    return report
-
-def add_fundraising_initiative(name, dates, coordinator, goal_amount):
-    initiative = {
-        "name": name,
-        "dates": dates,
-        "coordinator": coordinator,
-        "goal_amount": float(goal_amount),
-        "actual_raised": 0,
-        "expenses": 0,
-        "net_proceeds": 0,
-        "status": "Planning"  # Planning, Active, Completed
-    }
-    
-    st.session_state.fundraising.append(initiative)
-    return True, "Fundraising initiative added successfully"
+    return result
 
 # Login screen function
 def show_login():
@@ -1026,113 +308,140 @@ def show_login():
         - Username: viewer (view-only access)
         """)
 
+# Viewer snapshot
+# Viewer sessions only read. Everything the dashboard shows is materialized into a
+# snapshot by the admin session that wrote the data, once per run with writes, and
+# the snapshot is shared by every session of the app process, so a viewer session
+# only renders it.
+@st.cache_resource
+def _viewer_snapshot_slot():
+    """Process-wide holder of the latest published viewer snapshot"""
+    return {"snapshot": None}
+
+def publish_viewer_snapshot():
+    """Rebuild the shared viewer snapshot from this (admin) session's data, and return it"""
+    snapshot = build_dashboard_data()
+    snapshot["published_at"] = datetime.datetime.now()
+    # Replacing the whole snapshot in one assignment means readers never see a partial one
+    _viewer_snapshot_slot()["snapshot"] = snapshot
+    st.session_state.published_version = st.session_state.data_version
+    return snapshot
+
+def get_dashboard_data():
+    """The dashboard's data: the shared snapshot for viewers once one has been
+    published, otherwise computed from this session"""
+    if st.session_state.user_role != "admin":
+        snapshot = _viewer_snapshot_slot()["snapshot"]
+        if snapshot is not None:
+            return snapshot
+    return build_dashboard_data()
+
+def notify_ledger_file_removed():
+    """Tell the user, once, that another session removed the ledger file this one kept"""
+    if st.session_state.ledger_file_removed:
+        st.session_state.ledger_file_removed = False
+        # The checkbox would otherwise still be ticked, and write the file again
+        st.session_state.pop("keep_ledger_file", None)
+        st.warning("Another session removed the ledger file, so transactions are no longer saved to it. "
+                   "Turn it on again in Settings to start a new one.")
+
+# Static site
+def publish_static_site(snapshot=None):
+    """Write the static pages from a viewer snapshot (a fresh one if not given)"""
+    write_site(build_static_site(snapshot or publish_viewer_snapshot()))
+
 # Dashboard function - FIXED to avoid string formatting issues
 def show_dashboard():
     st.header("Financial Dashboard")
     
+    render_profiler.section("Data")
+    data = get_dashboard_data()
+    
+    render_profiler.section("Metrics")
     # Get the financial metrics
-    balance = get_balance()
-    reserve = get_emergency_reserve()
+    balance = data["balance"]
+    reserve = data["reserve"]
     available = balance - reserve
     
     # Use Streamlit's built-in metrics instead of custom HTML/CSS
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Current Balance", f"KD {balance:.2f}")
+        st.metric("Current Balance", format_kd(balance))
     
     with col2:
-        st.metric("Emergency Reserve (15%)", f"KD {reserve:.2f}")
+        st.metric("Emergency Reserve (15%)", format_kd(reserve))
     
     with col3:
-        st.metric("Available Funds", f"KD {available:.2f}")
+        st.metric("Available Funds", format_kd(available))
+    
+    if "published_at" in data:
+        st.caption(f"Figures as of {data['published_at'].strftime('%Y-%m-%d %H:%M')}")
+    
+    render_profiler.section("Cash Flow")
+    # Cash flow over time
+    st.subheader("Cash Flow")
+    
+    cash_flow = data["cash_flow"]
+    if cash_flow is not None:
+        period = st.radio("Period", ["Daily", "Weekly", "Monthly"], index=1, horizontal=True, key="cash_flow_period")
+        frame = cash_flow[period.lower()]
+        rolling_column = {"Daily": "net_30d", "Weekly": "net_4w", "Monthly": "net_3m"}[period]
+        rolling_label = {"Daily": "Net (30 days)", "Weekly": "Net (4 weeks)", "Monthly": "Net (3 months)"}[period]
+        
+        st.line_chart(frame[["balance", rolling_column]].rename(columns={
+            "balance": "Running Balance",
+            rolling_column: rolling_label
+        }))
+        st.bar_chart(frame[["income", "expenses"]].rename(columns={
+            "income": "Income",
+            "expenses": "Expenses"
+        }))
+    else:
+        st.info("No dated transactions to chart yet.")
     
+    render_profiler.section("Recent Transactions")
     # Recent transactions
     st.subheader("Recent Transactions")
     
-    if st.session_state.transactions:
-        transactions_df = pd.DataFrame(st.session_state.transactions)
-        # Sort by timestamp (newest first)
-        if "timestamp" in transactions_df.columns:
-            transactions_df = transactions_df.sort_values(by="timestamp", ascending=False)
-        # Limit to last 5
-        recent_transactions = transactions_df.head(5)
-        # Select only the columns we want to display
-        display_columns = [col for col in ["date", "description", "category", "income", "expense", "authorized_by"] 
-                           if col in recent_transactions.columns]
-        
-        # Display the dataframe
-        st.dataframe(recent_transactions[display_columns], use_container_width=True)
+    if data["recent_transactions"] is not None:
+        st.dataframe(data["recent_transactions"], use_container_width=True)
     else:
         st.info("No transactions recorded yet.")
     
+    render_profiler.section("Budget Overview")
     # Budget overview with tables
     st.subheader("Budget Overview")
     
     # Income budget vs actual
     st.subheader("Income: Budget vs. Actual")
-    income_data = []
-    for category, values in st.session_state.budget["income"].items():
-        income_data.append({
-            "Category": category,
-            "Budget": f"KD {values['budget']:.2f}",
-            "Actual": f"KD {values['actual']:.2f}",
-            "Variance": f"KD {values['actual'] - values['budget']:.2f}"
-        })
-    
-    if income_data:
-        income_df = pd.DataFrame(income_data)
-        st.dataframe(income_df, use_container_width=True)
+    if not data["budget_tables"]["income"].empty:
+        st.dataframe(data["budget_tables"]["income"], use_container_width=True)
     
     # Expense budget vs actual
     st.subheader("Expenses: Budget vs. Actual")
-    expense_data = []
-    for category, values in st.session_state.budget["expenses"].items():
-        expense_data.append({
-            "Category": category,
-            "Budget": f"KD {values['budget']:.2f}",
-            "Actual": f"KD {values['actual']:.2f}",
-            "Variance": f"KD {values['actual'] - values['budget']:.2f}"
-        })
-    
-    if expense_data:
-        expense_df = pd.DataFrame(expense_data)
-        st.dataframe(expense_df, use_container_width=True)
+    if not data["budget_tables"]["expenses"].empty:
+        st.dataframe(data["budget_tables"]["expenses"], use_container_width=True)
     
+    render_profiler.section("Upcoming Events")
     # Upcoming Events
     st.subheader("Upcoming Events")
     
-    # Filter for active and planned events
-    upcoming_events = [e for e in st.session_state.events if e.get("status") in ["Planning", "Active"]]
+    # Active and planned events, in date order
+    upcoming_window = st.radio("Show", ["All Upcoming", "Next 30 Days"], horizontal=True, key="upcoming_window")
+    events_data = [row for day, row in data["upcoming_events"]]
+    if upcoming_window == "Next 30 Days":
+        today = datetime.date.today().toordinal()
+        events_data = [row for day, row in data["upcoming_events"] if day is not None and today <= day <= today + 30]
     
-    if upcoming_events:
+    if events_data:
         # Display upcoming events in a table
-        events_data = []
-        for event in upcoming_events:
-            # Calculate profit (actual income - actual expenses)
-            profit = event.get("actual_income", 0) - event.get("actual_expenses", 0)
-            
-            # Get participant count
-            participants = [p for p in st.session_state.event_participants if p.get("event_id") == event.get("id")]
-            
-            events_data.append({
-                "Event Name": event.get("name", ""),
-                "Date": event.get("date", ""),
-                "Location": event.get("location", ""),
-                "Type": event.get("event_type", ""),
-                "Participants": len(participants),
-                "Income": f"KD {event.get('actual_income', 0):.2f}",
-                "Expenses": f"KD {event.get('actual_expenses', 0):.2f}",
-                "Profit": f"KD {profit:.2f}",
-                "Status": event.get("status", "")
-            })
-        
-        if events_data:
-            events_df = pd.DataFrame(events_data)
-            st.dataframe(events_df, use_container_width=True)
+        events_df = pd.DataFrame(events_data)
+        st.dataframe(events_df, use_container_width=True)
     else:
         st.info("No upcoming events scheduled.")
     
+    render_profiler.section("Quick Actions")
     # Quick actions (shown only to admin users)
     if st.session_state.user_role == "admin":
         st.subheader("Quick Actions")
@@ -1172,6 +481,7 @@ def show_dashboard():
 def show_transactions():
     st.header("Transactions Management")
     
+    render_profiler.section("Add Transaction")
     # Add new transaction form
     with st.expander("Add New Transaction", expanded=True):
         # Add the responsive-form class
@@ -1210,6 +520,12 @@ def show_transactions():
                 event_names, event_ids = zip(*event_options)
                 event_index = st.selectbox("Link to Event (optional)", event_names)
                 event_id = event_ids[event_names.index(event_index)] if event_index != "None" else None
+                
+                # Option to link to a fundraising initiative
+                initiative_options = [("None", None)] + [(i["name"], i["id"]) for i in st.session_state.fundraising]
+                initiative_names, initiative_ids = zip(*initiative_options)
+                initiative_index = st.selectbox("Link to Fundraising Initiative (optional)", initiative_names)
+                initiative_id = initiative_ids[initiative_names.index(initiative_index)] if initiative_index != "None" else None
             
             # Close the mobile-stack div
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1226,7 +542,8 @@ def show_transactions():
                     authorized_by,
                     receipt_num,
                     notes,
-                    event_id
+                    event_id,
+                    initiative_id
                 )
                 
                 if success:
@@ -1237,21 +554,22 @@ def show_transactions():
         # Close the responsive-form div
         st.markdown('</div>', unsafe_allow_html=True)
     
+    render_profiler.section("Transaction History")
     # View transactions
     st.subheader("Transaction History")
     
     if st.session_state.transactions:
-        transactions_df = pd.DataFrame(st.session_state.transactions)
-        # Sort by date (newest first)
-        if "timestamp" in transactions_df.columns:
-            transactions_df = transactions_df.sort_values(by="timestamp", ascending=False)
+        # Newest first, sorted on the integer timestamps
+        transactions_df = st.session_state.transactions.to_frame(
+            st.session_state.transactions.order_by("timestamp", descending=True)
+        )
         
         # Add event name for linked transactions
         if "event_id" in transactions_df.columns:
             def get_event_name(event_id):
                 if not event_id:
                     return ""
-                event = next((e for e in st.session_state.events if e.get("id") == event_id), None)
+                event = get_event(event_id)
                 return event.get("name", "") if event else ""
             
             transactions_df["event_name"] = transactions_df["event_id"].apply(get_event_name)
@@ -1270,7 +588,7 @@ def show_transactions():
         
         # Export options
         st.subheader("Export Options")
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         
         with col1:
             if st.button("Export Transactions to CSV", use_container_width=True):
@@ -1331,6 +649,19 @@ def show_transactions():
                     get_pdf_download_link(pdf, "transactions.pdf", "Download PDF Report"),
                     unsafe_allow_html=True
                 )
+        
+        with col3:
+            if st.button("Export Transactions to Parquet", use_container_width=True):
+                # Written straight from the store's columns, with exact KD amounts and typed dates
+                parquet = io.BytesIO()
+                st.session_state.transactions.write_parquet(parquet)
+                st.download_button(
+                    label="Download Parquet",
+                    data=parquet.getvalue(),
+                    file_name="transactions.parquet",
+                    mime="application/vnd.apache.parquet",
+                    use_container_width=True
+                )
     else:
         st.info("No transactions recorded yet.")
 
@@ -1338,6 +669,7 @@ def show_transactions():
 def show_budget():
     st.header("Budget Management")
     
+    render_profiler.section("Add Category")
     # Add new budget category
     with st.expander("Add New Budget Category"):
         # Add the responsive-form class
@@ -1372,17 +704,36 @@ def show_budget():
                             st.error(f"Category '{category_name}' already exists in income categories")
                         else:
                             st.session_state.budget["income"][category_name] = {"budget": initial_budget, "actual": 0}
+                            st.session_state.data_version += 1
                             st.success(f"Added '{category_name}' to income categories")
                     else:
                         if category_name in st.session_state.budget["expenses"]:
                             st.error(f"Category '{category_name}' already exists in expense categories")
                         else:
                             st.session_state.budget["expenses"][category_name] = {"budget": initial_budget, "actual": 0}
+                            st.session_state.data_version += 1
                             st.success(f"Added '{category_name}' to expense categories")
         
         # Close the responsive-form div
         st.markdown('</div>', unsafe_allow_html=True)
     
+    render_profiler.section("Rename Category")
+    # Rename a budget category (existing transactions and expenses follow the new name)
+    with st.expander("Rename Budget Category"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            rename_type = st.radio("Category Type", ["Income", "Expenses"], key="rename_category_type")
+        
+        with col2:
+            old_name = st.selectbox("Category", list(st.session_state.budget[rename_type.lower()].keys()), key="rename_category_old")
+            new_name = st.text_input("New Name", key="rename_category_new")
+        
+        if st.button("Rename Category", use_container_width=True):
+            ok, message = rename_budget_category(rename_type.lower(), old_name, new_name)
+            st.success(message) if ok else st.error(message)
+    
+    render_profiler.section("Adjust Categories")
     # Adjust existing budget categories
     with st.expander("Adjust Budget Amounts"):
         st.subheader("Income Categories")
@@ -1412,6 +763,7 @@ def show_budget():
                                             format="%.2f")
                 if new_budget != current_budget:
                     st.session_state.budget["income"][category]["budget"] = new_budget
+                    st.session_state.data_version += 1
             
             # Close the mobile-stack div
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1440,6 +792,7 @@ def show_budget():
                                             format="%.2f")
                 if new_budget != current_budget:
                     st.session_state.budget["expenses"][category]["budget"] = new_budget
+                    st.session_state.data_version += 1
             
             # Close the mobile-stack div
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1447,38 +800,42 @@ def show_budget():
         # Close the responsive-budget div
         st.markdown('</div>', unsafe_allow_html=True)
     
+    render_profiler.section("Budget Summary")
     # Budget overview
     st.subheader("Budget Summary")
     
     # Calculate totals
-    total_income_budget = sum(values["budget"] for values in st.session_state.budget["income"].values())
-    total_income_actual = sum(values["actual"] for values in st.session_state.budget["income"].values())
-    total_expense_budget = sum(values["budget"] for values in st.session_state.budget["expenses"].values())
-    total_expense_actual = sum(values["actual"] for values in st.session_state.budget["expenses"].values())
+    income_lines = get_budget_lines("income")
+    expense_lines = get_budget_lines("expenses")
+    total_income_budget = sum(line["budget"] for line in income_lines)
+    total_income_actual = sum(line["actual"] for line in income_lines)
+    total_expense_budget = sum(line["budget"] for line in expense_lines)
+    total_expense_actual = sum(line["actual"] for line in expense_lines)
     
     # Display summary metrics
     col1, col2 = st.columns(2)
     
     with col1:
-        st.metric("Total Income Budget", f"KD {total_income_budget:.2f}")
-        st.metric("Total Income Actual", f"KD {total_income_actual:.2f}", 
-                f"{(total_income_actual - total_income_budget):.2f}")
+        st.metric("Total Income Budget", format_kd(total_income_budget))
+        st.metric("Total Income Actual", format_kd(total_income_actual), 
+                f"{fils_to_kd(total_income_actual - total_income_budget):.2f}")
     
     with col2:
-        st.metric("Total Expense Budget", f"KD {total_expense_budget:.2f}")
-        st.metric("Total Expense Actual", f"KD {total_expense_actual:.2f}", 
-                f"{(total_expense_actual - total_expense_budget):.2f}")
+        st.metric("Total Expense Budget", format_kd(total_expense_budget))
+        st.metric("Total Expense Actual", format_kd(total_expense_actual), 
+                f"{fils_to_kd(total_expense_actual - total_expense_budget):.2f}")
     
+    render_profiler.section("Budget Tables")
     # Budget tables
     # Income Budget
     st.subheader("Income Budget")
     income_data = []
-    for category, values in st.session_state.budget["income"].items():
+    for line in get_budget_lines("income"):
         income_data.append({
-            "Category": category,
-            "Budget": f"KD {values['budget']:.2f}",
-            "Actual": f"KD {values['actual']:.2f}",
-            "Variance": f"KD {values['actual'] - values['budget']:.2f}"
+            "Category": line["category"],
+            "Budget": format_kd(line["budget"]),
+            "Actual": format_kd(line["actual"]),
+            "Variance": format_kd(line["variance"])
         })
     
     if income_data:
@@ -1488,127 +845,36 @@ def show_budget():
     # Expense Budget
     st.subheader("Expense Budget")
     expense_data = []
-    for category, values in st.session_state.budget["expenses"].items():
+    for line in get_budget_lines("expenses"):
         expense_data.append({
-            "Category": category,
-            "Budget": f"KD {values['budget']:.2f}",
-            "Actual": f"KD {values['actual']:.2f}",
-            "Variance": f"KD {values['actual'] - values['budget']:.2f}"
+            "Category": line["category"],
+            "Budget": format_kd(line["budget"]),
+            "Actual": format_kd(line["actual"]),
+            "Variance": format_kd(line["variance"])
         })
     
     if expense_data:
         expense_df = pd.DataFrame(expense_data)
         st.dataframe(expense_df, use_container_width=True)
     
+    render_profiler.section("Budget Visualization")
     # Budget visualization as text
     st.subheader("Budget Visualization")
     
     # Use a container to make this section responsive
     with st.container():
-        st.write(f"Income Budget: KD {total_income_budget:.2f}, Actual: KD {total_income_actual:.2f}")
-        st.write(f"Expense Budget: KD {total_expense_budget:.2f}, Actual: KD {total_expense_actual:.2f}")
-        st.write(f"Net Budget: KD {total_income_budget - total_expense_budget:.2f}, Actual: KD {total_income_actual - total_expense_actual:.2f}")
+        st.write(f"Income Budget: {format_kd(total_income_budget)}, Actual: {format_kd(total_income_actual)}")
+        st.write(f"Expense Budget: {format_kd(total_expense_budget)}, Actual: {format_kd(total_expense_actual)}")
+        st.write(f"Net Budget: {format_kd(total_income_budget - total_expense_budget)}, Actual: {format_kd(total_income_actual - total_expense_actual)}")
     
+    render_profiler.section("Export Options")
     # Export Budget as PDF
     st.subheader("Export Options")
     
     if st.button("Export Budget to PDF", use_container_width=True):
-        # Generate PDF content
-        styles = getSampleStyleSheet()
-        title_style = styles['Heading1']
-        subtitle_style = styles['Heading2']
-        normal_style = styles['Normal']
-        
-        elements = []
-        
-        # Budget Summary
-        elements.append(Paragraph("Budget Summary", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        summary_data = [
-            ["Metric", "Amount"],
-            ["Total Income Budget", f"KD {total_income_budget:.2f}"],
-            ["Total Income Actual", f"KD {total_income_actual:.2f}"],
-            ["Total Expense Budget", f"KD {total_expense_budget:.2f}"],
-            ["Total Expense Actual", f"KD {total_expense_actual:.2f}"],
-            ["Net Budget", f"KD {total_income_budget - total_expense_budget:.2f}"],
-            ["Net Actual", f"KD {total_income_actual - total_expense_actual:.2f}"]
-        ]
-        
-        # Create the summary table
-        summary_table = Table(summary_data, colWidths=[3*inch, 1.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Income Categories
-        elements.append(Paragraph("Income Budget", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        income_table_data = [["Category", "Budget", "Actual", "Variance"]]
-        
-        for category, values in st.session_state.budget["income"].items():
-            income_table_data.append([
-                category,
-                f"KD {values['budget']:.2f}",
-                f"KD {values['actual']:.2f}",
-                f"KD {values['actual'] - values['budget']:.2f}"
-            ])
-        
-        # Create the income table
-        income_table = Table(income_table_data, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
-        income_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(income_table)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Expense Categories
-        elements.append(Paragraph("Expense Budget", subtitle_style))
-        elements.append(Spacer(1, 0.1*inch))
-        
-        expense_table_data = [["Category", "Budget", "Actual", "Variance"]]
-        
-        for category, values in st.session_state.budget["expenses"].items():
-            expense_table_data.append([
-                category,
-                f"KD {values['budget']:.2f}",
-                f"KD {values['actual']:.2f}",
-                f"KD {values['actual'] - values['budget']:.2f}"
-            ])
-        
-        # Create the expense table
-        expense_table = Table(expense_table_data, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
-        expense_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(expense_table)
-        
-        # Generate the PDF
-        pdf = create_pdf_content("Budget Report", elements)
+        # Generate the PDF, unless it is already prepared
+        precomputed = get_precomputed_report("budget")
+        pdf = precomputed["pdf"] if precomputed and precomputed["pdf"] else create_budget_report_pdf(st.session_state.budget)
         
         # Create download link
         st.markdown(
@@ -1621,10 +887,11 @@ def show_events():
     st.header("Event & Trip Management")
 
     # Add tabs for different event management sections
-    tab1, tab2, tab3 = st.tabs(["Create Events", "Manage Events", "Event Reports"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Create Events", "Manage Events", "Event Reports", "Participant Search"])
 
     # TAB 1: Create new event
     with tab1:
+        render_profiler.section("Create Events")
         st.subheader("Create New Event/Trip")
         st.markdown('<div class="responsive-form">', unsafe_allow_html=True)
         with st.form("event_form"):
@@ -1673,6 +940,7 @@ def show_events():
 
     # TAB 2: Manage existing events
     with tab2:
+        render_profiler.section("Manage Events")
         st.subheader("Manage Existing Events")
         if not st.session_state.events:
             st.info("No events created yet. Use the 'Create Events' tab to add an event.")
@@ -1681,7 +949,7 @@ def show_events():
             names, ids = zip(*options)
             selected = st.selectbox("Select event to manage", names)
             event_id = ids[names.index(selected)]
-            event = next(e for e in st.session_state.events if e["id"] == event_id)
+            event = get_event(event_id)
 
             # Event details display
             col1, col2 = st.columns(2)
@@ -1694,8 +962,9 @@ def show_events():
                 st.write(f"**Price per Person:** KD {event['price_per_person']:.2f}")
                 st.write(f"**Target Participants:** {event['target_participants']}")
                 st.write(f"**Status:** {event['status']}")
-                profit = event["actual_income"] - event["actual_expenses"]
-                st.write(f"**Current Profit:** KD {profit:.2f}")
+                rollup = get_event_rollup(event_id)
+                profit = rollup["income"] - rollup["expenses"]
+                st.write(f"**Current Profit:** {format_kd(profit)}")
 
             st.write(f"**Description:** {event.get('description','')}")
 
@@ -1703,22 +972,26 @@ def show_events():
             st.subheader("Financial Summary")
             c1, c2, c3 = st.columns(3)
             with c1:
-                st.metric("Income", f"KD {event['actual_income']:.2f}",
-                          f"{event['actual_income'] - event['projected_income']:.2f}")
+                st.metric("Income", format_kd(rollup["income"]),
+                          f"{fils_to_kd(rollup['income'] - event.fils('projected_income')):.2f}")
             with c2:
-                st.metric("Expenses", f"KD {event['actual_expenses']:.2f}",
-                          f"{event['actual_expenses'] - event['projected_expenses']:.2f}")
+                st.metric("Expenses", format_kd(rollup["expenses"]),
+                          f"{fils_to_kd(rollup['expenses'] - event.fils('projected_expenses')):.2f}")
             with c3:
-                st.metric("Profit", f"KD {profit:.2f}",
-                          f"{profit - (event['projected_income'] - event['projected_expenses']):.2f}")
+                st.metric("Profit", format_kd(profit),
+                          f"{fils_to_kd(profit - (event.fils('projected_income') - event.fils('projected_expenses'))):.2f}")
 
             # Change status
-            new_status = st.selectbox("Update Status", ["Planning", "Active", "Completed"],
-                                      index=["Planning", "Active", "Completed"].index(event["status"]))
+            new_status = st.selectbox("Update Status", EVENT_STATUSES,
+                                      index=EVENT_STATUSES.index(event["status"]))
             if new_status != event["status"]:
-                event["status"] = new_status
+                update_event_status(event_id, new_status)
                 st.success(f"Status updated to {new_status}")
 
+            # Payments and expenses are authorized like any other transaction, by default by the coordinator
+            authorizers = list(committee_members.keys()) + ["School Admin", "Committee Vote"]
+            default_authorizer = authorizers.index(event["coordinator"]) if event["coordinator"] in authorizers else 0
+            
             # Tabs for participants & expenses
             part_tab, exp_tab = st.tabs(["Manage Participants", "Manage Expenses"])
             
@@ -1734,22 +1007,79 @@ def show_events():
                         with pcol2:
                             pamt = st.number_input("Payment Amount (KD)", min_value=0.0,
                                                    value=event["price_per_person"], format="%.2f")
-                            pmethod = st.selectbox("Payment Method",
-                                                   ["Cash", "Bank Transfer", "Check", "Other"])
+                            pmethod = st.selectbox("Payment Method", PAYMENT_METHODS)
+                            pauth = st.selectbox("Authorized By", authorizers, index=default_authorizer, key=f"part_auth_{event_id}")
                         pnotes = st.text_area("Notes")
+                        pallow_duplicate = st.checkbox("Record even if an identical payment already exists")
                         psubmit = st.form_submit_button("Add Payment", use_container_width=True)
                         if psubmit:
                             if not pname:
                                 st.error("Participant name required")
                             else:
                                 ok, msg, _ = add_event_participant(
-                                    event_id, pname, pamt, pdate.strftime("%Y-%m-%d"), pmethod, pnotes
+                                    event_id, pname, pamt, pdate.strftime("%Y-%m-%d"), pmethod, pnotes,
+                                    allow_duplicate=pallow_duplicate, authorized_by=pauth
                                 )
                                 st.success(msg) if ok else st.error(msg)
 
+                with st.expander("Import Participant Roster (CSV)"):
+                    st.write("Upload a CSV with the columns **name**, **amount**, **date** (YYYY-MM-DD), "
+                             "**method** and optionally **notes**. A blank date means today and a blank method means Cash.")
+                    roster_file = st.file_uploader("Roster file", type=["csv"], key=f"roster_{event_id}")
+                    roster_allow_duplicates = st.checkbox("Import rows that duplicate recorded payments",
+                                                          key=f"roster_dupes_{event_id}")
+                    roster_auth = st.selectbox("Authorized By", authorizers, index=default_authorizer, key=f"roster_auth_{event_id}")
+                    if roster_file:
+                        try:
+                            roster_rows = parse_roster_csv(roster_file)
+                        except Exception as e:
+                            roster_rows = None
+                            st.error(f"Could not read roster file: {e}")
+                        
+                        if roster_rows is not None:
+                            st.write(f"{len(roster_rows)} rows found.")
+                            if st.button("Import Roster", key=f"import_roster_{event_id}", use_container_width=True):
+                                imported, rejected = import_event_roster(event_id, roster_rows, roster_allow_duplicates, roster_auth)
+                                st.success(f"Imported {imported} participant payments.")
+                                if rejected:
+                                    st.warning(f"{len(rejected)} rows were rejected.")
+                                    st.dataframe(pd.DataFrame(rejected).rename(columns={
+                                        "row": "Row",
+                                        "name": "Name",
+                                        "reason": "Reason"
+                                    }), use_container_width=True, hide_index=True)
+
+                balances = get_event_balances(event_id)
+                if balances["participant_count"]:
+                    st.subheader("Outstanding Balances")
+                    b1, b2, b3, b4 = st.columns(4)
+                    with b1:
+                        st.metric("Paid in Full", f"{balances['paid_in_full']}")
+                    with b2:
+                        st.metric("Part Paid", f"{balances['part_paid']}")
+                    with b3:
+                        st.metric("Outstanding", f"KD {balances['outstanding_total']:.2f}")
+                    with b4:
+                        unfilled = max(event["target_participants"] - balances["participant_count"], 0)
+                        st.metric("Unfilled Places", f"{unfilled}")
+                    
+                    if balances["owes_most"]:
+                        st.write("**Owes the most**")
+                        owes_df = pd.DataFrame(balances["owes_most"])
+                        owes_df["paid"] = owes_df["paid"].apply(lambda x: f"KD {x:.2f}")
+                        owes_df["outstanding"] = owes_df["outstanding"].apply(lambda x: f"KD {x:.2f}")
+                        st.dataframe(owes_df.rename(columns={
+                            "name": "Name",
+                            "paid": "Paid",
+                            "outstanding": "Owes",
+                            "payments": "Payments"
+                        }), use_container_width=True, hide_index=True)
+                    else:
+                        st.success("Every participant has paid in full.")
+
                 participants = [p for p in st.session_state.event_participants if p["event_id"] == event_id]
                 if participants:
-                    st.dataframe(pd.DataFrame(participants)[["participant_name", "payment_amount", "payment_date", "payment_method", "notes"]],
+                    st.dataframe(st.session_state.event_participants.to_arrow(participants).select(["participant_name", "payment_amount", "payment_date", "payment_method", "notes"]),
                                  use_container_width=True)
                 else:
                     st.info("No participant payments yet.")
@@ -1768,6 +1098,7 @@ def show_events():
                             ecat = st.selectbox("Expense Category", list(st.session_state.budget["expenses"].keys()))
                             epaid = st.text_input("Paid To")
                             ereceipt = st.text_input("Receipt #")
+                            eauth = st.selectbox("Authorized By", authorizers, index=default_authorizer, key=f"exp_auth_{event_id}")
                         enotes = st.text_area("Notes")
                         esubmit = st.form_submit_button("Add Expense", use_container_width=True)
                         if esubmit:
@@ -1776,7 +1107,7 @@ def show_events():
                             else:
                                 ok, msg, _ = add_event_expense(
                                     event_id, edesc, eamt, edate.strftime("%Y-%m-%d"),
-                                    ecat, epaid, ereceipt, enotes
+                                    ecat, epaid, ereceipt, enotes, authorized_by=eauth
                                 )
                                 st.success(msg) if ok else st.error(msg)
 
@@ -1784,7 +1115,7 @@ def show_events():
                 if not expenses:
                     st.info("No expenses yet.")
                 else:
-                    df_exp = pd.DataFrame(expenses)
+                    df_exp = st.session_state.event_expenses.to_frame(expenses)
                     df_exp["amount"] = df_exp["amount"].apply(lambda x: f"KD {x:.2f}")
                     st.dataframe(df_exp[["description", "amount", "date", "category", "paid_to", "receipt_num", "notes"]],
                                  use_container_width=True)
@@ -1873,6 +1204,7 @@ def show_events():
     
     # TAB 3: Event Reports
     with tab3:
+        render_profiler.section("Event Reports")
         st.subheader("Event Reports")
         report_tab1, report_tab2 = st.tabs(["Individual Event Report", "All Events Summary"])
 
@@ -2061,12 +1393,29 @@ def show_events():
         
         # All events summary report
         with report_tab2:
+            # Optional filters, e.g. completed events within a term
+            filter_col1, filter_col2 = st.columns(2)
+            with filter_col1:
+                summary_statuses = st.multiselect("Status", EVENT_STATUSES, default=EVENT_STATUSES, key="summary_statuses")
+            with filter_col2:
+                summary_by_date = st.checkbox("Limit to date range", key="summary_by_date")
+                if summary_by_date:
+                    summary_range = st.date_input("Event dates", value=(datetime.date.today().replace(month=1, day=1), datetime.date.today()), key="summary_range")
+            summary_start, summary_end = None, None
+            if summary_by_date and len(summary_range) == 2:
+                summary_start, summary_end = summary_range
+            
+            # The unfiltered summary is prepared ahead of time
+            precomputed = None
+            if summary_start is None and set(summary_statuses) == set(EVENT_STATUSES):
+                precomputed = get_precomputed_report("all_events")
+            
             col1, col2 = st.columns(2)
             
             with col1:
                 if st.button("Generate All Events Summary", use_container_width=True):
                     # Generate the summary report
-                    report = generate_all_events_report()
+                    report = precomputed["data"] if precomputed else generate_all_events_report(summary_start, summary_end, summary_statuses)
                     
                     if report:
                         st.header("All Events Financial Summary")
@@ -2134,7 +1483,7 @@ def show_events():
                             with col2:
                                 if st.button("Export All Events Report to PDF", key="all_events_pdf", use_container_width=True):
                                     # Generate the PDF
-                                    pdf = create_all_events_report_pdf(report)
+                                    pdf = precomputed["pdf"] if precomputed and precomputed["pdf"] else create_all_events_report_pdf(report)
                                     
                                     # Create download link
                                     st.markdown(
@@ -2149,11 +1498,11 @@ def show_events():
             with col2:
                 # Export all events report directly to PDF without generating the visual report first
                 if st.button("Export All Events PDF", key="direct_all_events_pdf", use_container_width=True):
-                    report = generate_all_events_report()
+                    report = precomputed["data"] if precomputed else generate_all_events_report(summary_start, summary_end, summary_statuses)
                     
                     if report:
                         # Generate the PDF
-                        pdf = create_all_events_report_pdf(report)
+                        pdf = precomputed["pdf"] if precomputed and precomputed["pdf"] else create_all_events_report_pdf(report)
                         
                         # Create download link
                         st.markdown(
@@ -2163,6 +1512,58 @@ def show_events():
                     else:
                         st.error("Could not generate report. Please try again.")
 
+    # TAB 4: Participant payment history across events
+    with tab4:
+        render_profiler.section("Participant Search")
+        st.subheader("Participant Search")
+        query = st.text_input("Participant name", key="participant_search", placeholder="Start typing a name...")
+        
+        if query:
+            matches = search_participants(query)
+            if not matches:
+                st.info("No participants match that name.")
+            else:
+                index = st.session_state.participant_search_index["names"]
+                selected_name = st.selectbox(
+                    f"{len(matches)} matching participants",
+                    matches,
+                    format_func=lambda name: index[name]["display_name"],
+                    key="participant_search_match"
+                )
+                history = get_participant_history(selected_name)
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total Paid", f"KD {history['total_paid']:.2f}")
+                with col2:
+                    st.metric("Outstanding", f"KD {history['total_outstanding']:.2f}")
+                with col3:
+                    st.metric("Events", f"{len(history['events'])}")
+                
+                st.subheader("Balance by Event")
+                events_df = pd.DataFrame(history["events"])
+                for col in ["price_per_person", "paid", "outstanding"]:
+                    events_df[col] = events_df[col].apply(lambda x: f"KD {x:.2f}")
+                st.dataframe(events_df.rename(columns={
+                    "event": "Event",
+                    "date": "Event Date",
+                    "price_per_person": "Price",
+                    "paid": "Paid",
+                    "outstanding": "Outstanding"
+                }), use_container_width=True, hide_index=True)
+                
+                st.subheader("Payment History")
+                payments_df = pd.DataFrame(history["payments"])
+                payments_df["event"] = payments_df["event_id"].apply(lambda event_id: (get_event(event_id) or {}).get("name", ""))
+                payments_df["payment_amount"] = payments_df["payment_amount"].apply(lambda x: f"KD {x:.2f}")
+                st.dataframe(payments_df[["payment_date", "event", "payment_amount", "payment_method", "notes"]].rename(columns={
+                    "payment_date": "Date",
+                    "event": "Event",
+                    "payment_amount": "Amount",
+                    "payment_method": "Method",
+                    "notes": "Notes"
+                }), use_container_width=True, hide_index=True)
+
 # Reports function (enhanced with PDF export)
 def show_reports():
     st.header("Financial Reports")
@@ -2170,8 +1571,9 @@ def show_reports():
     # Report type selection - use a container for responsiveness
     with st.container():
         report_type = st.radio("Report Type", 
-                              ["Monthly Summary", "Year-to-Date", "Event Analysis", "Fundraising Results"],
+                              ["Monthly Summary", "Year-to-Date", "Event Analysis", "Fundraising Results", "Report Pack"],
                               horizontal=True if st.session_state.device_type != "mobile" else False)
+    render_profiler.section(report_type)
     
     if report_type == "Monthly Summary":
         # Month and year selection
@@ -2191,18 +1593,22 @@ def show_reports():
         
         with col2:
             current_year = datetime.datetime.now().year
+            years = get_report_years()
             selected_year = st.selectbox("Year", 
-                                        list(range(current_year-2, current_year+3)))
+                                        years, index=years.index(current_year-2))
         
         # Close the mobile-stack div
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Last month's report is prepared ahead of time
+        precomputed = get_precomputed_report("monthly", {"month": month_index, "year": selected_year})
+        
         # Generate report buttons
         col1, col2 = st.columns(2)
         
         with col1:
             if st.button("Generate Report", use_container_width=True):
-                report = generate_monthly_report(month_index, selected_year)
+                report = precomputed["data"] if precomputed else generate_monthly_report(month_index, selected_year)
                 
                 # Display report
                 st.subheader(f"Monthly Financial Report - {selected_month} {selected_year}")
@@ -2279,7 +1685,7 @@ def show_reports():
                     with col2:
                         if st.button("Export to PDF", key="monthly_pdf", use_container_width=True):
                             # Generate the PDF
-                            pdf = create_monthly_report_pdf(report, selected_month, selected_year)
+                            pdf = precomputed["pdf"] if precomputed and precomputed["pdf"] else create_monthly_report_pdf(report, selected_month, selected_year)
                             
                             # Create download link
                             st.markdown(
@@ -2292,10 +1698,10 @@ def show_reports():
         with col2:
             # Direct PDF export without generating the visual report first
             if st.button("Export Monthly Report PDF", key="direct_monthly_pdf", use_container_width=True):
-                report = generate_monthly_report(month_index, selected_year)
+                report = precomputed["data"] if precomputed else generate_monthly_report(month_index, selected_year)
                 
                 # Generate the PDF
-                pdf = create_monthly_report_pdf(report, selected_month, selected_year)
+                pdf = precomputed["pdf"] if precomputed and precomputed["pdf"] else create_monthly_report_pdf(report, selected_month, selected_year)
                 
                 # Create download link
                 st.markdown(
@@ -2303,6 +1709,114 @@ def show_reports():
                     unsafe_allow_html=True
                 )
     
+    elif report_type == "Year-to-Date":
+        # Cut-off month and year selection
+        cols_div = '<div class="mobile-stack">'
+        st.markdown(cols_div, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            month_names = list(calendar.month_name)[1:]
+            ytd_month = st.selectbox("Up to Month", month_names, index=datetime.datetime.now().month - 1, key="ytd_month")
+            ytd_month_index = month_names.index(ytd_month) + 1
+        
+        with col2:
+            current_year = datetime.datetime.now().year
+            years = get_report_years()
+            ytd_year = st.selectbox("Year", years, index=years.index(current_year), key="ytd_year")
+        
+        # Close the mobile-stack div
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        report = generate_ytd_report(ytd_month_index, ytd_year)
+        previous = report["previous_year"]
+        
+        st.subheader(f"Year-to-Date Report - January to {ytd_month} {ytd_year}")
+        
+        # Summary metrics, compared with the same period last year
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Income", f"KD {report['total_income']:.2f}",
+                      f"{report['total_income'] - previous['total_income']:.2f} vs {ytd_year - 1}")
+        
+        with col2:
+            st.metric("Total Expenses", f"KD {report['total_expenses']:.2f}",
+                      f"{report['total_expenses'] - previous['total_expenses']:.2f} vs {ytd_year - 1}",
+                      delta_color="inverse")
+        
+        with col3:
+            st.metric("Net", f"KD {report['net']:.2f}",
+                      f"{report['net'] - previous['net']:.2f} vs {ytd_year - 1}")
+        
+        # Monthly breakdown
+        st.subheader("Monthly Breakdown")
+        monthly_df = pd.DataFrame(report["monthly_breakdown"])
+        for col in ["income", "expenses", "net"]:
+            monthly_df[col] = monthly_df[col].apply(lambda x: f"KD {x:.2f}")
+        st.dataframe(monthly_df.rename(columns={
+            "month": "Month",
+            "income": "Income",
+            "expenses": "Expenses",
+            "net": "Net"
+        }), use_container_width=True)
+        
+        # Category totals
+        st.subheader("Category Totals")
+        if report["categories"]:
+            category_data = []
+            for category, values in sorted(report["categories"].items()):
+                category_data.append({
+                    "Category": category,
+                    "Income": f"KD {values['income']:.2f}",
+                    "Expenses": f"KD {values['expenses']:.2f}"
+                })
+            st.dataframe(pd.DataFrame(category_data), use_container_width=True)
+        else:
+            st.info("No transactions for this period.")
+        
+        if st.button("Export Year-to-Date Report PDF", key="ytd_pdf", use_container_width=True):
+            pdf = create_ytd_report_pdf(report, ytd_month, ytd_year)
+            st.markdown(
+                get_pdf_download_link(pdf, f"ytd_report_{ytd_month}_{ytd_year}.pdf", "Download PDF Report"),
+                unsafe_allow_html=True
+            )
+    
+    elif report_type == "Report Pack":
+        st.write("Export every monthly, event and budget report as PDF and CSV in a single ZIP archive.")
+        st.caption("Reports whose figures haven't changed since an earlier export are reused, "
+                   "so their PDFs show the time they were first generated.")
+        
+        current_year = datetime.datetime.now().year
+        years = get_report_years()
+        pack_year = st.selectbox("Year", years, index=years.index(current_year), key="pack_year")
+        
+        if st.button("Build Report Pack", use_container_width=True):
+            jobs = build_report_pack_jobs(pack_year)
+            cache = st.session_state.report_pack_cache
+            reused = sum(1 for job in jobs if artifact_cache_key(job) in cache)
+            
+            progress_bar = st.progress(0.0, text="Preparing report pack...")
+            
+            def update_progress(done, total, filename):
+                progress_bar.progress(done / total, text=f"{done}/{total}: {filename}")
+            
+            pack = build_report_pack(jobs, cache, update_progress)
+            
+            # Only keep the artifacts that belong to the latest pack
+            pack_keys = {artifact_cache_key(job) for job in jobs}
+            st.session_state.report_pack_cache = {key: data for key, data in cache.items() if key in pack_keys}
+            
+            st.success(f"Report pack ready: {len(jobs)} files ({reused} reused from cache)")
+            st.download_button(
+                label="Download Report Pack (ZIP)",
+                data=pack,
+                file_name=f"report_pack_{pack_year}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+    
     elif report_type == "Event Analysis":
         # Redirect to the events report tab
         st.info("Please use the Events section for detailed event reports.")
@@ -2311,14 +1825,59 @@ def show_reports():
             st.session_state.page = "events"
             st.rerun()
     
-    else:
-        st.info(f"{report_type} reports are available in the full version.")
-        st.write("Please add transactions and events to generate more detailed reports.")
+    elif report_type == "Fundraising Results":
+        if not st.session_state.fundraising:
+            st.info("No fundraising initiatives created yet.")
+            return
+        
+        report = generate_fundraising_report()
+        
+        st.subheader("Fundraising Results")
+        
+        # Summary metrics
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Raised", f"KD {report['total_raised']:.2f}")
+        
+        with col2:
+            st.metric("Total Expenses", f"KD {report['total_expenses']:.2f}")
+        
+        with col3:
+            st.metric("Net Proceeds", f"KD {report['total_net']:.2f}")
+        
+        st.progress(min(report["overall_progress"] / 100, 1.0),
+                    text=f"Overall: KD {report['total_raised']:.2f} of KD {report['total_goal']:.2f} goal ({report['overall_progress']:.1f}%)")
+        
+        # Progress leaderboard
+        st.subheader("Progress Leaderboard")
+        leaderboard_data = []
+        for rank, initiative in enumerate(report["leaderboard"], start=1):
+            leaderboard_data.append({
+                "Rank": rank,
+                "Initiative": initiative["name"],
+                "Coordinator": initiative["coordinator"],
+                "Goal": f"KD {initiative['goal_amount']:.2f}",
+                "Raised": f"KD {initiative['actual_raised']:.2f}",
+                "Expenses": f"KD {initiative['expenses']:.2f}",
+                "Net": f"KD {initiative['net_proceeds']:.2f}",
+                "Progress": f"{initiative['progress']:.1f}%",
+                "Status": initiative["status"]
+            })
+        st.dataframe(pd.DataFrame(leaderboard_data), use_container_width=True, hide_index=True)
+        
+        if st.button("Export Fundraising Results PDF", key="fundraising_pdf", use_container_width=True):
+            pdf = create_fundraising_report_pdf(report)
+            st.markdown(
+                get_pdf_download_link(pdf, "fundraising_results.pdf", "Download PDF Report"),
+                unsafe_allow_html=True
+            )
 
 # Fundraising function (simplified)
 def show_fundraising():
     st.header("Fundraising Management")
     
+    render_profiler.section("Add Initiative")
     # Add new fundraising initiative
     with st.expander("Add New Fundraising Initiative", expanded=True):
         # Add the responsive-form class
@@ -2363,6 +1922,7 @@ def show_fundraising():
         # Close the responsive-form div
         st.markdown('</div>', unsafe_allow_html=True)
     
+    render_profiler.section("Initiatives")
     # View fundraising initiatives
     st.subheader("Fundraising Initiatives")
     
@@ -2385,9 +1945,10 @@ def show_fundraising():
                 "net_proceeds": "Net Proceeds",
                 "status": "Status"
             })
+            display_df["Goal Progress"] = [f"{get_goal_progress(i):.1f}%" for i in st.session_state.fundraising]
             # Select columns to display
             display_columns = [col for col in ["Initiative Name", "Dates", "Coordinator", 
-                              "Goal Amount", "Amount Raised", "Status"]
+                              "Goal Amount", "Amount Raised", "Expenses", "Net Proceeds", "Goal Progress", "Status"]
                               if col in display_df.columns]
             st.dataframe(display_df[display_columns], use_container_width=True)
             
@@ -2449,17 +2010,13 @@ def show_fundraising():
 
 # Save and load functions
 def save_data():
-    data = {
-        "budget": st.session_state.budget,
-        "transactions": st.session_state.transactions,
-        "events": st.session_state.events,
-        "event_participants": st.session_state.event_participants,
-        "event_expenses": st.session_state.event_expenses,
-        "fundraising": st.session_state.fundraising
-    }
-    
-    # Convert to JSON
-    json_data = json.dumps(data, indent=4)
+    with span("save_data") as traced_call:
+        data = build_backup()
+        
+        # Convert to JSON
+        json_data = json.dumps(data, indent=4)
+        traced_call.rows += len(data["transactions"])
+        traced_call.bytes += len(json_data)
     
     # Provide download link
     st.download_button(
@@ -2472,21 +2029,31 @@ def save_data():
     
     st.success("Data prepared for download")
 
+def save_snapshot():
+    # Parquet snapshots reload far faster than JSON, without building a dict per record
+    with span("save_snapshot") as traced_call:
+        snapshot = build_parquet_snapshot()
+        traced_call.rows += len(st.session_state.transactions)
+        traced_call.bytes += len(snapshot)
+    st.download_button(
+        label="Download Parquet Snapshot",
+        data=snapshot,
+        file_name="financial_system_snapshot.zip",
+        mime="application/zip",
+        use_container_width=True
+    )
+    
+    st.success("Snapshot prepared for download")
+
 def load_data():
-    uploaded_file = st.file_uploader("Upload backup file", type=["json"])
+    uploaded_file = st.file_uploader("Upload backup file or Parquet snapshot", type=["json", "zip"])
     
     if uploaded_file:
         try:
-            # Read the file
-            data = json.load(uploaded_file)
-            
-            # Update session state
-            st.session_state.budget = data.get("budget", st.session_state.budget)
-            st.session_state.transactions = data.get("transactions", st.session_state.transactions)
-            st.session_state.events = data.get("events", st.session_state.events)
-            st.session_state.event_participants = data.get("event_participants", st.session_state.event_participants)
-            st.session_state.event_expenses = data.get("event_expenses", st.session_state.event_expenses)
-            st.session_state.fundraising = data.get("fundraising", st.session_state.fundraising)
+            with span("load_data") as traced_call:
+                restore_backup(*read_backup(uploaded_file, uploaded_file.name))
+                traced_call.rows += len(st.session_state.transactions)
+                traced_call.bytes += uploaded_file.size
             
             st.success("Data loaded successfully")
             st.rerun()
@@ -2504,6 +2071,7 @@ def logout():
 def show_settings():
     st.header("Settings")
     
+    render_profiler.section("Data Backup and Restore")
     # Save/Load data
     st.subheader("Data Backup and Restore")
     
@@ -2517,6 +2085,8 @@ def show_settings():
         st.write("Save current data to a file:")
         if st.button("Prepare Backup File", use_container_width=True):
             save_data()
+        if st.button("Prepare Parquet Snapshot", use_container_width=True):
+            save_snapshot()
     
     with col2:
         st.write("Load data from a backup file:")
@@ -2525,6 +2095,129 @@ def show_settings():
     # Close the mobile-stack div
     st.markdown('</div>', unsafe_allow_html=True)
     
+    render_profiler.section("Ledger File")
+    # Ledger file
+    st.subheader("Ledger File")
+    # Another session may have removed the file since this one last wrote to it
+    ledger_file_kept()
+    notify_ledger_file_removed()
+    keep_ledger_file = st.checkbox("Keep the transaction ledger in a memory-mapped file on the server",
+                                   value=st.session_state.ledger_file, key="keep_ledger_file",
+                                   help="Turning this off deletes the file for every session of the app.")
+    if keep_ledger_file and not st.session_state.ledger_file:
+        with ledger_lock():
+            st.session_state.ledger_file = True
+            if ledger_exists():
+                # Another session or process started the file: open it rather than overwrite its rows
+                load_disk_state()
+                st.success("Opened the existing ledger file; transactions are saved to it as they are recorded.")
+            else:
+                write_ledger(st.session_state.transactions)
+                st.success("Transactions are now saved to the ledger file as they are recorded.")
+    elif not keep_ledger_file and st.session_state.ledger_file:
+        remove_ledger()
+        st.session_state.ledger_file = False
+        st.info("Ledger file removed. Transactions stay in this session; prepare a backup to keep them.")
+    if st.session_state.ledger_file:
+        rows, size = ledger_size()
+        st.caption(f"{rows} transactions in the ledger file ({size / 1024:.0f} KB), mapped rather than parsed when a session starts (only its text fields are decoded).")
+    
+    render_profiler.section("Static Site")
+    # Static site
+    st.subheader("Static Site")
+    publish_site = st.checkbox("Publish the dashboard, budget and event summaries as static HTML and JSON files",
+                               value=st.session_state.static_site, key="publish_static_site")
+    if publish_site and not st.session_state.static_site:
+        publish_static_site()
+        st.session_state.static_site = True
+        st.success("Static pages published. They are refreshed after every change.")
+    elif not publish_site and st.session_state.static_site:
+        remove_site()
+        st.session_state.static_site = False
+        st.info("Static pages removed.")
+    if st.session_state.static_site:
+        if st.button("Publish Now", use_container_width=True):
+            publish_static_site()
+            st.success("Static pages published.")
+        count, size = site_files()
+        st.caption(f"{count} files ({size / 1024:.0f} KB) in {SITE_DIR}, ready for any static file server. "
+                   "Changes made outside the app are published by `finance_cli.py publish`, e.g. from cron.")
+    
+    render_profiler.section("Data Checks")
+    # Data checks
+    st.subheader("Data Checks")
+    
+    if st.button("Find Duplicate Payments", use_container_width=True):
+        duplicates = find_duplicate_payments()
+        if duplicates:
+            st.warning(f"Found {len(duplicates)} groups of identical participant payments.")
+            duplicates_df = pd.DataFrame(duplicates)
+            duplicates_df["payment_amount"] = duplicates_df["payment_amount"].apply(lambda x: f"KD {x:.2f}")
+            st.dataframe(duplicates_df.drop(columns=["payment_ids"]).rename(columns={
+                "event": "Event",
+                "participant_name": "Participant",
+                "payment_amount": "Amount",
+                "payment_date": "Date",
+                "count": "Times Recorded"
+            }), use_container_width=True, hide_index=True)
+        else:
+            st.success("No duplicate participant payments found.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        verify_totals = st.button("Verify Event Totals", use_container_width=True)
+    
+    with col2:
+        if st.button("Rebuild Event Totals", use_container_width=True):
+            rebuild_event_rollups()
+            st.success("Event totals rebuilt from the ledger.")
+    
+    if verify_totals:
+        mismatches = verify_event_rollups()
+        if mismatches:
+            st.error(f"Found {len(mismatches)} event figures that differ from a full rebuild.")
+            st.dataframe(pd.DataFrame(mismatches).rename(columns={
+                "event": "Event",
+                "field": "Figure",
+                "stored": "Stored",
+                "rebuilt": "Rebuilt"
+            }), use_container_width=True, hide_index=True)
+        else:
+            st.success("All event totals match a full rebuild from the ledger.")
+    
+    render_profiler.section("Fiscal Year Archive")
+    # Fiscal-year archive
+    st.subheader("Fiscal Year Archive")
+    st.write("Closing a past year moves its transactions and completed events to the on-disk archive. "
+             "Balances, budget actuals and year-to-date figures keep counting them, and historical "
+             "reports read them back when needed.")
+    
+    summaries = get_archive_summaries()
+    if summaries:
+        st.dataframe(pd.DataFrame([{
+            "Year": year,
+            "Transactions": summary["counts"]["transactions"],
+            "Events": summary["counts"]["events"],
+            "Income": format_kd(summary["totals"]["income"]),
+            "Expenses": format_kd(summary["totals"]["expenses"]),
+            "Closed": summary["closed_at"][:10]
+        } for year, summary in sorted(summaries.items())]), use_container_width=True, hide_index=True)
+    
+    closable_years = get_closable_years()
+    if closable_years:
+        # Years close oldest first
+        if st.button(f"Close Fiscal Year {closable_years[0]}", use_container_width=True):
+            ok, message = close_fiscal_year(closable_years[0])
+            st.success(message) if ok else st.error(message)
+    else:
+        st.info("No past fiscal years left to close.")
+    
+    # Render timings
+    render_profiler.section("Render Latency")
+    show_render_latency()
+    
+    render_profiler.section("User Management")
     # Password management
     st.subheader("User Management")
     st.info("For security reasons, user credentials can only be modified directly in the source code.")
@@ -2536,8 +2229,58 @@ def show_settings():
     st.write(f"**Role:** {st.session_state.user_role}")
     st.write(f"**Login time:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+def show_render_latency():
+    """Latency panel: rerun, page and section render times of this app process"""
+    st.subheader("Render Latency")
+    rows = render_profiler.summary()
+    st.caption(f"Wall time per rerun, page and section, over each one's last {render_profiler.window} runs "
+               f"since {render_profiler.started.strftime('%Y-%m-%d %H:%M')}, across all sessions.")
+    if not rows:
+        st.info("No pages timed yet.")
+        return
+    
+    st.dataframe(pd.DataFrame([{
+        "Page": row["page"],
+        "Section": row["section"],
+        "Runs": row["count"],
+        "Mean (ms)": row["mean_ms"],
+        "p50 (ms)": row["p50_ms"],
+        "p90 (ms)": row["p90_ms"],
+        "p99 (ms)": row["p99_ms"],
+        "Max (ms)": row["max_ms"]
+    } for row in rows]), use_container_width=True, hide_index=True)
+    
+    # Histogram of one page or section
+    labels = [f"{row['page']} / {row['section']}" for row in rows]
+    default = labels.index("rerun / (total)") if "rerun / (total)" in labels else 0
+    selected = st.selectbox("Histogram", labels, index=default, key="latency_histogram")
+    histogram = rows[labels.index(selected)]["histogram"]
+    edges = [f"≤ {edge} ms" for edge in BUCKETS_MS] + [f"> {BUCKETS_MS[-1]} ms"]
+    st.bar_chart(pd.DataFrame({"Runs": histogram}, index=pd.CategoricalIndex(edges, categories=edges, ordered=True)))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Export Timings (JSON)",
+            data=render_profiler.to_json(),
+            file_name="render_timings.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("Reset Timings", use_container_width=True):
+            render_profiler.reset()
+            st.rerun()
+
 # Main app
 def main():
+    # State kept on disk (the ledger file, archived fiscal years) is read once per session
+    if st.session_state.archive_summaries is None:
+        load_disk_state()
+        # Loading is not a change: the session publishes only once it writes something,
+        # so a new session never replaces the shared snapshot with its own
+        st.session_state.published_version = st.session_state.data_version
+    
     # Check if user is authenticated
     if not st.session_state.authenticated:
         show_login()
@@ -2575,24 +2318,49 @@ def main():
     
     # Store the current page
     st.session_state.page = page.lower()
+    notify_ledger_file_removed()
     
     # Display the selected page based on user role
     if st.session_state.page == 'dashboard':
-        show_dashboard()
+        with render_profiler.page("dashboard"):
+            show_dashboard()
     elif st.session_state.page == 'events':
-        show_events()
+        with render_profiler.page("events"):
+            show_events()
     elif st.session_state.page == 'reports':
-        show_reports()
+        with render_profiler.page("reports"):
+            show_reports()
     elif st.session_state.user_role == "admin":
         # Only admin can access these pages
         if st.session_state.page == 'transactions':
-            show_transactions()
+            with render_profiler.page("transactions"):
+                show_transactions()
         elif st.session_state.page == 'budget':
-            show_budget()
+            with render_profiler.page("budget"):
+                show_budget()
         elif st.session_state.page == 'fundraising':
-            show_fundraising()
+            with render_profiler.page("fundraising"):
+                show_fundraising()
         elif st.session_state.page == 'settings':
-            show_settings()
+            with render_profiler.page("settings"):
+                show_settings()
+    
+    # Republish the viewer snapshot, and the static site if it is kept, if this run
+    # changed anything (on any page: the Events page writes too). Only this session's
+    # own writes count, since published_version starts at the version it loaded.
+    if st.session_state.user_role == "admin" and st.session_state.published_version != st.session_state.data_version:
+        snapshot = publish_viewer_snapshot()
+        if st.session_state.static_site:
+            publish_static_site(snapshot)
+    
+    # Prepare the recurring reports again whenever the data changed; their PDFs are
+    # rendered in the background once it settles
+    if st.session_state.scheduled_version != st.session_state.data_version:
+        st.session_state.report_scheduler.schedule(st.session_state.data_version, build_recurring_report_jobs())
+        st.session_state.scheduled_version = st.session_state.data_version
+    
+    # Hot-path metrics for a local Prometheus scraper (see tracing)
+    write_metrics("app", min_interval=10.0)
     
     # Display footer
     st.sidebar.markdown("---")
@@ -2603,4 +2371,6 @@ def main():
     )
 
 if __name__ == '__main__':
-    main()
+    # The whole rerun, including navigation and the work done after the page
+    with render_profiler.page("rerun"):
+        main()
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import finance_core
+from finance_core import (
+    State, use_state, load_disk_state, read_backup, restore_backup,
+    get_balance_fils, get_emergency_reserve_fils, get_budget_lines, get_cash_flow, get_event, get_events_in_range,
+    generate_event_report, summarize_event, get_archive_summaries
+)
+from fiscal_archive import ARCHIVE_DIR
+from ledger_file import LEDGER_DIR, META_FILE
+from record_store import fils_to_kd
+
+# Read-only JSON API
+# A small HTTP server over the same data the app starts from (the ledger file and
+# the fiscal-year archive, or a backup given with --data), for other tools to read
+# balances, events and transactions.
+#
+#     GET /api/summary                       balance, reserve, available funds
+#     GET /api/budget                        budget vs. actual per category
+#     GET /api/monthly?year=2025             monthly and year-to-date totals
+#     GET /api/cash-flow?period=weekly       daily, weekly or monthly series
+#     GET /api/transactions?offset=0&limit=100
+#     GET /api/events?offset=0&limit=100&status=Active
+#     GET /api/events/<id>                   one event with its payments and expenses
+#
+# Every response carries an ETag built from the store version, a fingerprint of
+# the files the data is read from. A client that sends it back in If-None-Match
+# gets an empty 304 until something is written, and the data is only reloaded
+# when the fingerprint moves.
+
+DEFAULT_PORT = 8502
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def store_stamp(data_file=None):
+    """A fingerprint of the files the data is read from, changing whenever one is rewritten"""
+    parts = []
+    for path in [os.path.join(LEDGER_DIR, META_FILE), ARCHIVE_DIR, data_file]:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except (OSError, TypeError):
+            parts.append("-")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+class FinanceStore:
+    """The loaded data and its version, reloaded when the files behind it change.
+
+    The core works on one state at a time and its caches are filled on read, so
+    requests are answered one at a time under a lock; each answer is a few
+    aggregate lookups or one page of records.
+    """
+
+    def __init__(self, data_file=None):
+        self.data_file = data_file
+        self.version = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Reload the data if its files changed since the last load (call with the lock held)"""
+        stamp = store_stamp(self.data_file)
+        if stamp == self.version:
+            return
+        use_state(State(ledger_file=False) if self.data_file else State())
+        load_disk_state()
+        if self.data_file:
+            with open(self.data_file, "rb") as f:
+                restore_backup(*read_backup(f, self.data_file))
+        self.version = stamp
+
+def _int_param(query, name, default, low=0, high=None):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer") from None
+    if value < low or (high is not None and value > high):
+        raise ApiError(400, f"'{name}' must be between {low} and {high}" if high is not None else f"'{name}' must be at least {low}")
+    return value
+
+def _page(items, total, path, query, offset, limit):
+    """A page of a list endpoint, with the path of the next page if there is one"""
+    next_page = None
+    if offset + limit < total:
+        params = {key: values[0] for key, values in query.items()}
+        params.update(offset=offset + limit, limit=limit)
+        next_page = f"{path}?{urllib.parse.urlencode(params)}"
+    return {"items": items, "offset": offset, "limit": limit, "total": total, "next": next_page}
+
+def get_summary(query):
+    balance = get_balance_fils()
+    reserve = get_emergency_reserve_fils()
+    return {
+        "balance": fils_to_kd(balance),
+        "emergency_reserve": fils_to_kd(reserve),
+        "available_funds": fils_to_kd(balance - reserve),
+        "transactions": len(finance_core.state.transactions),
+        "events": len(finance_core.state.events),
+        "archived_years": sorted(get_archive_summaries())
+    }
+
+def get_budget(query):
+    return {section: [{
+        "category": line["category"],
+        "budget": fils_to_kd(line["budget"]),
+        "actual": fils_to_kd(line["actual"]),
+        "variance": fils_to_kd(line["variance"])
+    } for line in get_budget_lines(section)] for section in ["income", "expenses"]}
+
+def get_monthly(query):
+    year = _int_param(query, "year", max(finance_core.state.monthly_totals, default=0), 0)
+    totals = finance_core.state.monthly_totals.get(year)
+    if not totals:
+        raise ApiError(404, f"No transactions in {year}")
+    months = []
+    for i in range(12):
+        previous_income = totals["income"][i - 1] if i else 0
+        previous_expenses = totals["expenses"][i - 1] if i else 0
+        months.append({
+            "month": i + 1,
+            "income": fils_to_kd(totals["income"][i] - previous_income),
+            "expenses": fils_to_kd(totals["expenses"][i] - previous_expenses),
+            "ytd_income": fils_to_kd(totals["income"][i]),
+            "ytd_expenses": fils_to_kd(totals["expenses"][i])
+        })
+    return {"year": year, "months": months}
+
+def get_cash_flow_series(query):
+    period = query.get("period", ["weekly"])[0]
+    if period not in ("daily", "weekly", "monthly"):
+        raise ApiError(400, "'period' must be daily, weekly or monthly")
+    series = get_cash_flow()
+    if series is None:
+        return {"period": period, "items": []}
+    frame = series[period]
+    return {"period": period, "items": [{
+        "date": day.date().isoformat(),
+        "income": fils_to_kd(int(row["income"])),
+        "expenses": fils_to_kd(int(row["expenses"])),
+        "balance": fils_to_kd(int(row["balance"]))
+    } for day, row in frame.iterrows()]}
+
+def list_transactions(query):
+    offset = _int_param(query, "offset", 0)
+    limit = _int_param(query, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+    transactions = finance_core.state.transactions
+    # Newest last, in the order they were recorded, so pages stay put as transactions are added
+    items = transactions.to_records(transactions[offset:offset + limit])
+    return _page(items, len(transactions), "/api/transactions", query, offset, limit)
+
+def list_events(query):
+    offset = _int_param(query, "offset", 0)
+    limit = _int_param(query, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+    statuses = query.get("status")
+    events = get_events_in_range(statuses=statuses)
+    items = [summarize_event(event) for event in events[offset:offset + limit]]
+    return _page(items, len(events), "/api/events", query, offset, limit)
+
+def get_event_detail(query, event_id):
+    if not get_event(event_id):
+        raise ApiError(404, f"Event not found: {event_id}")
+    return generate_event_report(event_id)
+
+ROUTES = {
+    "/api/summary": get_summary,
+    "/api/budget": get_budget,
+    "/api/monthly": get_monthly,
+    "/api/cash-flow": get_cash_flow_series,
+    "/api/transactions": list_transactions,
+    "/api/events": list_events
+}
+
+def _json_default(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+def _etag_matches(header, etag):
+    """Whether an If-None-Match header names the current ETag (weak comparison)"""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "FinanceAPI/1.0"
+
+    def do_GET(self):
+        store = self.server.store
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        path = url.path.rstrip("/") or "/"
+
+        with store.lock:
+            try:
+                store.refresh()
+                # Validators are per URL, so the store version alone identifies a representation
+                etag = f'"{store.version}"'
+                if path in ROUTES:
+                    handler = lambda: ROUTES[path](query)
+                elif path.startswith("/api/events/"):
+                    handler = lambda: get_event_detail(query, path[len("/api/events/"):])
+                else:
+                    raise ApiError(404, f"No such endpoint: {path}")
+                if _etag_matches(self.headers.get("If-None-Match", ""), etag):
+                    self._send(304, None, etag)
+                    return
+                body = handler()
+            except ApiError as e:
+                self._send(e.status, {"error": str(e)})
+                return
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        data = b"" if body is None else json.dumps(body, default=_json_default).encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep responses but must revalidate them, which costs a 304
+            self.send_header("Cache-Control", "no-cache")
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, data_file=None, quiet=False):
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.store = FinanceStore(data_file)
+    server.quiet = quiet
+    return server
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, data_file=None, quiet=False):
+    server = make_server(host, port, data_file, quiet)
+    print(f"Serving the finance API on http://{host}:{server.server_port}/api/summary")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
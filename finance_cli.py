@@ -0,0 +1,261 @@
+import time
+
+# Taken before anything else is imported, so the startup time covers the imports
+STARTED = time.perf_counter()
+
+import argparse
+import calendar
+import datetime
+import json
+import os
+import sys
+import finance_core
+from finance_core import (
+    State, use_state, load_disk_state, read_backup, restore_backup, build_backup, build_parquet_snapshot,
+    build_dashboard_data, build_static_site, build_report_pack_jobs, build_recurring_report_jobs, get_event,
+    generate_monthly_report, generate_ytd_report, generate_event_report, generate_all_events_report, generate_fundraising_report,
+    generate_budget_report,
+    find_duplicate_payments, verify_event_rollups
+)
+from finance_api import DEFAULT_PORT, serve
+import finance_ingest
+from ledger_file import ledger_exists, ledger_lock, write_ledger
+from report_pack import build_report_pack, render_artifact
+from report_scheduler import REPORTS_DIR, write_reports
+from static_site import SITE_DIR, write_site
+from tracing import write_metrics
+
+# Command line
+# Runs the bookkeeping core without Streamlit, for batch jobs and cron: import a
+# backup into the ledger file, render reports, precompute the recurring ones,
+# export the data, verify the aggregates, publish the static site, serve the JSON
+# API, and run or feed the ingestion service. The data is the state the app starts
+# from (the ledger file and the fiscal-year archive), or a backup given with --data.
+#
+#     python finance_cli.py report monthly --year 2025 --month 3 -o march.pdf
+#     python finance_cli.py --data backup.json verify
+#     python finance_cli.py --timings publish
+#     python finance_cli.py precompute          # e.g. nightly from cron
+
+REPORT_KINDS = ["monthly", "ytd", "event", "events", "budget", "fundraising", "pack"]
+
+def _json_default(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+def _write_output(data, output):
+    """Write bytes or text to a file, or to stdout when no file is given"""
+    if output is None:
+        if isinstance(data, bytes):
+            sys.stdout.buffer.write(data)
+        else:
+            sys.stdout.write(data)
+        return
+    with open(output, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    print(f"Wrote {output} ({os.path.getsize(output)} bytes)", file=sys.stderr)
+
+def load_state(data_file):
+    """Bind a fresh state and fill it from the app's on-disk state, with a backup file in place of the ledger"""
+    use_state(State(ledger_file=False) if data_file else State())
+    load_disk_state()
+    if data_file:
+        with open(data_file, "rb") as f:
+            restore_backup(*read_backup(f, data_file))
+
+def run_import(args):
+    # Restored without the ledger file, which is then written once, replacing every row in it
+    state = use_state(State(ledger_file=False))
+    with open(args.file, "rb") as f:
+        restore_backup(*read_backup(f, args.file))
+    write_ledger(state.transactions)
+    print(f"Imported {len(state.transactions)} transactions into the ledger file", file=sys.stderr)
+    return 0
+
+def run_report(args):
+    today = datetime.date.today()
+    year = args.year or today.year
+    month = args.month or today.month
+
+    if args.kind == "pack":
+        _write_output(build_report_pack(build_report_pack_jobs(year)), args.output)
+        return 0
+
+    if args.kind == "monthly":
+        report = generate_monthly_report(month, year)
+        job = {"kind": "monthly_pdf", "payload": {"report": report, "month_name": calendar.month_name[month], "year": year}}
+    elif args.kind == "ytd":
+        report = generate_ytd_report(month, year)
+        job = {"kind": "ytd_pdf", "payload": {"report": report, "month_name": calendar.month_name[month], "year": year}}
+    elif args.kind == "event":
+        if not args.event or not get_event(args.event):
+            print(f"Event not found: {args.event}", file=sys.stderr)
+            return 2
+        report = generate_event_report(args.event)
+        job = {"kind": "event_pdf", "payload": report}
+    elif args.kind == "events":
+        report = generate_all_events_report()
+        if not report:
+            print("No events recorded", file=sys.stderr)
+            return 2
+        job = {"kind": "all_events_pdf", "payload": report}
+    elif args.kind == "fundraising":
+        report = generate_fundraising_report()
+        job = {"kind": "fundraising_pdf", "payload": report}
+    else:
+        report = generate_budget_report()
+        job = {"kind": "budget_pdf", "payload": finance_core.state.budget}
+
+    if args.format == "json":
+        _write_output(json.dumps(report, indent=4, default=_json_default) + "\n", args.output)
+    else:
+        job["filename"] = args.output or f"{args.kind}.pdf"
+        _write_output(render_artifact(job)[1], args.output)
+    return 0
+
+def run_precompute(args):
+    written = write_reports(build_recurring_report_jobs(), args.dir)
+    print(f"Wrote {len(written)} files to {args.dir}", file=sys.stderr)
+    return 0
+
+def run_export(args):
+    if args.format == "json":
+        _write_output(json.dumps(build_backup(), indent=4), args.output)
+    elif args.format == "parquet":
+        _write_output(build_parquet_snapshot(), args.output)
+    else:
+        _write_output(finance_core.state.transactions.to_frame().to_csv(index=False), args.output)
+    return 0
+
+def run_verify(args):
+    mismatches = verify_event_rollups()
+    duplicates = find_duplicate_payments()
+    for mismatch in mismatches:
+        print(f"Event total differs from a rebuild: {mismatch['event']} {mismatch['field']} "
+              f"(stored {mismatch['stored']}, rebuilt {mismatch['rebuilt']})")
+    for group in duplicates:
+        print(f"Duplicate payment: {group['participant_name']} paid {group['payment_amount']:.3f} on "
+              f"{group['payment_date']} for {group['event']} ({group['count']} times)")
+    if not mismatches and not duplicates:
+        print("All event totals match a full rebuild and no duplicate payments were found")
+    return 1 if mismatches or duplicates else 0
+
+def run_publish(args):
+    snapshot = build_dashboard_data()
+    snapshot["published_at"] = datetime.datetime.now()
+    write_site(build_static_site(snapshot), args.site)
+    print(f"Published the static site to {args.site}", file=sys.stderr)
+    return 0
+
+def run_serve(args):
+    serve(args.host, args.port, args.data, args.quiet)
+    return 0
+
+def run_ingest(args):
+    if not args.data and not finance_core.state.ledger_file:
+        # Without a backup to write back to, ingested transactions are kept in the ledger file
+        with ledger_lock():
+            if ledger_exists():
+                # Started by the app since the state was loaded
+                finance_core.state.ledger_file = True
+                load_disk_state()
+            else:
+                write_ledger(finance_core.state.transactions)
+                finance_core.state.ledger_file = True
+    finance_ingest.serve(host=args.host, port=args.port, drop_dir=args.drop_dir or None, data_file=args.data,
+                         batch_size=args.batch_size, batch_delay=args.batch_delay, queue_size=args.queue_size)
+    return 0
+
+def run_submit(args):
+    records = finance_ingest.read_records(args.file) if args.file != "-" else [json.loads(line) for line in sys.stdin if line.strip()]
+    answers = finance_ingest.submit(records, args.host, args.port)
+    for position, answer in enumerate(answers):
+        if not answer["ok"]:
+            print(f"Record {position + 1}: {answer['reason']}", file=sys.stderr)
+    accepted = sum(answer["ok"] for answer in answers)
+    print(f"{accepted} of {len(records)} records recorded", file=sys.stderr)
+    return 0 if accepted == len(records) else 1
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="finance_cli", description="Year 11 Committee finances, without the web app")
+    parser.add_argument("--data", help="read a JSON backup or Parquet snapshot ZIP instead of the ledger file")
+    parser.add_argument("--timings", action="store_true", help="print startup, load and command times to stderr")
+    parser.add_argument("--metrics", action="store_true", help="write the hot-path metrics to this run's Prometheus text file in metrics/ on exit")
+    parser.add_argument("--metrics-file", metavar="FILE", help="write the hot-path metrics to this Prometheus text file on exit instead")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", help="load a backup or snapshot into the ledger file the app starts from")
+    command.add_argument("file")
+    command.set_defaults(run=run_import)
+
+    command = commands.add_parser("report", help="render a report as PDF or JSON")
+    command.add_argument("kind", choices=REPORT_KINDS)
+    command.add_argument("--year", type=int)
+    command.add_argument("--month", type=int, choices=range(1, 13))
+    command.add_argument("--event", help="event id, for the event report")
+    command.add_argument("--format", choices=["pdf", "json"], default="pdf")
+    command.add_argument("-o", "--output", help="output file (default: stdout)")
+    command.set_defaults(run=run_report)
+
+    command = commands.add_parser("precompute", help="write last month's report, the all-events summary and the budget report as JSON and PDF")
+    command.add_argument("--dir", default=REPORTS_DIR, help=f"output directory (default: {REPORTS_DIR})")
+    command.set_defaults(run=run_precompute)
+
+    command = commands.add_parser("export", help="export the data")
+    command.add_argument("format", choices=["json", "parquet", "csv"])
+    command.add_argument("-o", "--output", help="output file (default: stdout)")
+    command.set_defaults(run=run_export)
+
+    command = commands.add_parser("verify", help="check event totals and duplicate payments (exit status 1 on problems)")
+    command.set_defaults(run=run_verify)
+
+    command = commands.add_parser("publish", help="write the static dashboard, budget and event pages")
+    command.add_argument("--site", default=SITE_DIR, help=f"site directory (default: {SITE_DIR})")
+    command.set_defaults(run=run_publish)
+
+    command = commands.add_parser("serve", help="serve the read-only JSON API (see finance_api)")
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    command.add_argument("--quiet", action="store_true", help="don't log requests")
+    command.set_defaults(run=run_serve)
+
+    command = commands.add_parser("ingest", help="run the ingestion service (see finance_ingest)")
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=finance_ingest.DEFAULT_PORT)
+    command.add_argument("--drop-dir", default=finance_ingest.DROP_DIR, help="folder watched for *.json files ('' to disable)")
+    command.add_argument("--batch-size", type=int, default=500, help="most records committed together")
+    command.add_argument("--batch-delay", type=float, default=0.05, help="seconds to wait for more records after the first")
+    command.add_argument("--queue-size", type=int, default=5000, help="records queued before sources have to wait")
+    command.set_defaults(run=run_ingest)
+
+    command = commands.add_parser("submit", help="send records to the ingestion service")
+    command.add_argument("file", help="JSON file of records, or - for one record per line on stdin")
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=finance_ingest.DEFAULT_PORT)
+    command.set_defaults(run=run_submit)
+
+    return parser
+
+def main(argv=None):
+    imported = time.perf_counter()
+    args = build_parser().parse_args(argv)
+
+    # The API server loads (and reloads) the data itself, and submit only talks to the ingestion service
+    if args.command not in ("import", "serve", "submit"):
+        load_state(args.data)
+    loaded = time.perf_counter()
+    status = args.run(args)
+    finished = time.perf_counter()
+    if args.metrics or args.metrics_file:
+        # Labelled with the command, so runs of different commands are told apart
+        write_metrics(args.command, args.metrics_file)
+
+    if args.timings:
+        print(f"startup {(loaded - STARTED) * 1000:.0f} ms (imports {(imported - STARTED) * 1000:.0f} ms, "
+              f"loading data {(loaded - imported) * 1000:.0f} ms), {args.command} {(finished - loaded) * 1000:.0f} ms",
+              file=sys.stderr)
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
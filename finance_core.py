@@ -0,0 +1,2162 @@
+import bisect
+import calendar
+import datetime
+import io
+import json
+import uuid
+import warnings
+import zipfile
+import numpy as np
+import pandas as pd
+from record_store import RecordStore, TRANSACTION_FIELDS, EVENT_FIELDS, PARTICIPANT_FIELDS, EXPENSE_FIELDS, FILS_PER_KD, MISSING_DATE, group_sums, to_fils, fils_to_kd, to_timestamp, from_timestamp
+from fiscal_archive import is_archived, read_summaries, read_year, rename_category, rename_summary_category, write_year
+from ledger_file import append_ledger, ledger_exists, ledger_lock, read_ledger, rename_ledger_value, write_ledger
+from static_site import render_json, render_page
+from tracing import traced
+
+# Committee finances core
+# The bookkeeping itself (transactions, budget, events, fundraising, reports, the
+# fiscal-year archive and backups) without any user interface. Every function works
+# on one state object holding the record stores, the budget and the indexes and
+# aggregates kept beside them, read through attribute and item access. The
+# Streamlit app binds its session state (a proxy to the current session's state);
+# batch jobs and the command line bind a State. Nothing here imports Streamlit.
+
+class State(dict):
+    """A plain state object for running the core outside Streamlit"""
+    
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+    
+    def __setattr__(self, key, value):
+        self[key] = value
+
+# The state every function works on (see use_state)
+state = None
+
+def use_state(new_state):
+    """Make the core work on `new_state`, after giving it any keys it lacks"""
+    global state
+    init_state(new_state)
+    state = new_state
+    return new_state
+
+def init_state(target):
+    """Give a state object every key the core works on that it doesn't have yet"""
+    # Code tables for the dictionary-encoded record fields (category, authorized_by,
+    # payment_method, event_type), shared by all the record stores
+    if 'code_tables' not in target:
+        target.code_tables = {}
+    
+    # Whether the transaction ledger is kept in the memory-mapped ledger file (see ledger_file)
+    if 'ledger_file' not in target:
+        target.ledger_file = ledger_exists()
+    # Set when another session removed the ledger file this session was keeping
+    if 'ledger_file_removed' not in target:
+        target.ledger_file_removed = False
+    
+    if 'transactions' not in target:
+        target.transactions = RecordStore(TRANSACTION_FIELDS, code_tables=target.code_tables)
+    
+    if 'budget' not in target:
+        target.budget = {
+            "income": {
+                "Fundraising Events": {"budget": 0, "actual": 0},
+                "Merchandise Sales": {"budget": 0, "actual": 0},
+                "Sponsorships": {"budget": 0, "actual": 0},
+                "Trip Payments": {"budget": 0, "actual": 0},  # Added for trip payments
+                "Other Income": {"budget": 0, "actual": 0}
+            },
+            "expenses": {
+                "Event Expenses": {"budget": 0, "actual": 0},
+                "Merchandise Production": {"budget": 0, "actual": 0},
+                "Marketing/Promotion": {"budget": 0, "actual": 0},
+                "Yearbook": {"budget": 0, "actual": 0},
+                "Graduation": {"budget": 0, "actual": 0},
+                "School Trips": {"budget": 0, "actual": 0},
+                "Transportation": {"budget": 0, "actual": 0},  # Added for trip transportation costs
+                "Tickets & Admissions": {"budget": 0, "actual": 0},  # Added for trip tickets
+                "Emergency Reserve": {"budget": 0, "actual": 0},
+                "Other Expenses": {"budget": 0, "actual": 0}
+            }
+        }
+    
+    if 'events' not in target:
+        target.events = RecordStore(EVENT_FIELDS, code_tables=target.code_tables)
+    
+    # Participant payments by normalised (event, name, amount, date) key, for duplicate checks
+    if 'payment_index' not in target:
+        target.payment_index = {}
+    
+    # Participant name search index across all events (see index_participant_payment)
+    if 'participant_search_index' not in target:
+        target.participant_search_index = {"names": {}, "prefixes": {}, "trigrams": {}}
+    
+    # Per-event income, expense and count figures, derived from the ledger (see get_event_rollup)
+    if 'event_rollups' not in target:
+        target.event_rollups = {}
+    
+    # Paid-to-date per participant within each event (see record_participant_balance)
+    if 'participant_balances' not in target:
+        target.participant_balances = {}
+    
+    # Events ordered by date, overall and per status (see index_event_date)
+    if 'event_date_index' not in target:
+        target.event_date_index = {"all": [], "by_status": {}}
+    
+    # Events by id, so payments and expenses can find their event without a scan
+    if 'event_index' not in target:
+        target.event_index = {}
+    
+    # Event participants (students paying for trips)
+    if 'event_participants' not in target:
+        target.event_participants = RecordStore(PARTICIPANT_FIELDS, code_tables=target.code_tables)
+    
+    # Event expenses (detailed expenses for each event)
+    if 'event_expenses' not in target:
+        target.event_expenses = RecordStore(EXPENSE_FIELDS, code_tables=target.code_tables)
+    
+    if 'fundraising' not in target:
+        target.fundraising = []
+    
+    # Budget line actuals in fils, mirrored into the budget's KD "actual" figures
+    if 'budget_actuals' not in target:
+        target.budget_actuals = {}
+    
+    # Raised and spent totals in fils per fundraising initiative
+    if 'initiative_totals' not in target:
+        target.initiative_totals = {}
+    
+    # Fundraising initiatives by id, so linked transactions update their totals directly
+    if 'initiative_index' not in target:
+        target.initiative_index = {}
+    
+    # Cumulative monthly income/expense totals per year, maintained on write
+    if 'monthly_totals' not in target:
+        target.monthly_totals = {}
+    
+    # Summaries of the closed fiscal years archived on disk, by year (None until
+    # load_disk_state reads them, see load_archive)
+    if 'archive_summaries' not in target:
+        target.archive_summaries = None
+    
+    # Archived years' records, read from disk when a historical report first needs them
+    if 'archive_cache' not in target:
+        target.archive_cache = {}
+    
+    # Incremented on every ledger write, used to key cached computations
+    if 'ledger_version' not in target:
+        target.ledger_version = 0
+    
+    # Incremented on every change to the transactions, budget or events; the app
+    # republishes its viewer snapshot when it moves
+    if 'data_version' not in target:
+        target.data_version = 0
+    
+    # Cached cash-flow series (see get_cash_flow)
+    if 'cash_flow_cache' not in target:
+        target.cash_flow_cache = None
+
+# Committee members
+committee_members = {
+    "Chair": "TBD",
+    "Deputy Chair": "TBD",
+    "Treasurer": "Deema Abououf",
+    "Secretary": "TBD",
+    "Events Coordinator": "TBD"
+}
+
+# Event lifecycle statuses
+EVENT_STATUSES = ["Planning", "Active", "Completed"]
+
+# Accepted participant payment methods
+PAYMENT_METHODS = ["Cash", "Bank Transfer", "Check", "Other"]
+
+# Authorization levels based on the matrix
+auth_levels = {
+    "Under 100 KD": ["Chair"],
+    "Over 100 KD": ["Chair", "School Admin"],
+    "New Category": ["Committee Vote"]
+}
+
+# Helper functions
+def get_archive_summaries():
+    """Summaries of the closed fiscal years, by year"""
+    return state.archive_summaries or {}
+
+def get_archived_totals_fils():
+    """Total (income, expenses) in fils across every closed fiscal year"""
+    summaries = get_archive_summaries().values()
+    return sum(s["totals"]["income"] for s in summaries), sum(s["totals"]["expenses"] for s in summaries)
+
+def get_archived_stores(year):
+    """An archived year's record stores, read from disk on first use"""
+    cache = state.archive_cache
+    if year not in cache:
+        cache[year] = read_year(year, STORE_FIELDS)
+    return cache[year]
+
+def get_balance_fils():
+    transactions = state.transactions
+    archived_income, archived_expenses = get_archived_totals_fils()
+    return transactions.sum_fils("income") + archived_income - transactions.sum_fils("expense") - archived_expenses
+
+def get_emergency_reserve_fils():
+    # 15% of total income (closed years included), rounded down to the fil
+    return (state.transactions.sum_fils("income") + get_archived_totals_fils()[0]) * 15 // 100
+
+def format_kd(fils):
+    """Format an amount in fils for display"""
+    return f"KD {fils_to_kd(fils):.2f}"
+
+def get_balance():
+    return fils_to_kd(get_balance_fils())
+
+def get_emergency_reserve():
+    return fils_to_kd(get_emergency_reserve_fils())
+
+def _daily_cash_flow(rows=None, transactions=None):
+    """Sum income and expenses in fils per transaction day (all transactions, or the given rows)"""
+    transactions = state.transactions if transactions is None else transactions
+    sums = transactions.group_sum_fils("date", ["income", "expense"], rows)
+    days = sorted(day for day in sums if day != MISSING_DATE)
+    return pd.DataFrame(
+        [sums[day] for day in days],
+        index=pd.DatetimeIndex([datetime.date.fromordinal(day) for day in days], name="date"),
+        columns=["income", "expenses"],
+        dtype="int64"
+    )
+
+def _build_cash_flow_series(daily_sums, opening_balance=0):
+    """Resample per-date sums into daily, weekly and monthly cash-flow and running-balance frames (in fils)"""
+    daily = daily_sums.sort_index().asfreq("D", fill_value=0)
+    daily["net"] = daily["income"] - daily["expenses"]
+    daily["balance"] = opening_balance + daily["net"].cumsum()
+    daily["net_7d"] = daily["net"].rolling(7, min_periods=1).sum()
+    daily["net_30d"] = daily["net"].rolling(30, min_periods=1).sum()
+    
+    weekly = daily[["income", "expenses", "net"]].resample("W").sum()
+    weekly["balance"] = daily["balance"].resample("W").last()
+    weekly["net_4w"] = weekly["net"].rolling(4, min_periods=1).sum()
+    
+    monthly = daily[["income", "expenses", "net"]].resample("MS").sum()
+    monthly["balance"] = daily["balance"].resample("MS").last()
+    monthly["net_3m"] = monthly["net"].rolling(3, min_periods=1).sum()
+    
+    return {"daily": daily, "weekly": weekly, "monthly": monthly}
+
+def get_cash_flow():
+    """Return the daily, weekly and monthly cash-flow series, or None if there are no dated transactions.
+
+    The result is cached by ledger version. Between loads the ledger is append-only,
+    so when new transactions arrive only those rows are summed into the cached
+    per-date totals before resampling.
+    """
+    cache = state.cash_flow_cache
+    version = state.ledger_version
+    if cache and cache["version"] == version:
+        return cache["series"]
+    
+    transactions = state.transactions
+    if cache and cache["row_count"] <= len(transactions):
+        new_sums = _daily_cash_flow(transactions[cache["row_count"]:])
+        daily_sums = cache["daily_sums"].add(new_sums, fill_value=0).astype("int64")
+    else:
+        daily_sums = _daily_cash_flow()
+    
+    # The running balance opens at what the closed fiscal years left
+    archived_income, archived_expenses = get_archived_totals_fils()
+    series = _build_cash_flow_series(daily_sums, archived_income - archived_expenses) if not daily_sums.empty else None
+    state.cash_flow_cache = {
+        "version": version,
+        "row_count": len(transactions),
+        "daily_sums": daily_sums,
+        "series": series
+    }
+    return series
+
+def get_archived_cash_flow(year):
+    """Cash-flow series of a closed fiscal year, opening at the balance the years before it left"""
+    daily_sums = _daily_cash_flow(transactions=get_archived_stores(year)["transactions"])
+    if daily_sums.empty:
+        return None
+    opening_balance = sum(s["totals"]["income"] - s["totals"]["expenses"]
+                          for archived_year, s in get_archive_summaries().items() if archived_year < year)
+    return _build_cash_flow_series(daily_sums, opening_balance)
+
+def get_cash_flow_rows(start_date, end_date):
+    """Daily cash-flow rows with activity between two dates (inclusive), for reports"""
+    # Periods in a closed fiscal year are read from its archive
+    series = get_archived_cash_flow(start_date.year) if start_date.year in get_archive_summaries() else get_cash_flow()
+    if series is None:
+        return []
+    daily = series["daily"].loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+    daily = daily[(daily["income"] != 0) | (daily["expenses"] != 0)]
+    return [
+        {
+            "date": day.strftime("%Y-%m-%d"),
+            "income": fils_to_kd(row["income"]),
+            "expenses": fils_to_kd(row["expenses"]),
+            "net": fils_to_kd(row["net"]),
+            "balance": fils_to_kd(row["balance"])
+        }
+        for day, row in daily.iterrows()
+    ]
+
+def get_required_authorization(amount, category):
+    # Check if this is a new category
+    is_new_category = True
+    for section in ["income", "expenses"]:
+        if category in state.budget[section]:
+            is_new_category = False
+            break
+    
+    if is_new_category:
+        return ["Committee Vote"]
+    elif float(amount) > 100:
+        return auth_levels["Over 100 KD"]
+    else:
+        return auth_levels["Under 100 KD"]
+
+def check_transaction(description, category, income, expense, authorized_by):
+    """Validate a transaction before it is recorded, returning (ok, message)"""
+    if not description or not category:
+        return False, "Description and category are required"
+    
+    # Check authorization based on amount
+    amount = max(income, expense)
+    required_auth = get_required_authorization(amount, category)
+    if authorized_by not in required_auth and "Committee Vote" not in required_auth:
+        return False, f"This transaction requires authorization from: {', '.join(required_auth)}"
+    
+    return True, ""
+
+@traced(rows=lambda result: 1 if result[0] else 0)
+def add_transaction(date, description, category, income=0, expense=0, authorized_by="", receipt_num="", notes="", event_id=None, initiative_id=None):
+    # Validate transaction
+    ok, message = check_transaction(description, category, income, expense, authorized_by)
+    if not ok:
+        return False, message
+    
+    # Add transaction
+    transaction = {
+        "date": date,
+        "description": description,
+        "category": category,
+        "income": float(income),
+        "expense": float(expense),
+        "authorized_by": authorized_by,
+        "receipt_num": receipt_num,
+        "notes": notes,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "event_id": event_id,  # Link to event if applicable
+        "initiative_id": initiative_id  # Link to fundraising initiative if applicable
+    }
+    commit_transactions([transaction])
+    
+    return True, "Transaction added successfully"
+
+def ledger_file_kept():
+    """Whether this session keeps the ledger file. Another session can remove the
+    file; the session then stops writing to it instead of failing."""
+    if state.ledger_file and not ledger_exists():
+        state.ledger_file = False
+        state.ledger_file_removed = True
+        warnings.warn("The ledger file was removed by another session; transactions are no longer saved to it")
+    return state.ledger_file
+
+def commit_transactions(transactions):
+    """Append validated transactions to the ledger and update the budget, event,
+    initiative and monthly aggregates.
+
+    Amounts are summed in fils per budget line and per event first, so a batch
+    costs one update per aggregate rather than one per row.
+    """
+    if not transactions:
+        return
+    
+    rows = state.transactions.extend(transactions)
+    if state.ledger_file:
+        # Rows are only kept once they are in the file, so memory and disk never disagree
+        try:
+            with ledger_lock():
+                if ledger_file_kept():
+                    append_ledger(state.transactions, rows)
+        except BaseException:
+            state.transactions.delete_rows(rows)
+            raise
+    transactions = rows
+    state.ledger_version += 1
+    state.data_version += 1
+    
+    budget_totals = {}
+    touched_events = set()
+    for t in transactions:
+        record_monthly_totals(t)
+        
+        # Budget actuals (unknown categories fall back to the "Other" lines)
+        if t.fils("income") > 0:
+            line = get_budget_line("income", t["category"])
+            budget_totals[line] = budget_totals.get(line, 0) + t.fils("income")
+        if t.fils("expense") > 0:
+            line = get_budget_line("expenses", t["category"])
+            budget_totals[line] = budget_totals.get(line, 0) + t.fils("expense")
+        
+        # Event rollups
+        if t.get("event_id"):
+            add_to_event_rollup(state.event_rollups, t)
+            touched_events.add(t["event_id"])
+        
+        # Fundraising initiative running totals
+        if t.get("initiative_id"):
+            record_initiative_totals(t)
+    
+    for line, amount in budget_totals.items():
+        add_budget_actual(line, amount)
+    
+    for event_id in touched_events:
+        sync_event_totals(event_id)
+
+def get_budget_line(section, category):
+    """The (section, category) budget line a transaction counts towards"""
+    if category in state.budget[section]:
+        return section, category
+    return section, "Other Income" if section == "income" else "Other Expenses"
+
+def add_budget_actual(line, amount_fils):
+    """Add fils to a budget line's actual total and refresh its KD figure"""
+    section, category = line
+    total = state.budget_actuals.get(line, 0) + amount_fils
+    state.budget_actuals[line] = total
+    state.budget[section][category]["actual"] = fils_to_kd(total)
+
+def rebuild_budget_actuals():
+    """Recompute every budget line's actual total from the ledger"""
+    state.budget_actuals = {}
+    for section in ["income", "expenses"]:
+        for values in state.budget[section].values():
+            values["actual"] = 0
+    
+    category_sums = [state.transactions.group_sum_fils("category", ["income", "expense"])]
+    # Closed fiscal years count through their archived summaries
+    category_sums += [summary["categories"] for summary in get_archive_summaries().values()]
+    for sums in category_sums:
+        for category, (income, expense) in sums.items():
+            if income:
+                add_budget_actual(get_budget_line("income", category), income)
+            if expense:
+                add_budget_actual(get_budget_line("expenses", category), expense)
+
+def get_budget_lines(section):
+    """Budget, actual and variance per category of a budget section, in fils"""
+    lines = []
+    for category, values in state.budget[section].items():
+        budget = to_fils(values["budget"])
+        actual = state.budget_actuals.get((section, category), 0)
+        lines.append({"category": category, "budget": budget, "actual": actual, "variance": actual - budget})
+    return lines
+
+def rename_budget_category(section, old_name, new_name):
+    """Rename a budget category, returning (ok, message).
+
+    Transactions and event expenses store categories as codes into a shared code
+    table, so relabelling every record is one table update; the budget line and the
+    small per-category aggregates are re-keyed alongside it. Closed fiscal years are
+    relabelled on disk (their summaries and archived records) and in memory.
+    """
+    new_name = new_name.strip()
+    if not new_name:
+        return False, "New category name is required"
+    if old_name in ["Other Income", "Other Expenses"]:
+        return False, f"'{old_name}' collects uncategorised amounts and can't be renamed"
+    other_section = "expenses" if section == "income" else "income"
+    if old_name in state.budget[other_section]:
+        return False, f"'{old_name}' is used by both income and expenses and can't be renamed"
+    table = state.code_tables.get("category")
+    if new_name in state.budget["income"] or new_name in state.budget["expenses"] or (table and new_name in table.codes):
+        return False, f"A category named '{new_name}' already exists"
+    if any(new_name in summary["categories"] for summary in get_archive_summaries().values()):
+        return False, f"A category named '{new_name}' already exists in a closed fiscal year"
+    
+    if table and old_name in table.codes:
+        table.rename(old_name, new_name)
+        if ledger_file_kept():
+            rename_ledger_value("category", old_name, new_name)
+    if get_archive_summaries():
+        rename_category(old_name, new_name, STORE_FIELDS)
+        for summary in get_archive_summaries().values():
+            rename_summary_category(summary, old_name, new_name)
+        state.archive_cache = {}
+    
+    state.budget[section] = {
+        (new_name if category == old_name else category): values
+        for category, values in state.budget[section].items()
+    }
+    if (section, old_name) in state.budget_actuals:
+        state.budget_actuals[(section, new_name)] = state.budget_actuals.pop((section, old_name))
+    for totals in state.monthly_totals.values():
+        if old_name in totals["categories"]:
+            totals["categories"][new_name] = totals["categories"].pop(old_name)
+    for rollup in state.event_rollups.values():
+        if old_name in rollup["expense_breakdown"]:
+            rollup["expense_breakdown"][new_name] = rollup["expense_breakdown"].pop(old_name)
+    state.ledger_version += 1
+    state.data_version += 1
+    
+    return True, f"Renamed '{old_name}' to '{new_name}'"
+
+def get_transaction_period(transaction):
+    """Return the (year, month) a transaction is reported in, or None if it has no valid timestamp"""
+    micros = transaction.raw("timestamp")
+    if micros is None:
+        return None
+    moment = from_timestamp(micros)
+    return moment.year, moment.month
+
+def _empty_year_totals():
+    return {"income": [0] * 12, "expenses": [0] * 12, "categories": {}}
+
+def record_monthly_totals(transaction):
+    """Add a transaction to the cumulative monthly totals of its year.
+
+    Each array holds running totals in fils, so index m is the year-to-date figure
+    at the end of month m + 1 and a YTD lookup is a single read.
+    """
+    period = get_transaction_period(transaction)
+    if not period:
+        return
+    year, month = period
+    totals = state.monthly_totals.setdefault(year, _empty_year_totals())
+    category_totals = totals["categories"].setdefault(
+        transaction["category"], {"income": [0] * 12, "expenses": [0] * 12}
+    )
+    
+    income = transaction.fils("income")
+    expense = transaction.fils("expense")
+    for i in range(month - 1, 12):
+        totals["income"][i] += income
+        totals["expenses"][i] += expense
+        category_totals["income"][i] += income
+        category_totals["expenses"][i] += expense
+
+def add_year_totals(totals, other):
+    """Add one year's cumulative monthly totals into another's"""
+    for key in ["income", "expenses"]:
+        totals[key] = [a + b for a, b in zip(totals[key], other[key])]
+    for category, values in other["categories"].items():
+        category_totals = totals["categories"].setdefault(category, {"income": [0] * 12, "expenses": [0] * 12})
+        for key in ["income", "expenses"]:
+            category_totals[key] = [a + b for a, b in zip(category_totals[key], values[key])]
+
+def rebuild_monthly_totals():
+    """Recompute the cumulative monthly totals from the transaction list and the archived years"""
+    state.monthly_totals = compute_monthly_totals(state.transactions)
+    for year, summary in get_archive_summaries().items():
+        add_year_totals(state.monthly_totals.setdefault(year, _empty_year_totals()), summary["monthly_totals"])
+
+def compute_monthly_totals(transactions, rows=None):
+    """Cumulative monthly totals per year of a transaction store (all rows, or the given views).
+
+    Transactions are bucketed by their integer month number and summed exactly in
+    int64 per year (and per category code), then accumulated into running totals.
+    """
+    monthly_totals = {}
+    months = transactions.month_numbers("timestamp", rows)
+    dated = months >= 0
+    months = months[dated]
+    codes = transactions.column_array("category", rows)[dated]
+    income = transactions.column_array("income", rows)[dated]
+    expense = transactions.column_array("expense", rows)[dated]
+    category_names = transactions.code_tables["category"].values
+    
+    def running_totals(keys, values, size):
+        return np.cumsum(group_sums(keys, values, size * 12).reshape(size, 12), axis=1)
+    
+    for year_index in np.unique(months // 12):
+        in_year = months // 12 == year_index
+        month = months[in_year] % 12
+        year_codes = codes[in_year]
+        totals = _empty_year_totals()
+        totals["income"] = running_totals(month, income[in_year], 1)[0].tolist()
+        totals["expenses"] = running_totals(month, expense[in_year], 1)[0].tolist()
+        
+        category_keys = year_codes * 12 + month
+        category_income = running_totals(category_keys, income[in_year], len(category_names))
+        category_expenses = running_totals(category_keys, expense[in_year], len(category_names))
+        for code in np.flatnonzero(np.bincount(year_codes, minlength=len(category_names))):
+            totals["categories"][category_names[code]] = {
+                "income": category_income[code].tolist(),
+                "expenses": category_expenses[code].tolist()
+            }
+        monthly_totals[1970 + int(year_index)] = totals
+    return monthly_totals
+
+def get_ytd_totals(year, month):
+    """Return (income, expenses, per-category totals) in KD from January up to the end of `month`"""
+    totals = state.monthly_totals.get(year)
+    if not totals:
+        return 0.0, 0.0, {}
+    index = month - 1
+    categories = {
+        category: {"income": fils_to_kd(values["income"][index]), "expenses": fils_to_kd(values["expenses"][index])}
+        for category, values in totals["categories"].items()
+        if values["income"][index] or values["expenses"][index]
+    }
+    return fils_to_kd(totals["income"][index]), fils_to_kd(totals["expenses"][index]), categories
+
+@traced(rows=lambda report: len(report["monthly_breakdown"]))
+def generate_ytd_report(month=None, year=None):
+    """Generate a year-to-date report, compared against the same period of the previous year"""
+    now = datetime.datetime.now()
+    month = month or now.month
+    year = year or now.year
+    
+    income, expenses, categories = get_ytd_totals(year, month)
+    prev_income, prev_expenses, _ = get_ytd_totals(year - 1, month)
+    
+    # Per-month figures are the differences between consecutive running totals
+    monthly_breakdown = []
+    totals = state.monthly_totals.get(year, _empty_year_totals())
+    for i in range(month):
+        month_income = totals["income"][i] - (totals["income"][i - 1] if i else 0)
+        month_expenses = totals["expenses"][i] - (totals["expenses"][i - 1] if i else 0)
+        monthly_breakdown.append({
+            "month": calendar.month_name[i + 1],
+            "income": fils_to_kd(month_income),
+            "expenses": fils_to_kd(month_expenses),
+            "net": fils_to_kd(month_income - month_expenses)
+        })
+    
+    report = {
+        "month": month,
+        "year": year,
+        "total_income": income,
+        "total_expenses": expenses,
+        "net": fils_to_kd(to_fils(income) - to_fils(expenses)),
+        "categories": categories,
+        "monthly_breakdown": monthly_breakdown,
+        "previous_year": {
+            "total_income": prev_income,
+            "total_expenses": prev_expenses,
+            "net": fils_to_kd(to_fils(prev_income) - to_fils(prev_expenses))
+        }
+    }
+    
+    return report
+
+@traced(rows=lambda report: len(report["transactions"]))
+def generate_monthly_report(month=None, year=None):
+    now = datetime.datetime.now()
+    month = month or now.month
+    year = year or now.year
+    
+    # Closed fiscal years are read from their archive
+    transactions = get_archived_stores(year)["transactions"] if year in get_archive_summaries() else state.transactions
+    
+    # Transactions timestamped within the month (an integer range on the timestamp column)
+    month_start = datetime.datetime(year, month, 1)
+    month_end = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+    monthly_transactions = transactions.rows_between("timestamp", to_timestamp(month_start), to_timestamp(month_end))
+    
+    monthly_income = transactions.sum_fils("income", monthly_transactions)
+    monthly_expenses = transactions.sum_fils("expense", monthly_transactions)
+    balance = get_balance_fils()
+    reserve = get_emergency_reserve_fils()
+    
+    report = {
+        "month": month,
+        "year": year,
+        "total_income": fils_to_kd(monthly_income),
+        "total_expenses": fils_to_kd(monthly_expenses),
+        "net": fils_to_kd(monthly_income - monthly_expenses),
+        "transactions": transactions.to_records(monthly_transactions),
+        "cash_flow": get_cash_flow_rows(
+            datetime.date(year, month, 1),
+            datetime.date(year, month, calendar.monthrange(year, month)[1])
+        ),
+        "current_balance": fils_to_kd(balance),
+        "emergency_reserve": fils_to_kd(reserve),
+        "available_funds": fils_to_kd(balance - reserve)
+    }
+    
+    return report
+
+def create_event_budget(event_name, date, location, coordinator, event_type, projected_income=0, projected_expenses=0, price_per_person=0, target_participants=0, description=""):
+    # Generate a unique ID for the event
+    event_id = str(uuid.uuid4())
+    
+    event = {
+        "id": event_id,
+        "name": event_name,
+        "date": date,
+        "location": location,
+        "coordinator": coordinator,
+        "event_type": event_type,  # New field: event type (e.g., "Trip", "Fundraiser", etc.)
+        "price_per_person": float(price_per_person),  # New field for trip pricing
+        "target_participants": int(target_participants),  # New field for target number of participants
+        "description": description,  # New field for event description
+        "projected_income": float(projected_income),
+        "projected_expenses": float(projected_expenses),
+        "actual_income": 0,
+        "actual_expenses": 0,
+        "income_sources": [],
+        "expense_items": [],
+        "status": "Planning",  # Planning, Active, Completed
+        "created_at": datetime.datetime.now().isoformat()
+    }
+    
+    event = state.events.append(event)
+    state.event_index[event_id] = event
+    index_event_date(event)
+    state.data_version += 1
+    return True, "Event budget created successfully", event_id
+
+def get_event(event_id):
+    """Look up an event by id"""
+    return state.event_index.get(event_id)
+
+def _empty_event_rollup():
+    return {"income": 0, "expenses": 0, "participant_count": 0, "expense_count": 0, "expense_breakdown": {}}
+
+def get_event_rollup(event_id):
+    """Income, expenses, expense breakdown and counts for an event.
+
+    Money figures (in fils) come only from ledger transactions linked to the event,
+    and the counts from its participant payment and expense records. The rollups are kept
+    up to date on write, so reading them is O(1).
+    """
+    return state.event_rollups.get(event_id) or _empty_event_rollup()
+
+def add_to_event_rollup(rollups, transaction):
+    """Add a ledger transaction linked to an event to that event's rollup"""
+    rollup = rollups.setdefault(transaction["event_id"], _empty_event_rollup())
+    rollup["income"] += transaction.fils("income")
+    rollup["expenses"] += transaction.fils("expense")
+    if transaction.fils("expense") > 0:
+        breakdown = rollup["expense_breakdown"]
+        breakdown[transaction["category"]] = breakdown.get(transaction["category"], 0) + transaction.fils("expense")
+
+def sync_event_totals(event_id):
+    """Copy an event's rollup into its actual_income/actual_expenses fields, which backups carry"""
+    event = get_event(event_id)
+    if event:
+        rollup = get_event_rollup(event_id)
+        event["actual_income"] = fils_to_kd(rollup["income"])
+        event["actual_expenses"] = fils_to_kd(rollup["expenses"])
+
+def compute_event_rollups():
+    """Compute every event rollup from scratch from the ledger and the participant/expense records"""
+    rollups = {}
+    # Linked transactions of closed fiscal years count through their archived summaries
+    for summary in get_archive_summaries().values():
+        for event_id, archived in summary["event_rollups"].items():
+            rollup = rollups.setdefault(event_id, _empty_event_rollup())
+            rollup["income"] += archived["income"]
+            rollup["expenses"] += archived["expenses"]
+            for category, amount in archived["expense_breakdown"].items():
+                rollup["expense_breakdown"][category] = rollup["expense_breakdown"].get(category, 0) + amount
+    for t in state.transactions:
+        if t.get("event_id"):
+            add_to_event_rollup(rollups, t)
+    for p in state.event_participants:
+        rollups.setdefault(p["event_id"], _empty_event_rollup())["participant_count"] += 1
+    for e in state.event_expenses:
+        rollups.setdefault(e["event_id"], _empty_event_rollup())["expense_count"] += 1
+    return rollups
+
+def rebuild_event_rollups():
+    """Replace the event rollups with freshly computed ones"""
+    state.event_rollups = compute_event_rollups()
+    for event in state.events:
+        sync_event_totals(event.get("id"))
+
+def verify_event_rollups():
+    """Rebuild the event rollups and compare them with the maintained ones.
+
+    Returns a list of mismatches (empty when everything agrees).
+    """
+    rebuilt = compute_event_rollups()
+    mismatches = []
+    for event_id in set(rebuilt) | set(state.event_rollups):
+        stored = get_event_rollup(event_id)
+        fresh = rebuilt.get(event_id) or _empty_event_rollup()
+        event = get_event(event_id)
+        for field in ["income", "expenses", "participant_count", "expense_count"]:
+            if stored[field] != fresh[field]:
+                money = field in ["income", "expenses"]
+                mismatches.append({
+                    "event": event["name"] if event else event_id,
+                    "field": field,
+                    "stored": fils_to_kd(stored[field]) if money else stored[field],
+                    "rebuilt": fils_to_kd(fresh[field]) if money else fresh[field]
+                })
+        for category in set(stored["expense_breakdown"]) | set(fresh["expense_breakdown"]):
+            stored_amount = stored["expense_breakdown"].get(category, 0)
+            fresh_amount = fresh["expense_breakdown"].get(category, 0)
+            if stored_amount != fresh_amount:
+                mismatches.append({
+                    "event": event["name"] if event else event_id,
+                    "field": f"expenses: {category}",
+                    "stored": fils_to_kd(stored_amount),
+                    "rebuilt": fils_to_kd(fresh_amount)
+                })
+    return mismatches
+
+def rebuild_event_index():
+    """Rebuild the event id index and the date index from the event list"""
+    state.event_index = {e["id"]: e for e in state.events if e.get("id")}
+    state.event_date_index = {"all": [], "by_status": {}}
+    for event in state.event_index.values():
+        index_event_date(event)
+
+def _event_date_key(event):
+    """Sort key for the date index: (day number, id), with undated events first"""
+    return event.raw("date") or 0, event["id"]
+
+def index_event_date(event):
+    """Insert an event into the date-ordered index and its status bucket"""
+    index = state.event_date_index
+    key = _event_date_key(event)
+    bisect.insort(index["all"], key)
+    bisect.insort(index["by_status"].setdefault(event["status"], []), key)
+
+def update_event_status(event_id, status):
+    """Change an event's status, moving it to the matching status bucket"""
+    event = get_event(event_id)
+    if not event or event["status"] == status:
+        return
+    by_status = state.event_date_index["by_status"]
+    key = _event_date_key(event)
+    bucket = by_status.get(event["status"], [])
+    position = bisect.bisect_left(bucket, key)
+    if position < len(bucket) and bucket[position] == key:
+        del bucket[position]
+    event["status"] = status
+    bisect.insort(by_status.setdefault(status, []), key)
+    state.data_version += 1
+
+def get_events_in_range(start_date=None, end_date=None, statuses=None):
+    """Events dated between two dates (inclusive), oldest first.
+
+    Either end may be left open, and `statuses` limits the result to those status
+    buckets. Each bucket is searched with bisect, so the cost is logarithmic in the
+    number of events plus the size of the result.
+    """
+    index = state.event_date_index
+    low = (start_date.toordinal() if start_date else -1, "")
+    high = (end_date.toordinal() if end_date else datetime.date.max.toordinal(), "\uffff")
+    
+    buckets = [index["all"]] if statuses is None else [index["by_status"].get(status, []) for status in statuses]
+    keys = []
+    for bucket in buckets:
+        keys.extend(bucket[bisect.bisect_left(bucket, low):bisect.bisect_right(bucket, high)])
+    if len(buckets) > 1:
+        keys.sort()
+    
+    return [state.event_index[event_id] for _, event_id in keys]
+
+def get_upcoming_events(days=None):
+    """Planned and active events, optionally only those in the next `days` days"""
+    if days is None:
+        return get_events_in_range(statuses=["Planning", "Active"])
+    today = datetime.date.today()
+    return get_events_in_range(today, today + datetime.timedelta(days=days), statuses=["Planning", "Active"])
+
+def normalize_participant_name(name):
+    """Normalise a participant name for matching: case-insensitive, single-spaced"""
+    return " ".join(str(name).split()).casefold()
+
+def get_payment_key(event_id, participant_name, payment_amount, payment_date):
+    """Key identifying a participant payment for duplicate detection"""
+    return (event_id, normalize_participant_name(participant_name), to_fils(payment_amount), str(payment_date))
+
+def rebuild_payment_index():
+    """Rebuild the duplicate-payment index from the participant payments (first payment wins)"""
+    state.payment_index = {}
+    for p in state.event_participants:
+        key = get_payment_key(p["event_id"], p["participant_name"], p["payment_amount"], p["payment_date"])
+        state.payment_index.setdefault(key, p["id"])
+
+def find_duplicate_payments():
+    """Group participant payments that share the same normalised key.
+
+    Returns one entry per group of two or more payments, for the dedupe report.
+    """
+    groups = {}
+    for p in state.event_participants:
+        key = get_payment_key(p["event_id"], p["participant_name"], p["payment_amount"], p["payment_date"])
+        groups.setdefault(key, []).append(p)
+    
+    duplicates = []
+    for (event_id, _, amount, payment_date), payments in groups.items():
+        if len(payments) > 1:
+            event = get_event(event_id)
+            duplicates.append({
+                "event": event["name"] if event else event_id,
+                "participant_name": payments[0]["participant_name"],
+                "payment_amount": fils_to_kd(amount),
+                "payment_date": payment_date,
+                "count": len(payments),
+                "payment_ids": [p["id"] for p in payments]
+            })
+    
+    return duplicates
+
+# Longest word prefix stored in the participant search index; longer queries use trigrams
+SEARCH_PREFIX_LENGTH = 12
+
+def _name_trigrams(name):
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+def index_participant_payment(participant):
+    """Add a participant payment to the cross-event name search index.
+
+    Every prefix (up to SEARCH_PREFIX_LENGTH characters) starting at each word of
+    the normalised name maps to that name, and so does every trigram of it, so
+    prefix lookups are one dict read and substring lookups intersect a few sets.
+    """
+    index = state.participant_search_index
+    name = normalize_participant_name(participant["participant_name"])
+    
+    entry = index["names"].get(name)
+    if entry is None:
+        entry = index["names"][name] = {"display_name": participant["participant_name"].strip(), "payments": []}
+        
+        words = name.split(" ")
+        for i in range(len(words)):
+            tail = " ".join(words[i:])
+            for length in range(1, min(len(tail), SEARCH_PREFIX_LENGTH) + 1):
+                index["prefixes"].setdefault(tail[:length], set()).add(name)
+        for gram in _name_trigrams(name):
+            index["trigrams"].setdefault(gram, set()).add(name)
+    
+    entry["payments"].append(participant)
+
+def rebuild_participant_search_index():
+    """Rebuild the participant search index from all participant payments"""
+    state.participant_search_index = {"names": {}, "prefixes": {}, "trigrams": {}}
+    for p in state.event_participants:
+        index_participant_payment(p)
+
+def search_participants(query, limit=20):
+    """Find participant names matching a query across all events.
+
+    Names with a word starting with the query come first, followed by names that
+    contain it anywhere. Returns a list of normalised names.
+    """
+    index = state.participant_search_index
+    query = normalize_participant_name(query)
+    if not query:
+        return []
+    
+    prefix_matches = set(index["prefixes"].get(query[:SEARCH_PREFIX_LENGTH], set()))
+    if len(query) > SEARCH_PREFIX_LENGTH:
+        prefix_matches = {name for name in prefix_matches if f" {query}" in f" {name}"}
+    
+    substring_matches = set()
+    if len(query) >= 3:
+        gram_sets = sorted((index["trigrams"].get(gram, set()) for gram in _name_trigrams(query)), key=len)
+        candidates = set.intersection(*gram_sets) if gram_sets else set()
+        substring_matches = {name for name in candidates if query in name} - prefix_matches
+    
+    return (sorted(prefix_matches) + sorted(substring_matches))[:limit]
+
+def _empty_event_balances():
+    return {"participants": {}, "by_paid": [], "capped_paid": 0, "paid_in_full": 0}
+
+def record_participant_balance(participant):
+    """Add a payment to its participant's paid-to-date total within the event.
+
+    Participants are grouped by normalised name. Each event keeps its participants
+    in a list sorted by amount paid (maintained with bisect, so the ones who owe the
+    most are at the front), plus the sum of payments capped at the price and the
+    number paid in full, so the event's outstanding total needs no scan. Amounts
+    are kept in fils.
+    """
+    event = get_event(participant["event_id"])
+    price = event.fils("price_per_person") if event else 0
+    balances = state.participant_balances.setdefault(participant["event_id"], _empty_event_balances())
+    name = normalize_participant_name(participant["participant_name"])
+    
+    entry = balances["participants"].get(name)
+    if entry is None:
+        entry = balances["participants"][name] = {"name": participant["participant_name"].strip(), "paid": 0, "payments": 0}
+        old_paid = None
+    else:
+        old_paid = entry["paid"]
+        del balances["by_paid"][bisect.bisect_left(balances["by_paid"], (old_paid, name))]
+    
+    entry["paid"] += participant.fils("payment_amount")
+    entry["payments"] += 1
+    bisect.insort(balances["by_paid"], (entry["paid"], name))
+    
+    # Capped totals only change by the part of the payment up to the price
+    old_capped = min(old_paid, price) if old_paid is not None else 0
+    balances["capped_paid"] += min(entry["paid"], price) - old_capped
+    if entry["paid"] >= price and (old_paid is None or old_paid < price):
+        balances["paid_in_full"] += 1
+
+def rebuild_participant_balances():
+    """Recompute every participant's paid-to-date total from the participant payments"""
+    state.participant_balances = {}
+    for p in state.event_participants:
+        record_participant_balance(p)
+
+def get_event_balances(event_id, limit=None):
+    """Outstanding balance summary for an event.
+
+    Returns counts of participants paid in full and part-paid, the event's
+    outstanding total and the participants sorted by amount owed (largest first,
+    at most `limit` of them).
+    """
+    event = get_event(event_id)
+    price = event.fils("price_per_person") if event else 0
+    balances = state.participant_balances.get(event_id) or _empty_event_balances()
+    participant_count = len(balances["participants"])
+    
+    owes_most = []
+    for paid, name in balances["by_paid"][:limit]:
+        if paid >= price:
+            break
+        entry = balances["participants"][name]
+        owes_most.append({
+            "name": entry["name"],
+            "paid": fils_to_kd(paid),
+            "outstanding": fils_to_kd(price - paid),
+            "payments": entry["payments"]
+        })
+    
+    summary = {
+        "price_per_person": fils_to_kd(price),
+        "participant_count": participant_count,
+        "paid_in_full": balances["paid_in_full"],
+        "part_paid": participant_count - balances["paid_in_full"],
+        "outstanding_total": fils_to_kd(participant_count * price - balances["capped_paid"]),
+        "owes_most": owes_most
+    }
+    
+    return summary
+
+def get_participant_history(name):
+    """Payment history and outstanding balance per event for one participant (normalised name)"""
+    entry = state.participant_search_index["names"].get(name)
+    if not entry:
+        return None
+    
+    payments = sorted(entry["payments"], key=lambda p: (p.raw("payment_date") or 0, p.raw("timestamp") or 0))
+    
+    # Paid-to-date per event comes from the participant balances
+    events = {}
+    total_outstanding = 0
+    for p in payments:
+        if p["event_id"] in events:
+            continue
+        event = get_event(p["event_id"])
+        price = event.fils("price_per_person") if event else 0
+        paid = state.participant_balances[p["event_id"]]["participants"][name]["paid"]
+        outstanding = max(price - paid, 0)
+        total_outstanding += outstanding
+        events[p["event_id"]] = {
+            "event": event["name"] if event else "",
+            "date": event["date"] if event else "",
+            "price_per_person": fils_to_kd(price),
+            "paid": fils_to_kd(paid),
+            "outstanding": fils_to_kd(outstanding)
+        }
+    
+    history = {
+        "name": entry["display_name"],
+        "payments": state.event_participants.to_records(payments),
+        "events": list(events.values()),
+        "total_paid": fils_to_kd(state.event_participants.sum_fils("payment_amount", payments)),
+        "total_outstanding": fils_to_kd(total_outstanding)
+    }
+    
+    return history
+
+def add_event_participant(event_id, participant_name, payment_amount, payment_date, payment_method="Cash", notes="", allow_duplicate=False, authorized_by=None):
+    """Add a participant payment to an event (e.g., trip participant), authorized by
+    the given committee member (the event's coordinator if not given)"""
+    if not event_id or not participant_name:
+        return False, "Event and participant name are required", None
+    
+    # Check if the event exists
+    event = get_event(event_id)
+    if not event:
+        return False, "Event not found", None
+    
+    # Block a payment that matches one already recorded, unless explicitly allowed
+    payment_key = get_payment_key(event_id, participant_name, payment_amount, payment_date)
+    if payment_key in state.payment_index and not allow_duplicate:
+        return False, (f"A payment of KD {float(payment_amount):.2f} from {participant_name} on {payment_date} "
+                       f"is already recorded for this event"), None
+    
+    # The payment is only recorded if its ledger transaction can be
+    authorized_by = authorized_by or event["coordinator"]
+    description = f"Payment from {participant_name} for {event['name']}"
+    ok, message = check_transaction(description, "Trip Payments", float(payment_amount), 0, authorized_by)
+    if not ok:
+        return False, message, None
+    
+    # Generate unique ID for this participant payment
+    participant_id = str(uuid.uuid4())
+    
+    # Add participant payment record
+    participant = {
+        "id": participant_id,
+        "event_id": event_id,
+        "participant_name": participant_name,
+        "payment_amount": float(payment_amount),
+        "payment_date": payment_date,
+        "payment_method": payment_method,
+        "notes": notes,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    
+    participant = state.event_participants.append(participant)
+    state.payment_index.setdefault(payment_key, participant_id)
+    index_participant_payment(participant)
+    record_participant_balance(participant)
+    state.event_rollups.setdefault(event_id, _empty_event_rollup())["participant_count"] += 1
+    
+    # Add a transaction for this payment (this updates the event's income)
+    add_transaction(
+        date=payment_date,
+        description=description,
+        category="Trip Payments",
+        income=float(payment_amount),
+        expense=0,
+        authorized_by=authorized_by,
+        receipt_num="",
+        notes=f"Participant payment for event: {event['name']}",
+        event_id=event_id
+    )
+    
+    return True, f"Added payment from {participant_name}", participant_id
+
+# Header spellings accepted for each roster column
+ROSTER_COLUMN_ALIASES = {
+    "name": "name", "participant_name": "name", "participant": "name", "student": "name",
+    "amount": "amount", "payment_amount": "amount",
+    "date": "date", "payment_date": "date",
+    "method": "method", "payment_method": "method",
+    "notes": "notes"
+}
+
+def parse_roster_csv(file):
+    """Read a roster CSV into a list of row dicts keyed by name, amount, date, method and notes"""
+    df = pd.read_csv(file, dtype=str, keep_default_na=False)
+    df.columns = [ROSTER_COLUMN_ALIASES.get(str(col).strip().lower().replace(" ", "_"), str(col).strip()) for col in df.columns]
+    return df.to_dict("records")
+
+def _parse_roster_date(value):
+    """Parse a roster payment date to YYYY-MM-DD, or return None if it is invalid"""
+    value = str(value).strip()
+    if not value:
+        return datetime.date.today().strftime("%Y-%m-%d")
+    try:
+        return datetime.date.fromisoformat(value).strftime("%Y-%m-%d")
+    except ValueError:
+        parsed = pd.to_datetime(value, dayfirst=True, errors="coerce")
+        return None if pd.isna(parsed) else parsed.strftime("%Y-%m-%d")
+
+def _check_roster_row(row, authorized_by):
+    """Validate one roster row, returning ((name, amount, date, method, notes), None) or (None, reason)"""
+    name = str(row.get("name", "")).strip()
+    if not name:
+        return None, "Participant name is required"
+    
+    try:
+        amount = float(str(row.get("amount", "")).strip())
+    except ValueError:
+        return None, f"Invalid amount: {row.get('amount', '')!r}"
+    if not 0 < amount < float("inf"):
+        return None, f"Amount must be greater than zero: {row.get('amount', '')!r}"
+    
+    payment_date = _parse_roster_date(row.get("date", ""))
+    if not payment_date:
+        return None, f"Invalid date: {row.get('date', '')!r}"
+    
+    methods = {m.lower(): m for m in PAYMENT_METHODS}
+    method = methods.get(str(row.get("method", "")).strip().lower() or "cash")
+    if not method:
+        return None, f"Unknown payment method: {row.get('method', '')!r}"
+    
+    ok, message = check_transaction(name, "Trip Payments", amount, 0, authorized_by)
+    if not ok:
+        return None, message
+    
+    return (name, amount, payment_date, method, str(row.get("notes", "")).strip()), None
+
+def import_event_roster(event_id, rows, allow_duplicates=False, authorized_by=None):
+    """Record a roster of participant payments for one event in a single batch.
+
+    Every row is validated first; the accepted payments are then appended and the
+    linked transactions committed together, so the event lookup, budget and event
+    totals are updated once for the whole roster. Returns (imported count, rejected
+    rows), where each rejected row carries its row number and the reason.
+    Payments that duplicate a recorded payment, or an earlier row of the same
+    roster, are rejected unless allow_duplicates is set. The payments are authorized
+    by the given committee member (the event's coordinator if not given).
+    """
+    event = get_event(event_id)
+    if not event:
+        return 0, [{"row": None, "name": "", "reason": "Event not found"}]
+    authorized_by = authorized_by or event["coordinator"]
+    
+    timestamp = datetime.datetime.now().isoformat()
+    participants = []
+    transactions = []
+    rejected = []
+    
+    for row_number, row in enumerate(rows, start=1):
+        parsed, reason = _check_roster_row(row, authorized_by)
+        if reason:
+            rejected.append({"row": row_number, "name": str(row.get("name", "")).strip(), "reason": reason})
+            continue
+        
+        name, amount, payment_date, method, notes = parsed
+        payment_key = get_payment_key(event_id, name, amount, payment_date)
+        if payment_key in state.payment_index and not allow_duplicates:
+            rejected.append({"row": row_number, "name": name, "reason": "Duplicate of a recorded payment or an earlier row"})
+            continue
+        
+        participant_id = str(uuid.uuid4())
+        state.payment_index.setdefault(payment_key, participant_id)
+        participants.append({
+            "id": participant_id,
+            "event_id": event_id,
+            "participant_name": name,
+            "payment_amount": amount,
+            "payment_date": payment_date,
+            "payment_method": method,
+            "notes": notes,
+            "timestamp": timestamp
+        })
+        transactions.append({
+            "date": payment_date,
+            "description": f"Payment from {name} for {event['name']}",
+            "category": "Trip Payments",
+            "income": amount,
+            "expense": 0.0,
+            "authorized_by": authorized_by,
+            "receipt_num": "",
+            "notes": f"Participant payment for event: {event['name']}",
+            "timestamp": timestamp,
+            "event_id": event_id,
+            "initiative_id": None
+        })
+    
+    participants = state.event_participants.extend(participants)
+    for participant in participants:
+        index_participant_payment(participant)
+        record_participant_balance(participant)
+    
+    state.event_rollups.setdefault(event_id, _empty_event_rollup())["participant_count"] += len(participants)
+    commit_transactions(transactions)
+    
+    return len(participants), rejected
+
+def add_event_expense(event_id, expense_description, expense_amount, expense_date, expense_category, paid_to="", receipt_num="", notes="", authorized_by=None):
+    """Add an expense to an event (e.g., trip expense), authorized by the given
+    committee member (the event's coordinator if not given)"""
+    if not event_id or not expense_description:
+        return False, "Event and expense description are required", None
+    
+    # Check if the event exists
+    event = get_event(event_id)
+    if not event:
+        return False, "Event not found", None
+    
+    # The expense is only recorded if its ledger transaction can be
+    authorized_by = authorized_by or event["coordinator"]
+    description = f"{expense_description} - {event['name']}"
+    ok, message = check_transaction(description, expense_category, 0, float(expense_amount), authorized_by)
+    if not ok:
+        return False, message, None
+    
+    # Generate unique ID for this expense
+    expense_id = str(uuid.uuid4())
+    
+    # Add expense record
+    expense = {
+        "id": expense_id,
+        "event_id": event_id,
+        "description": expense_description,
+        "amount": float(expense_amount),
+        "date": expense_date,
+        "category": expense_category,
+        "paid_to": paid_to,
+        "receipt_num": receipt_num,
+        "notes": notes,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    
+    state.event_expenses.append(expense)
+    state.event_rollups.setdefault(event_id, _empty_event_rollup())["expense_count"] += 1
+    
+    # Add a transaction for this expense (this updates the event's expenses)
+    add_transaction(
+        date=expense_date,
+        description=description,
+        category=expense_category,
+        income=0,
+        expense=float(expense_amount),
+        authorized_by=authorized_by,
+        receipt_num=receipt_num,
+        notes=f"Expense for event: {event['name']}",
+        event_id=event_id
+    )
+    
+    return True, f"Added expense: {expense_description}", expense_id
+
+# Record types accepted by ingest_records
+INGEST_TYPES = ["transaction", "participant", "expense"]
+
+def _parse_amount(value, name):
+    try:
+        amount = float(value or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name}: {value!r}") from None
+    if not 0 <= amount < float("inf"):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return amount
+
+def _text_field(record, name):
+    """A text field of an ingested record ("" when missing); lists and objects are rejected"""
+    value = record.get(name)
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return str(value)
+
+def _id_field(record, name):
+    """An id field of an ingested record (None when missing); ids are strings"""
+    value = record.get(name)
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return value
+
+def _prepare_ingest_record(record, timestamp, payment_keys):
+    """Validate one ingested record, returning (transaction, participant, expense)
+    with the store rows it adds, or raising ValueError with the reason. Payments
+    accepted earlier in the batch are in `payment_keys`, not yet in the index."""
+    if not isinstance(record, dict):
+        raise ValueError("A record must be a JSON object")
+    kind = record.get("type", "transaction")
+    if kind not in INGEST_TYPES:
+        raise ValueError(f"Unknown record type: {kind!r}")
+    
+    if kind == "transaction":
+        description = _text_field(record, "description").strip()
+        category = _text_field(record, "category").strip()
+        income = _parse_amount(record.get("income"), "income")
+        expense = _parse_amount(record.get("expense"), "expense")
+        transaction_date = _parse_roster_date(record.get("date", ""))
+        if not transaction_date:
+            raise ValueError(f"Invalid date: {record.get('date')!r}")
+        authorized_by = _text_field(record, "authorized_by")
+        ok, message = check_transaction(description, category, income, expense, authorized_by)
+        if not ok:
+            raise ValueError(message)
+        # Links must name a recorded event or initiative, or they would start orphan rollups
+        event_id = _id_field(record, "event_id")
+        if event_id and not get_event(event_id):
+            raise ValueError("Event not found")
+        initiative_id = _id_field(record, "initiative_id")
+        if initiative_id and initiative_id not in state.initiative_index:
+            raise ValueError("Fundraising initiative not found")
+        return {
+            "date": transaction_date,
+            "description": description,
+            "category": category,
+            "income": income,
+            "expense": expense,
+            "authorized_by": authorized_by,
+            "receipt_num": _text_field(record, "receipt_num"),
+            "notes": _text_field(record, "notes"),
+            "timestamp": timestamp,
+            "event_id": event_id,
+            "initiative_id": initiative_id
+        }, None, None
+    
+    event = get_event(_id_field(record, "event_id"))
+    if not event:
+        raise ValueError("Event not found")
+    # Like a transaction record, named by the record; the event's coordinator otherwise
+    authorized_by = _text_field(record, "authorized_by") or event["coordinator"]
+    
+    if kind == "participant":
+        parsed, reason = _check_roster_row({
+            "name": _text_field(record, "participant_name"),
+            "amount": record.get("payment_amount", ""),
+            "date": record.get("payment_date", ""),
+            "method": _text_field(record, "payment_method"),
+            "notes": _text_field(record, "notes")
+        }, authorized_by)
+        if reason:
+            raise ValueError(reason)
+        name, amount, payment_date, method, notes = parsed
+        payment_key = get_payment_key(event["id"], name, amount, payment_date)
+        if (payment_key in state.payment_index or payment_key in payment_keys) and not record.get("allow_duplicate"):
+            raise ValueError("Duplicate of a recorded payment")
+        participant_id = str(uuid.uuid4())
+        payment_keys.setdefault(payment_key, participant_id)
+        return {
+            "date": payment_date,
+            "description": f"Payment from {name} for {event['name']}",
+            "category": "Trip Payments",
+            "income": amount,
+            "expense": 0.0,
+            "authorized_by": authorized_by,
+            "receipt_num": "",
+            "notes": f"Participant payment for event: {event['name']}",
+            "timestamp": timestamp,
+            "event_id": event["id"],
+            "initiative_id": None
+        }, {
+            "id": participant_id,
+            "event_id": event["id"],
+            "participant_name": name,
+            "payment_amount": amount,
+            "payment_date": payment_date,
+            "payment_method": method,
+            "notes": notes,
+            "timestamp": timestamp
+        }, None
+    
+    description = _text_field(record, "description").strip()
+    category = _text_field(record, "category").strip()
+    amount = _parse_amount(record.get("amount"), "amount")
+    expense_date = _parse_roster_date(record.get("date", ""))
+    if not expense_date:
+        raise ValueError(f"Invalid date: {record.get('date')!r}")
+    ok, message = check_transaction(f"{description} - {event['name']}" if description else "", category, 0, amount, authorized_by)
+    if not ok:
+        raise ValueError(message)
+    return {
+        "date": expense_date,
+        "description": f"{description} - {event['name']}",
+        "category": category,
+        "income": 0.0,
+        "expense": amount,
+        "authorized_by": authorized_by,
+        "receipt_num": _text_field(record, "receipt_num"),
+        "notes": f"Expense for event: {event['name']}",
+        "timestamp": timestamp,
+        "event_id": event["id"],
+        "initiative_id": None
+    }, None, {
+        "id": str(uuid.uuid4()),
+        "event_id": event["id"],
+        "description": description,
+        "amount": amount,
+        "date": expense_date,
+        "category": category,
+        "paid_to": _text_field(record, "paid_to"),
+        "receipt_num": _text_field(record, "receipt_num"),
+        "notes": _text_field(record, "notes"),
+        "timestamp": timestamp
+    }
+
+def ingest_records(records):
+    """Record a mixed batch of transactions, participant payments and event expenses.
+    
+    Each record is a dict with a "type" from INGEST_TYPES (transaction when
+    missing) and the fields of the matching form, including authorized_by
+    (payments and expenses fall back to the event's coordinator). Every record is validated
+    first; the accepted ones are appended with one extend per store and their
+    ledger transactions committed together, so the indexes and aggregates are
+    updated once for the batch. Returns (accepted count, rejected), where each
+    rejected entry carries the record's position in the batch and the reason.
+    
+    A batch is all or nothing: validation changes no state, and the ledger
+    transactions are committed (rolled back if the ledger write fails) before
+    the participant and expense stores are touched, so if this raises nothing of
+    the batch was recorded.
+    """
+    timestamp = datetime.datetime.now().isoformat()
+    transactions = []
+    participants = []
+    expenses = []
+    rejected = []
+    payment_keys = {}
+    
+    for position, record in enumerate(records):
+        try:
+            transaction, participant, expense = _prepare_ingest_record(record, timestamp, payment_keys)
+        except ValueError as e:
+            rejected.append({"position": position, "reason": str(e)})
+            continue
+        except (TypeError, AttributeError) as e:
+            # Fields of the wrong JSON type that the checks above don't catch
+            rejected.append({"position": position, "reason": f"Malformed record: {e}"})
+            continue
+        transactions.append(transaction)
+        if participant:
+            participants.append(participant)
+        if expense:
+            expenses.append(expense)
+    
+    commit_transactions(transactions)
+    for payment_key, participant_id in payment_keys.items():
+        state.payment_index.setdefault(payment_key, participant_id)
+    for participant in state.event_participants.extend(participants):
+        index_participant_payment(participant)
+        record_participant_balance(participant)
+        state.event_rollups.setdefault(participant["event_id"], _empty_event_rollup())["participant_count"] += 1
+    for expense in state.event_expenses.extend(expenses):
+        state.event_rollups.setdefault(expense["event_id"], _empty_event_rollup())["expense_count"] += 1
+    
+    return len(transactions), rejected
+
+@traced(rows=lambda report: len(report["participants"]) + len(report["expenses"]))
+def generate_event_report(event_id):
+    """Generate a financial report for a specific event"""
+    event = get_event(event_id)
+    if not event:
+        return None
+    
+    # Figures come from the event rollup, so they match every other page
+    rollup = get_event_rollup(event_id)
+    
+    # Get all participants and expenses for this event
+    participants = [p for p in state.event_participants if p.get("event_id") == event_id]
+    expenses = [e for e in state.event_expenses if e.get("event_id") == event_id]
+    
+    # Generate report
+    report = {
+        "event": event.to_dict(),
+        "participants": state.event_participants.to_records(participants),
+        "expenses": state.event_expenses.to_records(expenses),
+        "total_payments": fils_to_kd(rollup["income"]),
+        "total_expenses": fils_to_kd(rollup["expenses"]),
+        "profit": fils_to_kd(rollup["income"] - rollup["expenses"]),
+        "expense_breakdown": {category: fils_to_kd(amount) for category, amount in rollup["expense_breakdown"].items()},
+        "participant_count": rollup["participant_count"],
+        "expense_count": rollup["expense_count"]
+    }
+    
+    return report
+
+def summarize_event(event):
+    """The all-events report row for an event, with its figures from the event rollup"""
+    rollup = get_event_rollup(event["id"])
+    return {
+        "id": event["id"],
+        "name": event["name"],
+        "date": event["date"],
+        "location": event["location"],
+        "event_type": event.get("event_type", ""),
+        "participants": rollup["participant_count"],
+        "income": fils_to_kd(rollup["income"]),
+        "expenses": fils_to_kd(rollup["expenses"]),
+        "profit": fils_to_kd(rollup["income"] - rollup["expenses"]),
+        "status": event["status"]
+    }
+
+def get_archived_event_rows(start_date=None, end_date=None, statuses=None):
+    """All-events report rows of archived events dated in a range and with one of the statuses"""
+    rows = []
+    for summary in get_archive_summaries().values():
+        for row in summary["events"]:
+            day = datetime.date.fromisoformat(row["date"])
+            if (start_date and day < start_date) or (end_date and day > end_date):
+                continue
+            if statuses is None or row["status"] in statuses:
+                rows.append(row)
+    return rows
+
+@traced(rows=lambda report: report["event_count"])
+def generate_all_events_report(start_date=None, end_date=None, statuses=None):
+    """Generate a summary report for all events, optionally limited to a date range and statuses"""
+    if not state.events and not get_archive_summaries():
+        return None
+    
+    # Most recent first, straight from the date index
+    events_summary = [summarize_event(event) for event in reversed(get_events_in_range(start_date, end_date, statuses))]
+    
+    # Events of closed fiscal years come from the rows archived with them
+    archived_rows = get_archived_event_rows(start_date, end_date, statuses)
+    if archived_rows:
+        events_summary = sorted(events_summary + archived_rows, key=lambda e: e["date"] or "", reverse=True)
+    
+    total_income = sum(to_fils(e["income"]) for e in events_summary)
+    total_expenses = sum(to_fils(e["expenses"]) for e in events_summary)
+    total_profit = total_income - total_expenses
+    
+    report = {
+        "events": events_summary,
+        "total_income": fils_to_kd(total_income),
+        "total_expenses": fils_to_kd(total_expenses),
+        "total_profit": fils_to_kd(total_profit),
+        "event_count": len(events_summary)
+    }
+    
+    return report
+
+def add_fundraising_initiative(name, dates, coordinator, goal_amount):
+    initiative = {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "dates": dates,
+        "coordinator": coordinator,
+        "goal_amount": float(goal_amount),
+        "actual_raised": 0,
+        "expenses": 0,
+        "net_proceeds": 0,
+        "status": "Planning"  # Planning, Active, Completed
+    }
+    
+    state.fundraising.append(initiative)
+    state.initiative_index[initiative["id"]] = initiative
+    return True, "Fundraising initiative added successfully"
+
+def add_initiative_totals(initiative_id, raised_fils, expenses_fils):
+    """Add fils to an initiative's raised and expense totals and refresh its KD figures"""
+    initiative = state.initiative_index.get(initiative_id)
+    if not initiative:
+        return
+    totals = state.initiative_totals.setdefault(initiative_id, {"raised": 0, "expenses": 0})
+    totals["raised"] += raised_fils
+    totals["expenses"] += expenses_fils
+    initiative["actual_raised"] = fils_to_kd(totals["raised"])
+    initiative["expenses"] = fils_to_kd(totals["expenses"])
+    initiative["net_proceeds"] = fils_to_kd(totals["raised"] - totals["expenses"])
+
+def record_initiative_totals(transaction):
+    """Add a linked transaction to its fundraising initiative's raised, expense and net totals"""
+    add_initiative_totals(transaction.get("initiative_id"), transaction.fils("income"), transaction.fils("expense"))
+
+def rebuild_initiative_index():
+    """Rebuild the initiative index and recompute every initiative's totals from the transactions"""
+    state.initiative_index = {}
+    state.initiative_totals = {}
+    for initiative in state.fundraising:
+        # Initiatives saved before they had ids get one now
+        initiative.setdefault("id", str(uuid.uuid4()))
+        initiative["actual_raised"] = 0
+        initiative["expenses"] = 0
+        initiative["net_proceeds"] = 0
+        state.initiative_index[initiative["id"]] = initiative
+    
+    initiative_sums = [state.transactions.group_sum_fils("initiative_id", ["income", "expense"])]
+    # Closed fiscal years count through their archived summaries
+    initiative_sums += [summary["initiatives"] for summary in get_archive_summaries().values()]
+    for sums in initiative_sums:
+        for initiative_id, (raised, expenses) in sums.items():
+            add_initiative_totals(initiative_id, raised, expenses)
+
+def get_goal_progress(initiative):
+    """Percentage of an initiative's goal reached by the amount raised"""
+    if initiative["goal_amount"] <= 0:
+        return 0.0
+    return initiative["actual_raised"] / initiative["goal_amount"] * 100
+
+@traced(rows=lambda report: len(report["income"]) + len(report["expenses"]))
+def generate_budget_report():
+    """Generate the budget report: budget, actual and variance per category of each section"""
+    return {section: [{
+        "category": line["category"],
+        "budget": fils_to_kd(line["budget"]),
+        "actual": fils_to_kd(line["actual"]),
+        "variance": fils_to_kd(line["variance"])
+    } for line in get_budget_lines(section)] for section in ["income", "expenses"]}
+
+@traced(rows=lambda report: len(report["initiatives"]))
+def generate_fundraising_report():
+    """Generate the fundraising results report from the initiative totals"""
+    initiatives = []
+    for initiative in state.fundraising:
+        initiatives.append({
+            "id": initiative["id"],
+            "name": initiative["name"],
+            "dates": initiative["dates"],
+            "coordinator": initiative["coordinator"],
+            "goal_amount": initiative["goal_amount"],
+            "actual_raised": initiative["actual_raised"],
+            "expenses": initiative["expenses"],
+            "net_proceeds": initiative["net_proceeds"],
+            "progress": get_goal_progress(initiative),
+            "status": initiative["status"]
+        })
+    
+    # Leaderboard: closest to (or furthest past) its goal first
+    leaderboard = sorted(initiatives, key=lambda x: (x["progress"], x["actual_raised"]), reverse=True)
+    
+    total_goal = sum(to_fils(i["goal_amount"]) for i in initiatives)
+    total_raised = sum(to_fils(i["actual_raised"]) for i in initiatives)
+    total_expenses = sum(to_fils(i["expenses"]) for i in initiatives)
+    
+    report = {
+        "initiatives": initiatives,
+        "leaderboard": leaderboard,
+        "total_goal": fils_to_kd(total_goal),
+        "total_raised": fils_to_kd(total_raised),
+        "total_expenses": fils_to_kd(total_expenses),
+        "total_net": fils_to_kd(total_raised - total_expenses),
+        "overall_progress": total_raised / total_goal * 100 if total_goal > 0 else 0.0,
+        "initiative_count": len(initiatives)
+    }
+    
+    return report
+
+# Fiscal-year archive
+# Fiscal years follow the calendar years the reports already use. Closing a year
+# moves its records to the on-disk archive (see fiscal_archive), leaving the
+# active stores with the current years only.
+def load_archive():
+    """Read the archived year summaries and fold them into every aggregate"""
+    state.archive_summaries = read_summaries()
+    state.archive_cache = {}
+    rebuild_aggregates()
+
+def get_report_years():
+    """Years offered by the report pickers: two either side of this one, plus every archived year"""
+    current_year = datetime.date.today().year
+    return sorted(set(range(current_year - 2, current_year + 3)) | set(get_archive_summaries()))
+
+def get_closable_years():
+    """Past years that still have transactions or completed events in memory"""
+    current_year = datetime.date.today().year
+    years = set(state.transactions.month_numbers("timestamp") // 12 + 1970)
+    years.update(datetime.date.fromordinal(event.raw("date")).year
+                 for event in get_events_in_range(statuses=["Completed"]) if event.raw("date"))
+    return sorted(int(year) for year in years if 1970 <= year < current_year and year not in get_archive_summaries())
+
+def close_fiscal_year(year):
+    """Archive a past fiscal year and drop its records from memory, returning (ok, message).
+
+    The year's transactions (by timestamp) and its completed events, with their
+    participant payments and expenses, are written to the archive together with the
+    year-level totals every aggregate needs, so nothing has to read them back
+    unless a historical report asks for that year.
+    """
+    if not ledger_file_kept():
+        return _close_fiscal_year(year)
+    # The ledger is rewritten without the year's rows: hold its lock throughout, and
+    # start from the file, so rows other sessions and processes appended are kept
+    with ledger_lock():
+        load_disk_state()
+        return _close_fiscal_year(year)
+
+def _close_fiscal_year(year):
+    if year >= datetime.date.today().year:
+        return False, "Only past fiscal years can be closed"
+    if year in get_archive_summaries() or is_archived(year):
+        return False, f"{year} is already archived"
+    # Oldest first, so the active years always follow the archived ones
+    earlier_years = [y for y in get_closable_years() if y < year]
+    if earlier_years:
+        return False, f"Close {earlier_years[0]} before {year}"
+    
+    transactions = state.transactions
+    year_transactions = transactions.rows_between(
+        "timestamp", to_timestamp(datetime.datetime(year, 1, 1)), to_timestamp(datetime.datetime(year + 1, 1, 1))
+    )
+    year_events = get_events_in_range(datetime.date(year, 1, 1), datetime.date(year, 12, 31), statuses=["Completed"])
+    event_ids = {event["id"] for event in year_events}
+    archived = {
+        "transactions": year_transactions,
+        "events": year_events,
+        "event_participants": [p for p in state.event_participants if p["event_id"] in event_ids],
+        "event_expenses": [e for e in state.event_expenses if e["event_id"] in event_ids]
+    }
+    if not year_transactions and not year_events:
+        return False, f"Nothing recorded in {year} to archive"
+    
+    event_rollups = {}
+    for t in year_transactions:
+        if t.get("event_id"):
+            add_to_event_rollup(event_rollups, t)
+    
+    summary = {
+        "year": year,
+        "closed_at": datetime.datetime.now().isoformat(),
+        "counts": {key: len(rows) for key, rows in archived.items()},
+        "totals": {
+            "income": transactions.sum_fils("income", year_transactions),
+            "expenses": transactions.sum_fils("expense", year_transactions)
+        },
+        "monthly_totals": compute_monthly_totals(transactions, year_transactions).get(year, _empty_year_totals()),
+        "categories": transactions.group_sum_fils("category", ["income", "expense"], year_transactions),
+        "initiatives": transactions.group_sum_fils("initiative_id", ["income", "expense"], year_transactions),
+        "event_rollups": event_rollups,
+        "events": [summarize_event(event) for event in year_events]
+    }
+    write_year(year, {key: (state[key], rows) for key, rows in archived.items()}, summary)
+    
+    for key, rows in archived.items():
+        state[key].delete_rows(rows)
+    if state.ledger_file:
+        write_ledger(state.transactions)
+    load_archive()
+    
+    return True, f"Archived {year}: {len(year_transactions)} transactions and {len(year_events)} completed events"
+
+def _pack_filename(name):
+    """Make a name safe to use as a file name inside the report pack"""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(name)).strip("_") or "report"
+
+def build_report_pack_jobs(year):
+    """Collect every monthly, event and budget artifact for the report pack of a year"""
+    jobs = []
+    
+    # Monthly reports
+    transaction_columns = ["date", "description", "category", "income", "expense", "authorized_by", "receipt_num", "notes"]
+    for month in range(1, 13):
+        report = generate_monthly_report(month, year)
+        month_name = calendar.month_name[month]
+        prefix = f"monthly/{year}-{month:02d}_{month_name}"
+        jobs.append({
+            "kind": "monthly_pdf",
+            "filename": f"{prefix}.pdf",
+            "payload": {"report": report, "month_name": month_name, "year": year}
+        })
+        jobs.append({
+            "kind": "csv",
+            "filename": f"{prefix}.csv",
+            "payload": {
+                "columns": transaction_columns,
+                "rows": [[t.get(col, "") for col in transaction_columns] for t in report["transactions"]]
+            }
+        })
+    
+    # Year-to-date report for the full year
+    jobs.append({
+        "kind": "ytd_pdf",
+        "filename": f"monthly/{year}_year_to_date.pdf",
+        "payload": {"report": generate_ytd_report(12, year), "month_name": calendar.month_name[12], "year": year}
+    })
+    
+    # Event reports
+    participant_columns = ["participant_name", "payment_amount", "payment_date", "payment_method", "notes"]
+    expense_columns = ["description", "amount", "date", "category", "paid_to", "receipt_num", "notes"]
+    for event in state.events:
+        report = generate_event_report(event.get("id"))
+        if not report:
+            continue
+        prefix = f"events/{_pack_filename(event['name'])}_{event['id'][:8]}"
+        jobs.append({"kind": "event_pdf", "filename": f"{prefix}.pdf", "payload": report})
+        jobs.append({
+            "kind": "csv",
+            "filename": f"{prefix}_participants.csv",
+            "payload": {
+                "columns": participant_columns,
+                "rows": [[p.get(col, "") for col in participant_columns] for p in report["participants"]]
+            }
+        })
+        jobs.append({
+            "kind": "csv",
+            "filename": f"{prefix}_expenses.csv",
+            "payload": {
+                "columns": expense_columns,
+                "rows": [[e.get(col, "") for col in expense_columns] for e in report["expenses"]]
+            }
+        })
+    
+    # All events summary
+    all_events_report = generate_all_events_report()
+    if all_events_report:
+        summary_columns = ["name", "date", "location", "event_type", "participants", "income", "expenses", "profit", "status"]
+        jobs.append({"kind": "all_events_pdf", "filename": "events/all_events_summary.pdf", "payload": all_events_report})
+        jobs.append({
+            "kind": "csv",
+            "filename": "events/all_events_summary.csv",
+            "payload": {
+                "columns": summary_columns,
+                "rows": [[e.get(col, "") for col in summary_columns] for e in all_events_report["events"]]
+            }
+        })
+    
+    # Fundraising results
+    if state.fundraising:
+        jobs.append({"kind": "fundraising_pdf", "filename": "fundraising/fundraising_results.pdf", "payload": generate_fundraising_report()})
+    
+    # Budget report
+    budget_columns = ["section", "category", "budget", "actual", "variance"]
+    jobs.append({"kind": "budget_pdf", "filename": "budget/budget_report.pdf", "payload": state.budget})
+    jobs.append({
+        "kind": "csv",
+        "filename": "budget/budget_report.csv",
+        "payload": {
+            "columns": budget_columns,
+            "rows": [[section, line["category"], fils_to_kd(line["budget"]), fils_to_kd(line["actual"]), fils_to_kd(line["variance"])]
+                     for section in ["income", "expenses"]
+                     for line in get_budget_lines(section)]
+        }
+    })
+    
+    return jobs
+
+def build_recurring_report_jobs(today=None):
+    """The recurring reports (last month's report, the all-events summary and the budget
+    report) as report pack jobs by name, each with its report data and the parameters
+    it was generated for"""
+    today = today or datetime.date.today()
+    last_month = today.replace(day=1) - datetime.timedelta(days=1)
+    month_name = calendar.month_name[last_month.month]
+    report = generate_monthly_report(last_month.month, last_month.year)
+    jobs = {
+        "monthly": {
+            "kind": "monthly_pdf",
+            "filename": f"monthly_report_{month_name}_{last_month.year}.pdf",
+            "payload": {"report": report, "month_name": month_name, "year": last_month.year},
+            "params": {"month": last_month.month, "year": last_month.year},
+            "data": report
+        }
+    }
+    
+    all_events_report = generate_all_events_report()
+    if all_events_report:
+        jobs["all_events"] = {
+            "kind": "all_events_pdf",
+            "filename": "all_events_summary.pdf",
+            "payload": all_events_report,
+            "params": {},
+            "data": all_events_report
+        }
+    
+    # The PDF may be rendered later on another thread, so it gets a copy of the budget
+    budget = {section: {category: dict(values) for category, values in lines.items()} for section, lines in state.budget.items()}
+    jobs["budget"] = {
+        "kind": "budget_pdf",
+        "filename": "budget_report.pdf",
+        "payload": budget,
+        "params": {},
+        "data": generate_budget_report()
+    }
+    
+    return jobs
+
+# Dashboard and static site
+def build_dashboard_data():
+    """Materialize the dashboard's figures and tables from the state's stores"""
+    balance = get_balance_fils()
+    reserve = get_emergency_reserve_fils()
+    
+    cash_flow = get_cash_flow()
+    if cash_flow is not None:
+        cash_flow = {period: frame / FILS_PER_KD for period, frame in cash_flow.items()}
+    
+    recent_transactions = None
+    if state.transactions:
+        # Last 5 by timestamp (newest first), sorted on the integer timestamps
+        recent = state.transactions.order_by("timestamp", descending=True, limit=5)
+        recent_transactions = state.transactions.to_frame(recent)
+        # Select only the columns we want to display
+        display_columns = [col for col in ["date", "description", "category", "income", "expense", "authorized_by"] 
+                           if col in recent_transactions.columns]
+        recent_transactions = recent_transactions[display_columns]
+    
+    budget_tables = {}
+    for section in ["income", "expenses"]:
+        budget_tables[section] = pd.DataFrame([{
+            "Category": line["category"],
+            "Budget": format_kd(line["budget"]),
+            "Actual": format_kd(line["actual"]),
+            "Variance": format_kd(line["variance"])
+        } for line in get_budget_lines(section)])
+    
+    # Every active and planned event, in date order, with its day number so the
+    # 30-day window can be applied when the table is shown
+    upcoming_events = []
+    for event in get_upcoming_events():
+        # Calculate profit (actual income - actual expenses)
+        rollup = get_event_rollup(event.get("id"))
+        profit = rollup["income"] - rollup["expenses"]
+        
+        upcoming_events.append((event.raw("date"), {
+            "Event Name": event.get("name", ""),
+            "Date": event.get("date", ""),
+            "Location": event.get("location", ""),
+            "Type": event.get("event_type", ""),
+            "Participants": rollup["participant_count"],
+            "Income": format_kd(rollup["income"]),
+            "Expenses": format_kd(rollup["expenses"]),
+            "Profit": format_kd(profit),
+            "Status": event.get("status", "")
+        }))
+    
+    return {
+        "balance": balance,
+        "reserve": reserve,
+        "cash_flow": cash_flow,
+        "recent_transactions": recent_transactions,
+        "budget_tables": budget_tables,
+        "upcoming_events": upcoming_events
+    }
+
+# Static site
+def build_static_site(snapshot):
+    """Render the dashboard, budget summary and event summaries as {file name: text}"""
+    published_at = snapshot["published_at"].strftime("%Y-%m-%d %H:%M")
+    files = {}
+    
+    # Dashboard
+    balance = snapshot["balance"]
+    reserve = snapshot["reserve"]
+    cash_flow = []
+    if snapshot["cash_flow"] is not None:
+        for month, row in snapshot["cash_flow"]["monthly"].iterrows():
+            cash_flow.append({
+                "month": month.strftime("%Y-%m"),
+                "income": round(float(row["income"]), 3),
+                "expenses": round(float(row["expenses"]), 3),
+                "balance": round(float(row["balance"]), 3)
+            })
+    recent = snapshot["recent_transactions"]
+    recent_rows = recent.astype(object).where(recent.notna(), None).to_dict("records") if recent is not None else []
+    upcoming = [row for day, row in snapshot["upcoming_events"]]
+    files["dashboard.json"] = render_json({
+        "published_at": snapshot["published_at"].isoformat(),
+        "balance": fils_to_kd(balance),
+        "emergency_reserve": fils_to_kd(reserve),
+        "available_funds": fils_to_kd(balance - reserve),
+        "monthly_cash_flow": cash_flow,
+        "recent_transactions": recent_rows,
+        "upcoming_events": upcoming
+    })
+    files["index.html"] = render_page("Financial Dashboard", [
+        {"heading": "Funds", "metrics": [
+            ("Current Balance", format_kd(balance)),
+            ("Emergency Reserve (15%)", format_kd(reserve)),
+            ("Available Funds", format_kd(balance - reserve))
+        ]},
+        {"heading": "Monthly Cash Flow", "columns": ["Month", "Income", "Expenses", "Running Balance"],
+         "rows": [[m["month"], f"KD {m['income']:.2f}", f"KD {m['expenses']:.2f}", f"KD {m['balance']:.2f}"] for m in cash_flow]},
+        {"heading": "Recent Transactions", "columns": [column.replace("_", " ").title() for column in recent.columns] if recent is not None else [],
+         "rows": [[f"KD {value:.2f}" if key in ("income", "expense") else "" if value is None else value for key, value in row.items()]
+                  for row in recent_rows]},
+        {"heading": "Upcoming Events", "columns": list(upcoming[0]) if upcoming else [],
+         "rows": [list(row.values()) for row in upcoming]}
+    ], published_at, "dashboard.json")
+    
+    # Budget summary
+    budget = {}
+    sections = []
+    for section, heading in [("income", "Income: Budget vs. Actual"), ("expenses", "Expenses: Budget vs. Actual")]:
+        lines = get_budget_lines(section)
+        budget[section] = [{
+            "category": line["category"],
+            "budget": fils_to_kd(line["budget"]),
+            "actual": fils_to_kd(line["actual"]),
+            "variance": fils_to_kd(line["variance"])
+        } for line in lines]
+        sections.append({"heading": heading, "columns": ["Category", "Budget", "Actual", "Variance"],
+                         "rows": [[line["category"], format_kd(line["budget"]), format_kd(line["actual"]), format_kd(line["variance"])]
+                                  for line in lines]})
+    files["budget.json"] = render_json({"published_at": snapshot["published_at"].isoformat(), **budget})
+    files["budget.html"] = render_page("Budget Summary", sections, published_at, "budget.json")
+    
+    # Event summaries
+    report = generate_all_events_report() or {"events": [], "total_income": 0, "total_expenses": 0, "total_profit": 0, "event_count": 0}
+    files["events.json"] = render_json({"published_at": snapshot["published_at"].isoformat(), **report})
+    files["events.html"] = render_page("Event Summaries", [
+        {"heading": "Totals", "metrics": [
+            ("Events", report["event_count"]),
+            ("Income", f"KD {report['total_income']:.2f}"),
+            ("Expenses", f"KD {report['total_expenses']:.2f}"),
+            ("Profit", f"KD {report['total_profit']:.2f}")
+        ]},
+        {"heading": "Events", "columns": ["Event", "Date", "Location", "Type", "Participants", "Income", "Expenses", "Profit", "Status"],
+         "rows": [[e["name"], e["date"], e["location"], e["event_type"], e["participants"],
+                   f"KD {e['income']:.2f}", f"KD {e['expenses']:.2f}", f"KD {e['profit']:.2f}", e["status"]]
+                  for e in report["events"]]}
+    ], published_at, "events.json")
+    
+    return files
+
+# Backups
+# Stores written to backups and snapshots, with their schemas
+STORE_FIELDS = [("transactions", TRANSACTION_FIELDS), ("events", EVENT_FIELDS),
+                ("event_participants", PARTICIPANT_FIELDS), ("event_expenses", EXPENSE_FIELDS)]
+
+def build_parquet_snapshot():
+    """Pack every store as a Parquet file, with the budget and fundraising as JSON, into one ZIP"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for key, _ in STORE_FIELDS:
+            part = io.BytesIO()
+            state[key].write_parquet(part)
+            archive.writestr(f"{key}.parquet", part.getvalue())
+        archive.writestr("snapshot.json", json.dumps({
+            "budget": state.budget,
+            "fundraising": state.fundraising
+        }, indent=4))
+    return buffer.getvalue()
+
+def read_parquet_snapshot(file, code_tables):
+    """Read a snapshot ZIP back into its JSON data and the stores it holds, built against code_tables"""
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        data = json.loads(archive.read("snapshot.json")) if "snapshot.json" in names else {}
+        stores = {}
+        for key, fields in STORE_FIELDS:
+            if f"{key}.parquet" in names:
+                stores[key] = RecordStore.read_parquet(fields, io.BytesIO(archive.read(f"{key}.parquet")), code_tables)
+    return data, stores
+
+def build_backup():
+    """Every store, the budget and fundraising as the JSON-ready backup dict"""
+    return {
+        "budget": state.budget,
+        "transactions": state.transactions.to_records(),
+        "events": state.events.to_records(),
+        "event_participants": state.event_participants.to_records(),
+        "event_expenses": state.event_expenses.to_records(),
+        "fundraising": state.fundraising
+    }
+
+def read_backup(file, name):
+    """Read a JSON backup or Parquet snapshot ZIP (told apart by file name) as (data, stores, code_tables)"""
+    # Every store is rebuilt against fresh code tables (sections missing from the file keep their records)
+    code_tables = {}
+    if name.endswith(".zip"):
+        data, stores = read_parquet_snapshot(file, code_tables)
+    else:
+        data, stores = json.load(file), {}
+    return data, stores, code_tables
+
+def restore_backup(data, stores, code_tables):
+    """Replace the state with a backup read by read_backup, and rebuild every aggregate
+    (with the ledger file kept, the backup's transactions replace the whole ledger)"""
+    state.budget = data.get("budget", state.budget)
+    
+    for key, fields in STORE_FIELDS:
+        if key in stores:
+            state[key] = stores[key]
+        else:
+            records = data[key] if key in data else state[key].to_records()
+            state[key] = RecordStore.from_records(fields, records, code_tables)
+    state.code_tables = code_tables
+    state.fundraising = data.get("fundraising", state.fundraising)
+    if ledger_file_kept():
+        write_ledger(state.transactions)
+    rebuild_aggregates()
+
+def load_disk_state():
+    """Open the ledger file if one is kept, then read the archived years and build every aggregate"""
+    if ledger_file_kept():
+        state.transactions = read_ledger(TRANSACTION_FIELDS, state.code_tables)
+    load_archive()
+
+def rebuild_aggregates():
+    """Rebuild every index and aggregate from the stores and the archived year summaries"""
+    state.ledger_version += 1
+    state.data_version += 1
+    state.cash_flow_cache = None
+    rebuild_event_index()
+    rebuild_event_rollups()
+    rebuild_payment_index()
+    rebuild_participant_search_index()
+    rebuild_participant_balances()
+    rebuild_monthly_totals()
+    rebuild_budget_actuals()
+    rebuild_initiative_index()
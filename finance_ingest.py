@@ -0,0 +1,295 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from finance_core import build_backup, build_parquet_snapshot, ingest_records
+
+# Ingestion service
+# An asyncio process that takes transaction, participant payment and event
+# expense records from several local sources and records them in micro-batches:
+#
+#  - a drop folder: *.json files (a list of records, or one record per line) are
+#    picked up, then moved to processed/ with a .rejected.json beside them listing
+#    any record that was turned down
+#  - a local TCP socket: one JSON record per line, answered in order with one
+#    {"ok": ..., "reason": ...} line per record; {"type": "stats"} answers with the
+#    service's counters
+#  - the command line: `finance_cli.py submit` sends a file's records to the socket
+#
+# Every source feeds one bounded queue. A single committer takes whatever has
+# arrived (up to batch_size records, waiting at most batch_delay seconds for more
+# after the first) and records it with ingest_records, so each batch validates its
+# records and updates the indexes and aggregates once. When the queue is full,
+# sources wait: a socket stops being read, so the sender is slowed by TCP itself,
+# and the drop folder stops picking up files.
+#
+# Transactions go to the ledger file as they are committed. With --data, the whole
+# state is also written back to that backup file after commits (at most every
+# checkpoint_interval seconds) and on shutdown.
+
+DEFAULT_PORT = 8503
+DROP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inbox")
+
+class IngestStats:
+    """Counters and throughput of an ingestion service"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.received = 0
+        self.committed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.commit_seconds = 0.0
+        self.last_batch = None
+
+    def record_batch(self, size, accepted, seconds):
+        self.batches += 1
+        self.committed += accepted
+        self.rejected += size - accepted
+        self.largest_batch = max(self.largest_batch, size)
+        self.commit_seconds += seconds
+        self.last_batch = {"records": size, "accepted": accepted, "seconds": round(seconds, 6)}
+
+    def to_dict(self, queue_depth=0):
+        elapsed = time.perf_counter() - self.started
+        processed = self.committed + self.rejected
+        return {
+            "received": self.received,
+            "committed": self.committed,
+            "rejected": self.rejected,
+            "queued": queue_depth,
+            "batches": self.batches,
+            "average_batch": round(processed / self.batches, 1) if self.batches else 0,
+            "largest_batch": self.largest_batch,
+            "uptime_seconds": round(elapsed, 1),
+            # Records handled per second of uptime, and per second spent committing
+            "records_per_second": round(processed / elapsed, 1) if elapsed else 0,
+            "commit_records_per_second": round(processed / self.commit_seconds, 1) if self.commit_seconds else 0,
+            "last_batch": self.last_batch
+        }
+
+class IngestService:
+    """The shared queue and the committer that records it in micro-batches"""
+
+    def __init__(self, batch_size=500, batch_delay=0.05, queue_size=5000, data_file=None, checkpoint_interval=5.0):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue = asyncio.Queue(queue_size)
+        self.stats = IngestStats()
+        self.data_file = data_file
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpointed = time.perf_counter()
+        self.dirty = False
+
+    async def submit(self, record):
+        """Queue a record, waiting while the queue is full; returns a future of (ok, reason)"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        self.stats.received += 1
+        return future
+
+    async def _next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.batch_delay
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run_committer(self):
+        while True:
+            batch = await self._next_batch()
+            records = [record for record, _ in batch]
+            started = time.perf_counter()
+            try:
+                # Only the committer touches the bookkeeping state, so it can work off the
+                # event loop while the sources keep queueing the next batch
+                accepted, rejected = await asyncio.to_thread(ingest_records, records)
+            except Exception as e:
+                # ingest_records is all or nothing, so none of the batch was recorded: every
+                # record is answered as failed (safe to resend) and the service keeps committing
+                print(f"Batch of {len(batch)} records failed: {e!r}", file=sys.stderr, flush=True)
+                accepted, rejected = 0, [{"position": position, "reason": f"Batch failed: {e}"} for position in range(len(batch))]
+            self.stats.record_batch(len(batch), accepted, time.perf_counter() - started)
+
+            reasons = {entry["position"]: entry["reason"] for entry in rejected}
+            for position, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((position not in reasons, reasons.get(position, "")))
+                self.queue.task_done()
+
+            self.dirty = self.dirty or accepted > 0
+            if self.data_file and self.dirty and time.perf_counter() - self.checkpointed >= self.checkpoint_interval:
+                await asyncio.to_thread(self.checkpoint)
+
+    def checkpoint(self):
+        """Write the whole state back to the backup file it was read from"""
+        if not self.data_file or not self.dirty:
+            return
+        if self.data_file.endswith(".zip"):
+            data = build_parquet_snapshot()
+        else:
+            data = json.dumps(build_backup(), indent=4).encode()
+        temporary = f"{self.data_file}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.data_file)
+        self.checkpointed = time.perf_counter()
+        self.dirty = False
+
+    async def handle_connection(self, reader, writer):
+        """Read JSON lines from a socket client, answering each in order"""
+        answers = asyncio.Queue()
+
+        async def write_answers():
+            while True:
+                answer = await answers.get()
+                if answer is None:
+                    break
+                if isinstance(answer, asyncio.Future):
+                    ok, reason = await answer
+                    answer = {"ok": ok, "reason": reason}
+                writer.write(json.dumps(answer).encode() + b"\n")
+                await writer.drain()
+
+        writing = asyncio.create_task(write_answers())
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    await answers.put({"ok": False, "reason": f"Invalid JSON: {e}"})
+                    continue
+                if isinstance(record, dict) and record.get("type") == "stats":
+                    await answers.put(self.stats.to_dict(self.queue.qsize()))
+                    continue
+                await answers.put(await self.submit(record))
+        finally:
+            await answers.put(None)
+            await writing
+            writer.close()
+
+    async def watch_drop_folder(self, folder, poll_interval=1.0):
+        """Pick up *.json files from a folder, one at a time"""
+        processed = os.path.join(folder, "processed")
+        os.makedirs(processed, exist_ok=True)
+        while True:
+            names = sorted(name for name in os.listdir(folder) if name.endswith(".json"))
+            for name in names:
+                await self.ingest_file(os.path.join(folder, name), processed)
+            await asyncio.sleep(poll_interval)
+
+    async def ingest_file(self, path, processed):
+        try:
+            records = await asyncio.to_thread(read_records, path)
+        except (OSError, ValueError) as e:
+            records, error = [], f"Unreadable file: {e}"
+        else:
+            error = None
+        futures = [await self.submit(record) for record in records]
+        results = await asyncio.gather(*futures)
+
+        name = os.path.basename(path)
+        rejected = [{"position": position, "reason": reason} for position, (ok, reason) in enumerate(results) if not ok]
+        print(f"{name}: {len(records) - len(rejected)} recorded, {len(rejected)} rejected" + (f" ({error})" if error else ""), flush=True)
+        if error:
+            rejected.append({"position": None, "reason": error})
+        if rejected:
+            with open(os.path.join(processed, f"{name[:-len('.json')]}.rejected.json"), "w") as f:
+                json.dump(rejected, f, indent=4)
+        os.replace(path, os.path.join(processed, name))
+
+    async def report(self, interval):
+        """Print the counters every `interval` seconds while records are arriving"""
+        last = None
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats.to_dict(self.queue.qsize())
+            if stats["received"] != last:
+                last = stats["received"]
+                print(f"{stats['committed']} recorded, {stats['rejected']} rejected in {stats['batches']} batches "
+                      f"(average {stats['average_batch']}), {stats['commit_records_per_second']} records/s committing, "
+                      f"{stats['queued']} queued", flush=True)
+
+def read_records(path):
+    """Records from a JSON file holding a list of records, or one record per line"""
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data if isinstance(data, list) else [data]
+
+async def run_service(host="127.0.0.1", port=DEFAULT_PORT, drop_dir=DROP_DIR, data_file=None,
+                      batch_size=500, batch_delay=0.05, queue_size=5000, report_interval=10.0):
+    service = IngestService(batch_size, batch_delay, queue_size, data_file)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    tasks = [asyncio.create_task(service.run_committer()), asyncio.create_task(service.report(report_interval))]
+    if drop_dir:
+        os.makedirs(drop_dir, exist_ok=True)
+        tasks.append(asyncio.create_task(service.watch_drop_folder(drop_dir)))
+    print(f"Ingesting from {host}:{server.sockets[0].getsockname()[1]}" + (f" and {drop_dir}" if drop_dir else ""), flush=True)
+
+    # SIGINT and SIGTERM stop taking records; whatever is queued is still recorded
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stopping.wait()
+    finally:
+        server.close()
+        for task in tasks[2:]:
+            task.cancel()
+        await service.queue.join()
+        for task in tasks[:2]:
+            task.cancel()
+        await asyncio.to_thread(service.checkpoint)
+        print(json.dumps(service.stats.to_dict(service.queue.qsize())), flush=True)
+
+def serve(**options):
+    try:
+        asyncio.run(run_service(**options))
+    except KeyboardInterrupt:
+        pass
+
+async def _send_records(records, host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send():
+        for record in records:
+            writer.write(json.dumps(record).encode() + b"\n")
+            await writer.drain()
+        writer.write_eof()
+
+    sending = asyncio.create_task(send())
+    results = []
+    while line := await reader.readline():
+        results.append(json.loads(line))
+    await sending
+    writer.close()
+    return results
+
+def submit(records, host="127.0.0.1", port=DEFAULT_PORT):
+    """Send records to a running service, returning its answer for each"""
+    return asyncio.run(_send_records(records, host, port))
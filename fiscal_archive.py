@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+from record_store import CODED, RecordStore
+
+# Fiscal-year archive
+# Closed fiscal years are moved out of the in-memory stores into one directory per
+# year, holding a Parquet file per store and a summary.json of precomputed
+# year-level totals. Summaries are small and read when a session starts; the
+# Parquet files are only read when a historical report asks for that year.
+#
+# Archived years are not changed afterwards, except to follow a renamed budget
+# category (rename_category), which replaces each affected file atomically.
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+SUMMARY_FILE = "summary.json"
+
+def year_path(year, root=ARCHIVE_DIR):
+    """Directory holding an archived year's files"""
+    return os.path.join(root, str(year))
+
+def is_archived(year, root=ARCHIVE_DIR):
+    return os.path.isfile(os.path.join(year_path(year, root), SUMMARY_FILE))
+
+def write_year(year, parts, summary, root=ARCHIVE_DIR):
+    """Write a closed year's records and summary.
+
+    `parts` maps store names to (store, rows). The files are written to a staging
+    directory that is renamed into place, so a year is either fully archived or
+    not at all, and an existing archive is never overwritten.
+    """
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{year}-", dir=root)
+    try:
+        for name, (store, rows) in parts.items():
+            store.write_parquet(os.path.join(staging, f"{name}.parquet"), rows)
+        with open(os.path.join(staging, SUMMARY_FILE), "w") as f:
+            json.dump(summary, f, indent=4)
+        os.rename(staging, year_path(year, root))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+def read_summaries(root=ARCHIVE_DIR):
+    """Summaries of every archived year, as {year: summary}"""
+    summaries = {}
+    if not os.path.isdir(root):
+        return summaries
+    for entry in sorted(os.listdir(root)):
+        if entry.isdigit() and is_archived(entry, root):
+            with open(os.path.join(year_path(entry, root), SUMMARY_FILE)) as f:
+                summaries[int(entry)] = json.load(f)
+    return summaries
+
+def read_year(year, store_fields, code_tables=None, root=ARCHIVE_DIR):
+    """Load an archived year's records as {name: RecordStore}, for (name, fields) in store_fields"""
+    stores = {}
+    for name, fields in store_fields:
+        path = os.path.join(year_path(year, root), f"{name}.parquet")
+        if os.path.isfile(path):
+            stores[name] = RecordStore.read_parquet(fields, path, code_tables)
+        else:
+            stores[name] = RecordStore(fields, code_tables=code_tables)
+    return stores
+
+def rename_summary_category(summary, old_name, new_name):
+    """Relabel a category in a year summary's category, monthly and event totals"""
+    def rekey(totals):
+        if old_name in totals:
+            totals[new_name] = totals.pop(old_name)
+    
+    rekey(summary["categories"])
+    rekey(summary["monthly_totals"]["categories"])
+    for rollup in summary["event_rollups"].values():
+        rekey(rollup["expense_breakdown"])
+
+def _replace(path, write):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def rename_category(old_name, new_name, store_fields, root=ARCHIVE_DIR):
+    """Relabel a category in every archived year: its summary and the category
+    column of each archived store, every file replaced atomically"""
+    for year, summary in read_summaries(root).items():
+        path = year_path(year, root)
+        for name, fields in store_fields:
+            store_path = os.path.join(path, f"{name}.parquet")
+            if ("category", CODED) not in fields or not os.path.isfile(store_path):
+                continue
+            store = RecordStore.read_parquet(fields, store_path, {})
+            table = store.code_tables["category"]
+            if old_name in table.codes:
+                table.rename(old_name, new_name)
+                _replace(store_path, store.write_parquet)
+        
+        rename_summary_category(summary, old_name, new_name)
+        
+        def write_summary(temporary):
+            with open(temporary, "w") as f:
+                json.dump(summary, f, indent=4)
+        _replace(os.path.join(path, SUMMARY_FILE), write_summary)
@@ -0,0 +1,261 @@
+import contextlib
+import json
+import mmap
+import os
+import threading
+import numpy as np
+try:
+    import fcntl
+except ImportError:
+    # On Windows: there the lock only covers the sessions of one app process
+    fcntl = None
+from record_store import CODED, FLOAT, OBJECT, CodeTable, RecordStore
+
+# Memory-mapped transaction ledger
+# The ledger can be kept on disk as a fixed-width binary file with one packed
+# little-endian record per transaction (money in fils, codes, microseconds and day
+# numbers exactly as they are held in memory, plus an offset and length into the
+# text file for each text field), a side file with the text as UTF-8, and
+# ledger.json with the coded fields' values and the row count. Opening the ledger
+# maps both files and copies each numeric and coded column out of the mapping in
+# one go; only the text fields are decoded row by row (a slice of the mapped text
+# file each). The mapped pages come from the OS page cache, which every app
+# process shares.
+#
+# ledger.json is the commit point: appends write past the recorded row count and
+# then replace ledger.json, and full rewrites go to a new generation of files that
+# ledger.json is switched to, so a crash never leaves a half-written ledger.
+#
+# Every session and app process appends to the same files, so each one works under
+# a lock on ledger.lock (flock, across processes), and codes are always written as
+# positions in the file's own list of values: an append encodes its rows against
+# that list, adding values it does not hold yet, and a rename relabels the file's
+# value. A full rewrite replaces every row with one session's, so callers re-read
+# the ledger under the lock first (see ledger_lock).
+
+LEDGER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ledger")
+META_FILE = "ledger.json"
+
+# Text length stored for a missing (None) text field
+NO_TEXT = -1
+
+LOCK_FILE = "ledger.lock"
+
+# Sessions of one app process share the files; the lock is reentrant per thread,
+# so a caller holding ledger_lock can still call the functions below
+_lock = threading.RLock()
+_held = threading.local()
+
+@contextlib.contextmanager
+def ledger_lock(root=LEDGER_DIR):
+    """Hold the ledger lock, against other threads and other processes"""
+    with _lock:
+        depth = getattr(_held, "depth", 0)
+        if depth or fcntl is None:
+            _held.depth = depth + 1
+            try:
+                yield
+            finally:
+                _held.depth = depth
+            return
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _held.depth = 1
+            try:
+                yield
+            finally:
+                _held.depth = 0
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def record_dtype(fields):
+    """The packed binary record layout for a schema"""
+    layout = []
+    for name, kind in fields:
+        if kind is OBJECT:
+            layout.append((name, [("offset", "<i8"), ("length", "<i4")]))
+        elif kind == CODED:
+            layout.append((name, "<i4"))
+        elif kind == FLOAT:
+            layout.append((name, "<f8"))
+        else:
+            layout.append((name, "<i8"))
+    return np.dtype(layout)
+
+def ledger_exists(root=LEDGER_DIR):
+    return os.path.isfile(os.path.join(root, META_FILE))
+
+def _paths(root, generation):
+    return os.path.join(root, f"ledger-{generation}.bin"), os.path.join(root, f"ledger-{generation}.txt")
+
+def _read_meta(root):
+    with open(os.path.join(root, META_FILE)) as f:
+        return json.load(f)
+
+def _write_meta(root, meta):
+    path = os.path.join(root, META_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def _code_values(store):
+    return {name: list(store.code_tables[name].values) for name, kind in store.fields if kind == CODED}
+
+def _file_codes(records, store, code_values):
+    """Re-encode the coded columns of packed records from the store's code tables
+    into positions in the file's code values, adding the values the file lacks"""
+    for name, kind in store.fields:
+        if kind != CODED or not len(records):
+            continue
+        values = code_values[name]
+        positions = {value: position for position, value in enumerate(values)}
+        session_values = store.code_tables[name].values
+        used = np.unique(records[name])
+        mapping = np.zeros(len(session_values), dtype=np.int32)
+        for code in used.tolist():
+            value = session_values[code]
+            if value not in positions:
+                positions[value] = len(values)
+                values.append(value)
+            mapping[code] = positions[value]
+        records[name] = mapping[records[name]]
+
+def _encode(store, rows, first_row, text_offset):
+    """Packed records, text bytes and non-text object values for all rows of a store, or the given views"""
+    records = np.zeros(len(store) if rows is None else len(rows), dtype=record_dtype(store.fields))
+    text = bytearray()
+    objects = []
+    for name, kind in store.fields:
+        if kind is not OBJECT:
+            records[name] = store.column_array(name, rows)
+            continue
+        offsets = records[name]["offset"]
+        lengths = records[name]["length"]
+        values = store.columns[name] if rows is None else [row[name] for row in rows]
+        for i, value in enumerate(values):
+            if isinstance(value, str):
+                data = value.encode()
+                offsets[i] = text_offset + len(text)
+                lengths[i] = len(data)
+                text += data
+            else:
+                lengths[i] = NO_TEXT
+                if value is not None:
+                    # The odd non-text value (e.g. from an old backup) is kept in ledger.json
+                    objects.append([first_row + i, name, value])
+    return records, text, objects
+
+def _write_at(path, position, data):
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(position)
+        f.write(data)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+def write_ledger(store, root=LEDGER_DIR):
+    """Write a whole store as the ledger, replacing any existing one (with every
+    row appended to it: re-read it first under ledger_lock to keep those)"""
+    with ledger_lock(root):
+        os.makedirs(root, exist_ok=True)
+        previous = _read_meta(root)["generation"] if ledger_exists(root) else None
+        generation = 0 if previous is None else previous + 1
+        records_path, text_path = _paths(root, generation)
+
+        records, text, objects = _encode(store, None, 0, 0)
+        originals, extras = store.annotations()
+        _write_at(records_path, 0, records.tobytes())
+        _write_at(text_path, 0, bytes(text))
+        _write_meta(root, {
+            "generation": generation,
+            "fields": [list(field) for field in store.fields],
+            "rows": len(store),
+            "text_bytes": len(text),
+            "code_values": _code_values(store),
+            "objects": objects,
+            "originals": originals,
+            "extras": extras
+        })
+
+        if previous is not None:
+            for path in _paths(root, previous):
+                if os.path.exists(path):
+                    os.remove(path)
+
+def append_ledger(store, rows, root=LEDGER_DIR):
+    """Append the given views of a store (its newest rows) to the ledger"""
+    with ledger_lock(root):
+        meta = _read_meta(root)
+        records_path, text_path = _paths(root, meta["generation"])
+        first_row = meta["rows"]
+
+        records, text, objects = _encode(store, rows, first_row, meta["text_bytes"])
+        _file_codes(records, store, meta["code_values"])
+        originals, extras = store.annotations(rows)
+        _write_at(text_path, meta["text_bytes"], bytes(text))
+        _write_at(records_path, first_row * records.dtype.itemsize, records.tobytes())
+
+        meta["rows"] += len(records)
+        meta["text_bytes"] += len(text)
+        meta["objects"].extend(objects)
+        meta["originals"].extend([first_row + row, key, value] for row, key, value in originals)
+        meta["extras"].update({str(first_row + int(row)): extra for row, extra in extras.items()})
+        _write_meta(root, meta)
+
+def rename_ledger_value(name, old_value, new_value, root=LEDGER_DIR):
+    """Relabel a coded value (e.g. a renamed category) in the ledger"""
+    with ledger_lock(root):
+        meta = _read_meta(root)
+        meta["code_values"][name] = [new_value if value == old_value else value for value in meta["code_values"][name]]
+        _write_meta(root, meta)
+
+def read_ledger(fields, code_tables=None, root=LEDGER_DIR):
+    """Open the ledger as a RecordStore, with its coded fields encoded into `code_tables`"""
+    with ledger_lock(root):
+        meta = _read_meta(root)
+        if [list(field) for field in fields] != meta["fields"]:
+            raise ValueError("The ledger file was written with a different record layout")
+        records_path, text_path = _paths(root, meta["generation"])
+        length = meta["rows"]
+        dtype = record_dtype(fields)
+        records = np.memmap(records_path, dtype=dtype, mode="r", shape=(length,)) if length else np.zeros(0, dtype=dtype)
+
+        code_tables = {} if code_tables is None else code_tables
+        columns = {}
+        with open(text_path, "rb") as f:
+            text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if meta["text_bytes"] else b""
+            for name, kind in fields:
+                if kind is OBJECT:
+                    offsets = records[name]["offset"].tolist()
+                    lengths = records[name]["length"].tolist()
+                    columns[name] = [None if n == NO_TEXT else text[o:o + n].decode() for o, n in zip(offsets, lengths)]
+                elif kind == CODED:
+                    # File codes are positions in the saved values; re-encode them into the session's tables
+                    table = code_tables.setdefault(name, CodeTable())
+                    mapping = np.array([table.encode(value) for value in meta["code_values"][name]] or [0], dtype=np.int32)
+                    columns[name] = mapping[records[name]]
+                else:
+                    columns[name] = records[name]
+            store = RecordStore.from_columns(fields, columns, length, code_tables, meta["originals"], meta["extras"])
+            if meta["text_bytes"]:
+                text.close()
+
+        for row, name, value in meta["objects"]:
+            store.set_value(row, name, value)
+        return store
+
+def ledger_size(root=LEDGER_DIR):
+    """(rows, bytes on disk) of the ledger"""
+    meta = _read_meta(root)
+    return meta["rows"], sum(os.path.getsize(path) for path in _paths(root, meta["generation"]) if os.path.exists(path))
+
+def remove_ledger(root=LEDGER_DIR):
+    """Stop keeping the ledger on disk, deleting its files. Sessions still keeping it
+    find ledger.json gone (under the lock) and stop writing to it."""
+    with ledger_lock(root):
+        # The lock file stays, so nobody locks a new one while this lock is held
+        for name in os.listdir(root):
+            if name != LOCK_FILE:
+                os.remove(os.path.join(root, name))
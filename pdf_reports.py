@@ -0,0 +1,653 @@
+import datetime
+import io
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from tracing import traced
+
+# PDF Generation Functions
+# These builders only take plain report dicts, so they can also run in worker
+# processes (see report_pack.py) without a Streamlit session.
+def create_pdf_content(title, content_elements):
+    """Create PDF content with the given title and elements"""
+    buffer = io.BytesIO()
+    
+    # Create the PDF object, using BytesIO as its "file"
+    doc = SimpleDocTemplate(
+        buffer, 
+        pagesize=letter,
+        leftMargin=inch,
+        rightMargin=inch,
+        topMargin=inch,
+        bottomMargin=inch
+    )
+    
+    # Container for the elements
+    elements = []
+    
+    # Define styles
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    # Add title
+    elements.append(Paragraph(title, title_style))
+    elements.append(Spacer(1, 0.25*inch))
+    
+    # Add date
+    elements.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
+    elements.append(Spacer(1, 0.25*inch))
+    
+    # Add content elements
+    elements.extend(content_elements)
+    
+    # Footer
+    elements.append(Spacer(1, 0.5*inch))
+    elements.append(Paragraph("Year 11 Committee Financial Management System", normal_style))
+    
+    # Build the PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+@traced(input_rows=lambda report: len(report["transactions"]))
+def create_monthly_report_pdf(report, month_name, year):
+    """Generate a PDF for the monthly report"""
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    elements = []
+    
+    # Add summary section
+    elements.append(Paragraph("Financial Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    # Summary data table
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Income", f"KD {report['total_income']:.2f}"],
+        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
+        ["Net", f"KD {report['net']:.2f}"],
+        ["Current Balance", f"KD {report['current_balance']:.2f}"],
+        ["Emergency Reserve", f"KD {report['emergency_reserve']:.2f}"],
+        ["Available Funds", f"KD {report['available_funds']:.2f}"]
+    ]
+    
+    # Create the summary table
+    summary_table = Table(summary_data, colWidths=[3*inch, 1.5*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Transactions table if there are any
+    if report['transactions']:
+        elements.append(Paragraph("Transactions", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        # Create a dataframe for easier manipulation
+        transactions_df = pd.DataFrame(report['transactions'])
+        
+        # Prepare table data
+        table_data = [["Date", "Description", "Category", "Income", "Expense", "Authorized By"]]
+        
+        for _, row in transactions_df.iterrows():
+            table_data.append([
+                row.get("date", ""),
+                row.get("description", ""),
+                row.get("category", ""),
+                f"KD {row.get('income', 0):.2f}" if row.get('income', 0) > 0 else "",
+                f"KD {row.get('expense', 0):.2f}" if row.get('expense', 0) > 0 else "",
+                row.get("authorized_by", "")
+            ])
+        
+        # Create the transactions table
+        trans_table = Table(table_data, colWidths=[1*inch, 1.5*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch])
+        trans_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(trans_table)
+    else:
+        elements.append(Paragraph("No transactions for this period.", normal_style))
+
+    # Daily cash flow and running balance, by transaction date
+    if report.get("cash_flow"):
+        elements.append(Spacer(1, 0.2*inch))
+        elements.append(Paragraph("Cash Flow", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+
+        cash_flow_data = [["Date", "Income", "Expenses", "Net", "Balance"]]
+
+        for row in report["cash_flow"]:
+            cash_flow_data.append([
+                row["date"],
+                f"KD {row['income']:.2f}",
+                f"KD {row['expenses']:.2f}",
+                f"KD {row['net']:.2f}",
+                f"KD {row['balance']:.2f}"
+            ])
+
+        cash_flow_table = Table(cash_flow_data, colWidths=[1.2*inch, 1.1*inch, 1.1*inch, 1.1*inch, 1.1*inch])
+        cash_flow_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+
+        elements.append(cash_flow_table)
+
+    # Generate the PDF
+    title = f"Monthly Financial Report - {month_name} {year}"
+    return create_pdf_content(title, elements)
+
+@traced(input_rows=lambda report: len(report["participants"]) + len(report["expenses"]))
+def create_event_report_pdf(report):
+    """Generate a PDF for an individual event report"""
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    elements = []
+    
+    event = report["event"]
+    event_title = f"Event Report: {event['name']}"
+    
+    # Event details section
+    elements.append(Paragraph("Event Details", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    details_data = [
+        ["Detail", "Value"],
+        ["Date", event['date']],
+        ["Location", event['location']],
+        ["Type", event.get('event_type', '')],
+        ["Status", event['status']],
+        ["Coordinator", event['coordinator']],
+        ["Price per Person", f"KD {event.get('price_per_person', 0):.2f}"],
+        ["Target Participants", str(event.get('target_participants', 0))]
+    ]
+    
+    details_table = Table(details_data, colWidths=[2*inch, 3*inch])
+    details_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(details_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Financial summary
+    elements.append(Paragraph("Financial Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Income", f"KD {report['total_payments']:.2f}"],
+        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
+        ["Profit", f"KD {report['profit']:.2f}"],
+        ["Participants", f"{report['participant_count']}"],
+        ["Target", f"{event['target_participants']}"]
+    ]
+    
+    # Calculate participation rate
+    if event['target_participants'] > 0:
+        participation_rate = report['participant_count'] / event['target_participants'] * 100
+        summary_data.append(["Participation Rate", f"{participation_rate:.1f}%"])
+    
+    summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Expense breakdown by category
+    if report["expense_breakdown"]:
+        elements.append(Paragraph("Expense Breakdown", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        expense_data = [["Category", "Amount", "Percentage"]]
+        
+        for category, amount in report["expense_breakdown"].items():
+            percentage = amount / report['total_expenses'] * 100 if report['total_expenses'] > 0 else 0
+            expense_data.append([
+                category,
+                f"KD {amount:.2f}",
+                f"{percentage:.1f}%"
+            ])
+        
+        expense_table = Table(expense_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
+        expense_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(expense_table)
+        elements.append(Spacer(1, 0.2*inch))
+    
+    # Participant list
+    if report["participants"]:
+        elements.append(Paragraph("Participant List", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        participant_data = [["Name", "Amount", "Date", "Method", "Notes"]]
+        
+        for participant in report["participants"]:
+            participant_data.append([
+                participant.get("participant_name", ""),
+                f"KD {participant.get('payment_amount', 0):.2f}",
+                participant.get("payment_date", ""),
+                participant.get("payment_method", ""),
+                participant.get("notes", "")
+            ])
+        
+        participant_table = Table(participant_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1*inch, 1.5*inch])
+        participant_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(participant_table)
+        elements.append(Spacer(1, 0.2*inch))
+    
+    # Expense list
+    if report["expenses"]:
+        elements.append(Paragraph("Expense List", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        expense_list_data = [["Description", "Amount", "Date", "Category", "Paid To", "Receipt #"]]
+        
+        for expense in report["expenses"]:
+            expense_list_data.append([
+                expense.get("description", ""),
+                f"KD {expense.get('amount', 0):.2f}",
+                expense.get("date", ""),
+                expense.get("category", ""),
+                expense.get("paid_to", ""),
+                expense.get("receipt_num", "")
+            ])
+        
+        expense_list_table = Table(expense_list_data, colWidths=[1.5*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch, 0.8*inch])
+        expense_list_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(expense_list_table)
+    
+    # Generate the PDF
+    return create_pdf_content(event_title, elements)
+
+@traced(input_rows=lambda report: len(report["events"]))
+def create_all_events_report_pdf(report):
+    """Generate a PDF for the all events summary report"""
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    elements = []
+    
+    # Overall summary
+    elements.append(Paragraph("Financial Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Income", f"KD {report['total_income']:.2f}"],
+        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
+        ["Total Profit", f"KD {report['total_profit']:.2f}"],
+        ["Total Events", f"{report['event_count']}"]
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Events table
+    if report["events"]:
+        elements.append(Paragraph("Event Summary", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        events_data = [["Event Name", "Date", "Type", "Participants", "Income", "Expenses", "Profit", "Status"]]
+        
+        for event in report["events"]:
+            events_data.append([
+                event.get("name", ""),
+                event.get("date", ""),
+                event.get("event_type", ""),
+                str(event.get("participants", 0)),
+                f"KD {event.get('income', 0):.2f}",
+                f"KD {event.get('expenses', 0):.2f}",
+                f"KD {event.get('profit', 0):.2f}",
+                event.get("status", "")
+            ])
+        
+        # Create the events table with adjusted column widths
+        events_table = Table(events_data, colWidths=[1.2*inch, 0.8*inch, 0.8*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.8*inch])
+        events_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(events_table)
+    else:
+        elements.append(Paragraph("No events found.", normal_style))
+    
+    # Generate the PDF
+    title = "All Events Financial Summary"
+    return create_pdf_content(title, elements)
+
+@traced(input_rows=lambda budget: len(budget["income"]) + len(budget["expenses"]))
+def create_budget_report_pdf(budget):
+    """Generate a PDF for the budget report"""
+    styles = getSampleStyleSheet()
+    subtitle_style = styles['Heading2']
+    
+    # Calculate totals
+    total_income_budget = sum(values["budget"] for values in budget["income"].values())
+    total_income_actual = sum(values["actual"] for values in budget["income"].values())
+    total_expense_budget = sum(values["budget"] for values in budget["expenses"].values())
+    total_expense_actual = sum(values["actual"] for values in budget["expenses"].values())
+    
+    elements = []
+    
+    # Budget Summary
+    elements.append(Paragraph("Budget Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Income Budget", f"KD {total_income_budget:.2f}"],
+        ["Total Income Actual", f"KD {total_income_actual:.2f}"],
+        ["Total Expense Budget", f"KD {total_expense_budget:.2f}"],
+        ["Total Expense Actual", f"KD {total_expense_actual:.2f}"],
+        ["Net Budget", f"KD {total_income_budget - total_expense_budget:.2f}"],
+        ["Net Actual", f"KD {total_income_actual - total_expense_actual:.2f}"]
+    ]
+    
+    # Create the summary table
+    summary_table = Table(summary_data, colWidths=[3*inch, 1.5*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Income and expense categories
+    for section, heading in [("income", "Income Budget"), ("expenses", "Expense Budget")]:
+        elements.append(Paragraph(heading, subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        table_data = [["Category", "Budget", "Actual", "Variance"]]
+        
+        for category, values in budget[section].items():
+            table_data.append([
+                category,
+                f"KD {values['budget']:.2f}",
+                f"KD {values['actual']:.2f}",
+                f"KD {values['actual'] - values['budget']:.2f}"
+            ])
+        
+        section_table = Table(table_data, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
+        section_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(section_table)
+        elements.append(Spacer(1, 0.2*inch))
+    
+    # Generate the PDF
+    return create_pdf_content("Budget Report", elements)
+
+@traced(input_rows=lambda report: len(report["monthly_breakdown"]))
+def create_ytd_report_pdf(report, month_name, year):
+    """Generate a PDF for the year-to-date report"""
+    styles = getSampleStyleSheet()
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    elements = []
+    
+    # Summary with the same period of the previous year
+    elements.append(Paragraph("Financial Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    previous = report["previous_year"]
+    summary_data = [
+        ["Metric", f"{year}", f"{year - 1}"],
+        ["Total Income", f"KD {report['total_income']:.2f}", f"KD {previous['total_income']:.2f}"],
+        ["Total Expenses", f"KD {report['total_expenses']:.2f}", f"KD {previous['total_expenses']:.2f}"],
+        ["Net", f"KD {report['net']:.2f}", f"KD {previous['net']:.2f}"]
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Month by month
+    elements.append(Paragraph("Monthly Breakdown", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    monthly_data = [["Month", "Income", "Expenses", "Net"]]
+    for row in report["monthly_breakdown"]:
+        monthly_data.append([
+            row["month"],
+            f"KD {row['income']:.2f}",
+            f"KD {row['expenses']:.2f}",
+            f"KD {row['net']:.2f}"
+        ])
+    
+    monthly_table = Table(monthly_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+    monthly_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(monthly_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Category totals
+    elements.append(Paragraph("Category Totals", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    if report["categories"]:
+        category_data = [["Category", "Income", "Expenses"]]
+        for category, values in sorted(report["categories"].items()):
+            category_data.append([
+                category,
+                f"KD {values['income']:.2f}",
+                f"KD {values['expenses']:.2f}"
+            ])
+        
+        category_table = Table(category_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
+        category_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(category_table)
+    else:
+        elements.append(Paragraph("No transactions for this period.", normal_style))
+    
+    # Generate the PDF
+    title = f"Year-to-Date Financial Report - January to {month_name} {year}"
+    return create_pdf_content(title, elements)
+
+@traced(input_rows=lambda report: len(report["initiatives"]))
+def create_fundraising_report_pdf(report):
+    """Generate a PDF for the fundraising results report"""
+    styles = getSampleStyleSheet()
+    subtitle_style = styles['Heading2']
+    normal_style = styles['Normal']
+    
+    elements = []
+    
+    # Overall summary
+    elements.append(Paragraph("Fundraising Summary", subtitle_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Goal", f"KD {report['total_goal']:.2f}"],
+        ["Total Raised", f"KD {report['total_raised']:.2f}"],
+        ["Total Expenses", f"KD {report['total_expenses']:.2f}"],
+        ["Net Proceeds", f"KD {report['total_net']:.2f}"],
+        ["Overall Goal Progress", f"{report['overall_progress']:.1f}%"],
+        ["Initiatives", f"{report['initiative_count']}"]
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[2.5*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Progress leaderboard
+    if report["leaderboard"]:
+        elements.append(Paragraph("Progress Leaderboard", subtitle_style))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        leaderboard_data = [["Rank", "Initiative", "Goal", "Raised", "Expenses", "Net", "Progress"]]
+        
+        for rank, initiative in enumerate(report["leaderboard"], start=1):
+            leaderboard_data.append([
+                str(rank),
+                initiative["name"],
+                f"KD {initiative['goal_amount']:.2f}",
+                f"KD {initiative['actual_raised']:.2f}",
+                f"KD {initiative['expenses']:.2f}",
+                f"KD {initiative['net_proceeds']:.2f}",
+                f"{initiative['progress']:.1f}%"
+            ])
+        
+        leaderboard_table = Table(leaderboard_data, colWidths=[0.5*inch, 1.6*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.8*inch])
+        leaderboard_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(leaderboard_table)
+    else:
+        elements.append(Paragraph("No fundraising initiatives found.", normal_style))
+    
+    # Generate the PDF
+    return create_pdf_content("Fundraising Results", elements)
@@ -0,0 +1,758 @@
+import array
+import collections.abc
+import datetime
+import json
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Arrow/Parquet export is optional
+    pa = pc = pq = None
+
+# Compact record storage
+# Transactions, events, participant payments and event expenses are kept column by
+# column instead of as one dict per row: numeric fields live in typed arrays and
+# the rest in plain lists, so no row repeats its key strings or boxes its numbers.
+# Rows are handed out as RecordView objects, which read and write like the dicts
+# the rest of the app was written against.
+
+# Column kinds. Money is held as integer fils (1 KD = 1000 fils) so sums are exact;
+# rows still read and write money fields in KD. Coded columns hold small integer
+# codes into a CodeTable named after the field, shared by every store using it.
+# Timestamps are integer microseconds since 1970-01-01 and dates are day numbers
+# (date.toordinal()); rows read them back as ISO strings.
+FLOAT = "d"
+INT = "q"
+MONEY = "fils"
+CODED = "code"
+TIMESTAMP = "timestamp"
+DATE = "date"
+OBJECT = None
+
+_TYPECODES = {FLOAT: "d", INT: "q", MONEY: "q", CODED: "i", TIMESTAMP: "q", DATE: "q"}
+
+# Stored in place of a missing or unparseable timestamp/date
+MISSING_TIMESTAMP = -2**63
+MISSING_DATE = 0
+_MISSING = {TIMESTAMP: MISSING_TIMESTAMP, DATE: MISSING_DATE}
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_DAY = _EPOCH.toordinal()
+
+FILS_PER_KD = 1000
+
+def to_fils(amount):
+    """Convert a KD amount to integer fils, rounding to the nearest fil"""
+    return round(float(amount or 0) * FILS_PER_KD)
+
+def fils_to_kd(fils):
+    """Convert integer fils to a KD amount for display and export"""
+    return int(fils) / FILS_PER_KD
+
+def group_sums(keys, values, size):
+    """Exact int64 sums of values per integer key in range(size): the values are
+    sorted by key and each run is summed with add.reduceat, never through floats"""
+    sums = np.zeros(size, dtype=np.int64)
+    if len(keys):
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sums[sorted_keys[starts]] = np.add.reduceat(values[order].astype(np.int64, copy=False), starts)
+    return sums
+
+def to_timestamp(moment):
+    """Convert a naive datetime to integer microseconds since 1970-01-01"""
+    return (moment - _EPOCH) // datetime.timedelta(microseconds=1)
+
+def from_timestamp(micros):
+    """Convert integer microseconds since 1970-01-01 back to a datetime"""
+    return _EPOCH + datetime.timedelta(microseconds=int(micros))
+
+def _parse_temporal(kind, value):
+    """Parse an ISO timestamp/date for storage.
+
+    Returns (stored integer, original value to keep), where the original is kept
+    only when it can't be rebuilt exactly from the integer, so backups round-trip.
+    """
+    if value is None:
+        return _MISSING[kind], None
+    try:
+        if kind == DATE:
+            parsed = datetime.date.fromisoformat(value)
+            stored = parsed.toordinal()
+        else:
+            parsed = datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+            stored = to_timestamp(parsed)
+    except (TypeError, ValueError):
+        return _MISSING[kind], value
+    return stored, (None if parsed.isoformat() == value else value)
+
+def _format_temporal(kind, stored):
+    if stored == _MISSING[kind]:
+        return None
+    if kind == DATE:
+        return datetime.date.fromordinal(stored).isoformat()
+    return from_timestamp(stored).isoformat()
+
+TRANSACTION_FIELDS = (
+    ("date", DATE),
+    ("description", OBJECT),
+    ("category", CODED),
+    ("income", MONEY),
+    ("expense", MONEY),
+    ("authorized_by", CODED),
+    ("receipt_num", OBJECT),
+    ("notes", OBJECT),
+    ("timestamp", TIMESTAMP),
+    ("event_id", OBJECT),
+    ("initiative_id", OBJECT)
+)
+
+EVENT_FIELDS = (
+    ("id", OBJECT),
+    ("name", OBJECT),
+    ("date", DATE),
+    ("location", OBJECT),
+    ("coordinator", OBJECT),
+    ("event_type", CODED),
+    ("price_per_person", MONEY),
+    ("target_participants", INT),
+    ("description", OBJECT),
+    ("projected_income", MONEY),
+    ("projected_expenses", MONEY),
+    ("actual_income", MONEY),
+    ("actual_expenses", MONEY),
+    ("income_sources", OBJECT),
+    ("expense_items", OBJECT),
+    ("status", OBJECT),
+    ("created_at", TIMESTAMP)
+)
+
+PARTICIPANT_FIELDS = (
+    ("id", OBJECT),
+    ("event_id", OBJECT),
+    ("participant_name", OBJECT),
+    ("payment_amount", MONEY),
+    ("payment_date", DATE),
+    ("payment_method", CODED),
+    ("notes", OBJECT),
+    ("timestamp", TIMESTAMP)
+)
+
+EXPENSE_FIELDS = (
+    ("id", OBJECT),
+    ("event_id", OBJECT),
+    ("description", OBJECT),
+    ("amount", MONEY),
+    ("date", DATE),
+    ("category", CODED),
+    ("paid_to", OBJECT),
+    ("receipt_num", OBJECT),
+    ("notes", OBJECT),
+    ("timestamp", TIMESTAMP)
+)
+
+# Arrow representation of each column kind. Money is a decimal holding the fils as its
+# unscaled value, coded fields are dictionary arrays and dates/timestamps are native
+# Arrow temporal types, so a table converts to and from the columns without going
+# through one Python object per row.
+MONEY_DECIMAL_PRECISION = 18
+_ARROW_METADATA_KEY = b"record_store"
+
+def _require_arrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet export")
+
+def _arrow_type(kind):
+    return {
+        FLOAT: pa.float64(),
+        INT: pa.int64(),
+        MONEY: pa.decimal128(MONEY_DECIMAL_PRECISION, 3),
+        TIMESTAMP: pa.timestamp("us"),
+        DATE: pa.date32()
+    }[kind]
+
+def _coerce(kind, value):
+    """Convert a value for storage in a column of the given kind (missing numbers become 0)"""
+    if kind is OBJECT:
+        return value
+    if kind == MONEY:
+        return to_fils(value)
+    if value is None or value == "":
+        return 0.0 if kind == FLOAT else 0
+    return float(value) if kind == FLOAT else int(value)
+
+class CodeTable:
+    """The distinct values of a dictionary-encoded field and their integer codes"""
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        """Return the code for a value, adding it to the table if it is new"""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def rename(self, old_value, new_value):
+        """Relabel a value; every row holding its code reads the new value"""
+        code = self.codes.pop(old_value)
+        self.values[code] = new_value
+        self.codes[new_value] = code
+
+class RecordView(collections.abc.Mapping):
+    """A dict-like view of one row of a RecordStore.
+
+    Reading and assigning keys goes straight to the store's columns. Views pickle
+    as plain dicts, so reports holding them can be sent to worker processes.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key):
+        return self._store.get_value(self._row, key)
+
+    def __setitem__(self, key, value):
+        self._store.set_value(self._row, key, value)
+
+    def __iter__(self):
+        return iter(self._store.row_keys(self._row))
+
+    def __len__(self):
+        return len(self._store.row_keys(self._row))
+
+    def fils(self, key):
+        """A money field as integer fils"""
+        return self._store.columns[key][self._row]
+
+    def raw(self, key):
+        """A field as stored: fils, a code, microseconds or a day number (None if missing)"""
+        return self._store.get_raw(self._row, key)
+
+    def to_dict(self):
+        """Copy the row into a plain dict"""
+        return {key: self[key] for key in self}
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+
+    def __repr__(self):
+        return f"RecordView({self.to_dict()!r})"
+
+class RecordStore:
+    """An append-only table of records stored column by column.
+
+    `fields` is a sequence of (name, kind) pairs, where kind is FLOAT, INT, MONEY,
+    CODED, TIMESTAMP, DATE or OBJECT. `code_tables` maps field names to the CodeTables of coded
+    fields; pass the same dict to several stores to share tables between them.
+    Keys outside the schema (e.g. from older backups) are kept per row in a sparse
+    side table so backups round-trip unchanged.
+    """
+    __slots__ = ("fields", "columns", "code_tables", "_kinds", "_extras", "_originals", "_length")
+
+    def __init__(self, fields, records=(), code_tables=None):
+        self.fields = tuple(fields)
+        self._kinds = dict(self.fields)
+        self.columns = {name: array.array(_TYPECODES[kind]) if kind else [] for name, kind in self.fields}
+        self.code_tables = code_tables if code_tables is not None else {}
+        for name, kind in self.fields:
+            if kind == CODED:
+                self.code_tables.setdefault(name, CodeTable())
+        self._extras = {}
+        self._originals = {}
+        self._length = 0
+        self.extend(records)
+
+    @classmethod
+    def from_records(cls, fields, records, code_tables=None):
+        """Build a store from a list of record dicts (e.g. a loaded JSON backup)"""
+        return cls(fields, records, code_tables)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return (RecordView(self, row) for row in range(self._length))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RecordView(self, row) for row in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return RecordView(self, index)
+
+    def append(self, record):
+        """Append a record dict and return the view of the stored row"""
+        row = self._length
+        for name, kind in self.fields:
+            value = record.get(name)
+            if kind == CODED:
+                self.columns[name].append(self.code_tables[name].encode(value))
+            elif kind in _MISSING:
+                stored, original = _parse_temporal(kind, value)
+                self.columns[name].append(stored)
+                if original is not None:
+                    self._originals[(row, name)] = original
+            else:
+                self.columns[name].append(_coerce(kind, value))
+        extra = {key: value for key, value in record.items() if key not in self._kinds}
+        if extra:
+            self._extras[row] = extra
+        self._length += 1
+        return RecordView(self, row)
+
+    def extend(self, records):
+        """Append several record dicts and return the views of the stored rows"""
+        return [self.append(record) for record in records]
+
+    def delete_rows(self, rows):
+        """Remove the rows of the given views, compacting every column.
+
+        Views handed out earlier point at the wrong rows afterwards, so anything
+        holding them must be rebuilt.
+        """
+        keep = np.ones(self._length, dtype=bool)
+        keep[self._positions(rows)] = False
+        new_rows = np.cumsum(keep) - 1
+        for name, kind in self.fields:
+            column = self.columns[name]
+            if kind is OBJECT:
+                self.columns[name] = [value for value, kept in zip(column, keep) if kept]
+            else:
+                self.columns[name] = array.array(column.typecode, np.frombuffer(column, dtype=column.typecode)[keep].tobytes())
+        self._originals = {(int(new_rows[row]), key): value for (row, key), value in self._originals.items() if keep[row]}
+        self._extras = {int(new_rows[row]): extra for row, extra in self._extras.items() if keep[row]}
+        self._length = int(keep.sum())
+
+    def get_value(self, row, key):
+        column = self.columns.get(key)
+        if column is not None:
+            kind = self._kinds[key]
+            if kind == MONEY:
+                return fils_to_kd(column[row])
+            if kind == CODED:
+                return self.code_tables[key].values[column[row]]
+            if kind in _MISSING:
+                original = self._originals.get((row, key))
+                return original if original is not None else _format_temporal(kind, column[row])
+            return column[row]
+        extra = self._extras.get(row)
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def set_value(self, row, key, value):
+        kind = self._kinds.get(key, OBJECT)
+        if kind == CODED:
+            self.columns[key][row] = self.code_tables[key].encode(value)
+        elif kind in _MISSING:
+            stored, original = _parse_temporal(kind, value)
+            self.columns[key][row] = stored
+            if original is None:
+                self._originals.pop((row, key), None)
+            else:
+                self._originals[(row, key)] = original
+        elif key in self._kinds:
+            self.columns[key][row] = _coerce(kind, value)
+        else:
+            self._extras.setdefault(row, {})[key] = value
+
+    def get_raw(self, row, key):
+        stored = self.columns[key][row]
+        kind = self._kinds[key]
+        if kind in _MISSING and stored == _MISSING[kind]:
+            return None
+        return stored
+
+    def row_keys(self, row):
+        keys = [name for name, _ in self.fields]
+        extra = self._extras.get(row)
+        if extra:
+            keys.extend(extra)
+        return keys
+
+    def _positions(self, rows):
+        return None if rows is None else np.fromiter((row._row for row in rows), dtype=np.int64)
+
+    def sum_fils(self, name, rows=None):
+        """Exact total of a money column in fils, over all rows or the given views"""
+        values = np.frombuffer(self.columns[name], dtype=np.int64)
+        positions = self._positions(rows)
+        return int(values.sum() if positions is None else values[positions].sum())
+
+    def _codes(self, name, positions):
+        codes = np.frombuffer(self.columns[name], dtype=np.int32)
+        return codes if positions is None else codes[positions]
+
+    def count_by(self, key_name, rows=None):
+        """Number of rows per value of a coded column, as {value: count}"""
+        table = self.code_tables[key_name]
+        counts = np.bincount(self._codes(key_name, self._positions(rows)), minlength=len(table))
+        return {table.values[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def group_sum_fils(self, key_name, value_names, rows=None):
+        """Exact money totals in fils per distinct value of a key column.
+
+        Returns {key: [total for each of value_names]}. Coded columns are grouped
+        by their codes with integer sums (group_sums); other columns are factorized first.
+        """
+        positions = self._positions(rows)
+        if self._kinds[key_name] == CODED:
+            table = self.code_tables[key_name]
+            codes = self._codes(key_name, positions)
+            counts = np.bincount(codes, minlength=len(table))
+            totals = []
+            for name in value_names:
+                values = np.frombuffer(self.columns[name], dtype=np.int64)
+                totals.append(group_sums(codes, values if positions is None else values[positions], len(table)))
+            return {table.values[code]: [int(t[code]) for t in totals] for code in range(len(table)) if counts[code]}
+
+        keys = self.columns[key_name]
+        if positions is not None:
+            keys = [keys[i] for i in positions]
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object), use_na_sentinel=False)
+        totals = np.zeros((len(uniques), len(value_names)), dtype=np.int64)
+        for j, name in enumerate(value_names):
+            values = np.frombuffer(self.columns[name], dtype=np.int64)
+            np.add.at(totals[:, j], codes, values if positions is None else values[positions])
+        return {key: [int(v) for v in totals[i]] for i, key in enumerate(uniques)}
+
+    def _values(self, name, positions):
+        values = np.frombuffer(self.columns[name], dtype=np.int64)
+        return values if positions is None else values[positions]
+
+    def column_array(self, name, rows=None):
+        """A numpy copy of a numeric, coded or temporal column as stored"""
+        dtype = {CODED: np.int32, FLOAT: np.float64}.get(self._kinds[name], np.int64)
+        values = np.array(self.columns[name], dtype=dtype)
+        positions = self._positions(rows)
+        return values if positions is None else values[positions]
+
+    def order_by(self, name, descending=False, limit=None, rows=None):
+        """Views sorted by the stored integers of a column (missing values sort first)"""
+        positions = self._positions(rows)
+        order = np.argsort(self._values(name, positions), kind="stable")
+        if descending:
+            order = order[::-1]
+        order = order[:limit]
+        if positions is not None:
+            order = positions[order]
+        return [RecordView(self, int(row)) for row in order]
+
+    def rows_between(self, name, low, high):
+        """Views whose stored integer for a column is in [low, high), in row order"""
+        values = self._values(name, None)
+        return [RecordView(self, int(row)) for row in np.flatnonzero((values >= low) & (values < high))]
+
+    def month_numbers(self, name, rows=None):
+        """Months since 1970-01 of a timestamp or date column, -1 where missing"""
+        values = self._values(name, self._positions(rows))
+        kind = self._kinds[name]
+        if kind == DATE:
+            moments = (values - _EPOCH_DAY).astype("datetime64[D]")
+        else:
+            moments = values.astype("datetime64[us]")
+        months = moments.astype("datetime64[M]").astype(np.int64)
+        months[values == _MISSING[kind]] = -1
+        return months
+
+    def to_records(self, rows=None):
+        """Plain dicts for all rows, or for the given views, in the backup format"""
+        rows = self if rows is None else rows
+        return [row.to_dict() for row in rows]
+
+    def to_frame(self, rows=None):
+        """A DataFrame built straight from the columns, optionally limited to the given views"""
+        positions = None if rows is None else [row._row for row in rows]
+        data = {}
+        for name, _ in self.fields:
+            column = self.columns[name]
+            if self._kinds[name] == MONEY:
+                values = np.frombuffer(column, dtype=np.int64)
+                data[name] = (values if positions is None else values[positions]) / FILS_PER_KD
+            elif self._kinds[name] == CODED:
+                data[name] = np.array(self.code_tables[name].values, dtype=object)[self._codes(name, positions)]
+            elif self._kinds[name] in _MISSING:
+                indices = range(self._length) if positions is None else positions
+                data[name] = [self.get_value(i, name) for i in indices]
+            else:
+                data[name] = list(column) if positions is None else [column[i] for i in positions]
+        extra_keys = {key for extra in self._extras.values() for key in extra}
+        for key in sorted(extra_keys):
+            indices = range(self._length) if positions is None else positions
+            data[key] = [self._extras.get(i, {}).get(key) for i in indices]
+        return pd.DataFrame(data)
+
+    def to_arrow(self, rows=None):
+        """A pyarrow Table built straight from the columns, optionally limited to the given views.
+
+        Original temporal strings and keys outside the schema travel in the schema
+        metadata, so from_arrow rebuilds the store exactly.
+        """
+        _require_arrow()
+        positions = self._positions(rows)
+        length = self._length if positions is None else len(positions)
+        arrays = {}
+        json_columns = []
+        for name, kind in self.fields:
+            if kind is OBJECT:
+                column = self.columns[name]
+                values = column if positions is None else [column[i] for i in positions]
+                try:
+                    arrays[name] = pa.array(values)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                    # Mixed-type values are kept as JSON text rather than guessed at
+                    arrays[name] = pa.array([json.dumps(value, default=str) for value in values], pa.string())
+                    json_columns.append(name)
+            elif kind == CODED:
+                arrays[name] = self._coded_to_arrow(name, positions)
+            elif kind == MONEY:
+                # Decimal128 is two little-endian int64 words per value: the fils, then the sign
+                values = self._values(name, positions)
+                words = np.empty((length, 2), dtype=np.int64)
+                words[:, 0] = values
+                words[:, 1] = values >> 63
+                arrays[name] = pa.Array.from_buffers(_arrow_type(kind), length, [None, pa.py_buffer(words)])
+            elif kind in _MISSING:
+                values = self._values(name, positions)
+                missing = values == _MISSING[kind]
+                if kind == DATE:
+                    values = (values - _EPOCH_DAY).astype(np.int32)
+                    arrays[name] = pa.array(values, pa.int32(), mask=missing).cast(pa.date32())
+                else:
+                    arrays[name] = pa.array(values, pa.int64(), mask=missing).cast(pa.timestamp("us"))
+            else:
+                arrays[name] = pa.array(self.column_array(name, rows), _arrow_type(kind))
+
+        originals, extras = self.annotations(rows)
+        metadata = {"fields": [list(field) for field in self.fields], "json_columns": json_columns,
+                    "originals": originals, "extras": extras}
+        return pa.table(arrays, metadata={_ARROW_METADATA_KEY: json.dumps(metadata, default=str)})
+
+    def annotations(self, rows=None):
+        """The original temporal strings and out-of-schema keys of all rows, or of the given views.
+
+        Returns ([[row, key, original], ...], {str(row): {key: value}}) with rows
+        numbered by position in the selection, for from_columns to restore.
+        """
+        positions = self._positions(rows)
+        output_row = None if positions is None else {row: i for i, row in enumerate(positions.tolist())}
+        originals = [[row if output_row is None else output_row[row], key, value]
+                     for (row, key), value in self._originals.items() if output_row is None or row in output_row]
+        extras = {str(row if output_row is None else output_row[row]): extra
+                  for row, extra in self._extras.items() if output_row is None or row in output_row}
+        return originals, extras
+
+    @classmethod
+    def from_columns(cls, fields, columns, length, code_tables=None, originals=(), extras=None):
+        """Build a store straight from stored column values, without per-row dicts.
+
+        `columns` maps field names to numpy arrays of stored values (fils, codes into
+        `code_tables`, microseconds, day numbers), or to lists for object fields.
+        Fields missing from it are filled as a record without them would be;
+        `originals` and `extras` are in the format annotations() returns.
+        """
+        store = cls(fields, (), code_tables)
+        for name, kind in store.fields:
+            if name not in columns:
+                store._fill_missing(name, length)
+            elif kind is OBJECT:
+                store.columns[name] = list(columns[name])
+            else:
+                dtype = {CODED: np.int32, FLOAT: np.float64}.get(kind, np.int64)
+                store.columns[name] = array.array(_TYPECODES[kind], np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        store._length = length
+        store._originals = {(int(row), key): value for row, key, value in originals}
+        store._extras = {int(row): extra for row, extra in (extras or {}).items()}
+        return store
+
+    def _coded_to_arrow(self, name, positions):
+        """A dictionary array holding only the values the selected rows use (None becomes null)"""
+        table = self.code_tables[name]
+        codes = self._codes(name, positions)
+        used, indices = np.unique(codes, return_inverse=True)
+        values = [table.values[code] for code in used]
+        missing = np.array([value is None for value in values], dtype=bool)
+        dictionary = pa.array(["" if value is None else value for value in values])
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices.astype(np.int32), pa.int32(), mask=missing[indices] if missing.any() else None),
+            dictionary
+        )
+
+    @classmethod
+    def from_arrow(cls, fields, table, code_tables=None):
+        """Build a store from a pyarrow Table written by to_arrow, without per-row dicts.
+
+        Schema fields missing from the table are filled as a record without them would be.
+        """
+        _require_arrow()
+        code_tables = {} if code_tables is None else code_tables
+        raw_metadata = (table.schema.metadata or {}).get(_ARROW_METADATA_KEY)
+        metadata = json.loads(raw_metadata) if raw_metadata else {}
+        json_columns = set(metadata.get("json_columns", ()))
+        columns = {}
+
+        for name, kind in fields:
+            if name not in table.column_names:
+                continue
+            chunks = table.column(name).chunks
+            if kind is OBJECT:
+                values = table.column(name).to_pylist()
+                if name in json_columns:
+                    values = [json.loads(value) for value in values]
+            elif kind == CODED:
+                code_table = code_tables.setdefault(name, CodeTable())
+                parts = []
+                for chunk in chunks:
+                    if not pa.types.is_dictionary(chunk.type):
+                        chunk = chunk.dictionary_encode()
+                    mapping = np.array([code_table.encode(value) for value in chunk.dictionary.to_pylist()] or [0], dtype=np.int32)
+                    indices = pc.fill_null(chunk.indices, 0).to_numpy(zero_copy_only=False)
+                    codes = mapping[indices]
+                    if chunk.null_count:
+                        codes[chunk.is_null().to_numpy(zero_copy_only=False)] = code_table.encode(None)
+                    parts.append(codes)
+                values = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+            elif kind == MONEY:
+                parts = []
+                for chunk in chunks:
+                    chunk = chunk.cast(_arrow_type(kind))
+                    words = np.frombuffer(chunk.buffers()[1], dtype=np.int64).reshape(-1, 2)
+                    fils = words[chunk.offset:chunk.offset + len(chunk), 0].copy()
+                    if chunk.null_count:
+                        fils[chunk.is_null().to_numpy(zero_copy_only=False)] = 0
+                    parts.append(fils)
+                values = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+            elif kind in _MISSING:
+                column = table.column(name).cast(_arrow_type(kind))
+                if kind == DATE:
+                    column = column.cast(pa.int32())
+                column = column.cast(pa.int64())
+                values = np.array(pc.fill_null(column, 0).to_numpy(), dtype=np.int64)
+                if kind == DATE:
+                    values = values + _EPOCH_DAY
+                missing = column.is_null().to_numpy()
+                values[missing] = _MISSING[kind]
+            else:
+                values = pc.fill_null(table.column(name).cast(_arrow_type(kind)), 0).to_numpy()
+            columns[name] = values
+
+        return cls.from_columns(fields, columns, table.num_rows, code_tables,
+                                metadata.get("originals", ()), metadata.get("extras"))
+
+    def _fill_missing(self, name, count):
+        """Fill a column with `count` missing values, as append does for an absent key"""
+        kind = self._kinds[name]
+        if kind is OBJECT:
+            self.columns[name].extend([None] * count)
+        elif kind == CODED:
+            self.columns[name].extend([self.code_tables[name].encode(None)] * count)
+        elif kind in _MISSING:
+            self.columns[name].extend([_MISSING[kind]] * count)
+        else:
+            self.columns[name].extend([_coerce(kind, None)] * count)
+
+    def write_parquet(self, where, rows=None):
+        """Write all rows, or the given views, to a Parquet file path or binary file object"""
+        _require_arrow()
+        pq.write_table(self.to_arrow(rows), where)
+
+    @classmethod
+    def read_parquet(cls, fields, source, code_tables=None):
+        """Build a store from a Parquet file written by write_parquet"""
+        _require_arrow()
+        return cls.from_arrow(fields, pq.read_table(source), code_tables)
+
+def _sample_transactions(count):
+    """Generate transaction dicts shaped like the ones add_transaction records"""
+    categories = ["Trip Payments", "Fundraising Events", "Event Expenses", "Merchandise Sales", "Transportation"]
+    for i in range(count):
+        day = 1 + i % 28
+        yield {
+            "date": f"2025-{1 + i % 12:02d}-{day:02d}",
+            "description": f"Payment {i} for Science Trip",
+            "category": categories[i % len(categories)],
+            "income": float(i % 50),
+            "expense": float(i % 7),
+            "authorized_by": "Treasurer",
+            "receipt_num": f"R{i}",
+            "notes": "",
+            "timestamp": f"2025-{1 + i % 12:02d}-{day:02d}T10:{i % 60:02d}:{i % 60:02d}.{i % 1000000:06d}",
+            "event_id": None,
+            "initiative_id": None
+        }
+
+def compare_memory(counts=(100_000, 1_000_000)):
+    """Measure the memory taken by `count` transactions as dicts and as a RecordStore"""
+    import tracemalloc
+
+    results = []
+    for count in counts:
+        tracemalloc.start()
+        rows = list(_sample_transactions(count))
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        del rows
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        store = RecordStore(TRANSACTION_FIELDS, _sample_transactions(count))
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        del store
+        tracemalloc.stop()
+
+        results.append({"rows": count, "dict_bytes": dict_bytes, "store_bytes": store_bytes})
+    return results
+
+def compare_snapshot_speed(count=100_000):
+    """Time saving and reloading `count` transactions as a JSON backup and as Parquet"""
+    import io
+    import time
+
+    store = RecordStore(TRANSACTION_FIELDS, _sample_transactions(count))
+    timings = {}
+
+    start = time.perf_counter()
+    text = json.dumps(store.to_records())
+    timings["json_save"] = time.perf_counter() - start
+    start = time.perf_counter()
+    RecordStore.from_records(TRANSACTION_FIELDS, json.loads(text))
+    timings["json_load"] = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    store.write_parquet(buffer)
+    timings["parquet_save"] = time.perf_counter() - start
+    buffer.seek(0)
+    start = time.perf_counter()
+    RecordStore.read_parquet(TRANSACTION_FIELDS, buffer)
+    timings["parquet_load"] = time.perf_counter() - start
+
+    timings["json_bytes"] = len(text.encode())
+    timings["parquet_bytes"] = buffer.getbuffer().nbytes
+    return timings
+
+if __name__ == "__main__":
+    for result in compare_memory():
+        print(f"{result['rows']:>9,} rows: dicts {result['dict_bytes'] / 2**20:8.1f} MiB, "
+              f"store {result['store_bytes'] / 2**20:8.1f} MiB "
+              f"({result['store_bytes'] / result['dict_bytes']:.0%})")
+    if pa is not None:
+        timings = compare_snapshot_speed()
+        print(f"  100,000 rows: JSON save {timings['json_save']:.2f}s load {timings['json_load']:.2f}s "
+              f"({timings['json_bytes'] / 2**20:.1f} MiB), Parquet save {timings['parquet_save']:.2f}s "
+              f"load {timings['parquet_load']:.2f}s ({timings['parquet_bytes'] / 2**20:.1f} MiB)")
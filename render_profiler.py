@@ -0,0 +1,111 @@
+import bisect
+import collections
+import contextlib
+import datetime
+import json
+import threading
+import time
+
+# Rerun profiler
+# Wall time of every rerun, of each page function and of the sections within it.
+# A page is timed with `with profiler.page("dashboard"):` around its function;
+# inside it, profiler.section("Cash Flow") marks where the next section starts, so
+# a section runs from its mark to the next one (or to the end of the page) and a
+# page's code needs no re-indenting to be split up. Code before the first mark is
+# timed as the "(start)" section.
+#
+# The last `window` timings of each page and section are kept, so the figures
+# follow recent reruns; percentiles and the histogram are computed from them.
+# Each session's script runs on its own thread, so the open page is kept per
+# thread and the timings are shared under a lock.
+
+WINDOW = 500
+# Upper edges of the histogram buckets, in milliseconds (the last bucket is open)
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+PAGE_TOTAL = "(total)"
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class RenderProfiler:
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counts = collections.Counter()
+        self._open = threading.local()
+        self.started = datetime.datetime.now()
+
+    def record(self, page, section, seconds):
+        with self._lock:
+            key = (page, section)
+            if key not in self._timings:
+                self._timings[key] = collections.deque(maxlen=self.window)
+            self._timings[key].append(seconds * 1000)
+            self._counts[key] += 1
+
+    @contextlib.contextmanager
+    def page(self, name):
+        """Time a page function, and the sections marked within it"""
+        started = time.perf_counter()
+        outer = getattr(self._open, "page", None)
+        self._open.page = [name, "(start)", started]
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            _, section, section_started = self._open.page
+            self._open.page = outer
+            # A page without marks is a single section, already timed by its total
+            if section_started != started:
+                self.record(name, section, finished - section_started)
+            self.record(name, PAGE_TOTAL, finished - started)
+
+    def section(self, name):
+        """End the page's current section and start the next (a no-op outside a page)"""
+        current = getattr(self._open, "page", None)
+        if current is None:
+            return
+        now = time.perf_counter()
+        page, section, started = current
+        self.record(page, section, now - started)
+        current[1:] = [name, now]
+
+    def summary(self):
+        """Per page and section: reruns timed, and the mean, percentiles and histogram of the window"""
+        with self._lock:
+            timings = {key: list(values) for key, values in self._timings.items()}
+            counts = dict(self._counts)
+        rows = []
+        for (page, section), values in sorted(timings.items()):
+            ordered = sorted(values)
+            histogram = [0] * (len(BUCKETS_MS) + 1)
+            for value in values:
+                histogram[bisect.bisect_left(BUCKETS_MS, value)] += 1
+            rows.append({
+                "page": page,
+                "section": section,
+                "count": counts[(page, section)],
+                "window": len(values),
+                "mean_ms": round(sum(values) / len(values), 2),
+                "p50_ms": round(_percentile(ordered, 0.5), 2),
+                "p90_ms": round(_percentile(ordered, 0.9), 2),
+                "p99_ms": round(_percentile(ordered, 0.99), 2),
+                "max_ms": round(ordered[-1], 2),
+                "histogram": histogram
+            })
+        return rows
+
+    def to_json(self):
+        return json.dumps({
+            "since": self.started.isoformat(timespec="seconds"),
+            "window": self.window,
+            "buckets_ms": BUCKETS_MS + ["+Inf"],
+            "timings": self.summary()
+        }, indent=4)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counts.clear()
+            self.started = datetime.datetime.now()
@@ -0,0 +1,92 @@
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import zipfile
+import pandas as pd
+import tracing
+from pdf_reports import create_monthly_report_pdf, create_event_report_pdf, create_all_events_report_pdf, create_budget_report_pdf, create_ytd_report_pdf, create_fundraising_report_pdf
+
+# Report pack generation
+# Each artifact is described by a plain job dict ({"kind", "filename", "payload"})
+# so it can be pickled to a worker process and hashed for the artifact cache.
+
+def artifact_cache_key(job):
+    """Build a stable cache key from an artifact's kind, filename and payload.
+
+    The "Generated on" time printed in a PDF is not part of the payload, so a
+    cached PDF keeps the time it was first rendered: the figures it shows have
+    not changed since then.
+    """
+    payload = json.dumps(job["payload"], sort_keys=True, default=str)
+    return hashlib.sha256(f"{job['kind']}:{job['filename']}:{payload}".encode()).hexdigest()
+
+def render_artifact(job):
+    """Render a single report pack artifact and return (filename, bytes)"""
+    kind = job["kind"]
+    payload = job["payload"]
+
+    if kind == "monthly_pdf":
+        data = create_monthly_report_pdf(payload["report"], payload["month_name"], payload["year"])
+    elif kind == "ytd_pdf":
+        data = create_ytd_report_pdf(payload["report"], payload["month_name"], payload["year"])
+    elif kind == "event_pdf":
+        data = create_event_report_pdf(payload)
+    elif kind == "all_events_pdf":
+        data = create_all_events_report_pdf(payload)
+    elif kind == "fundraising_pdf":
+        data = create_fundraising_report_pdf(payload)
+    elif kind == "budget_pdf":
+        data = create_budget_report_pdf(payload)
+    elif kind == "csv":
+        data = pd.DataFrame(payload["rows"], columns=payload["columns"]).to_csv(index=False).encode()
+    else:
+        raise ValueError(f"Unknown artifact kind: {kind}")
+
+    return job["filename"], data
+
+def _render_in_worker(job):
+    """render_artifact in a worker process, returning the metrics it traced with the artifact"""
+    filename, data = render_artifact(job)
+    return filename, data, tracing.drain()
+
+def build_report_pack(jobs, cache=None, progress_callback=None, max_workers=None):
+    """Render all jobs in worker processes and stream them into one ZIP archive.
+
+    Artifacts found in `cache` (cache key -> bytes) are reused instead of being
+    rendered again; newly rendered artifacts are added to it. Returns the ZIP bytes.
+    """
+    cache = cache if cache is not None else {}
+    total = len(jobs)
+    done = 0
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        pending = {}
+        for job in jobs:
+            key = artifact_cache_key(job)
+            if key in cache:
+                archive.writestr(job["filename"], cache[key])
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, job["filename"])
+            else:
+                pending[key] = job
+
+        if pending:
+            workers = max_workers or min(len(pending), os.cpu_count() or 1)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_render_in_worker, job): key for key, job in pending.items()}
+
+                # Write each artifact as soon as its worker finishes
+                for future in concurrent.futures.as_completed(futures):
+                    filename, data, metrics = future.result()
+                    tracing.merge(metrics)
+                    cache[futures[future]] = data
+                    archive.writestr(filename, data)
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total, filename)
+
+    return buffer.getvalue()
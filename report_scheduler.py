@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from report_pack import artifact_cache_key, render_artifact
+
+# Recurring report precomputation
+# The reports people ask for again and again (last month's report, the all-events
+# summary and the budget report) are prepared ahead of time. Whenever the data
+# changes, the app hands the scheduler the reports' data, built as report pack jobs
+# (see finance_core.build_recurring_report_jobs). Once no new data has arrived for
+# settle_delay seconds, their PDFs are rendered on a background thread, so a burst
+# of edits costs one rendering at the end. A report whose content did not change
+# keeps its PDF (matched by content hash) instead of being rendered again.
+#
+# Results are tagged with the data version they were built from; the report
+# buttons only use a result for the current version and the same parameters, and
+# otherwise generate the report as before.
+#
+# Outside the app, `finance_cli.py precompute` writes the same reports to files
+# (write_reports), for a cron job to keep them ready for other tools.
+
+SETTLE_DELAY = 10.0
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+class ReportScheduler:
+    def __init__(self, settle_delay=SETTLE_DELAY):
+        self.settle_delay = settle_delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._results = {}
+
+    def schedule(self, version, jobs):
+        """Take the reports built for a data version ({name: job}) and render their
+        PDFs once settle_delay seconds pass without another call"""
+        with self._lock:
+            rendered = {result["key"]: result["pdf"] for result in self._results.values() if result["pdf"] is not None}
+            results = {}
+            for name, job in jobs.items():
+                key = artifact_cache_key(job)
+                results[name] = {
+                    "version": version,
+                    "params": job["params"],
+                    "data": job["data"],
+                    "key": key,
+                    "job": job,
+                    "pdf": rendered.get(key)
+                }
+            self._results = results
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.settle_delay, self.render_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def render_pending(self):
+        """Render every PDF that is not ready yet (runs on the timer thread)"""
+        with self._lock:
+            pending = [(name, result) for name, result in self._results.items() if result["pdf"] is None]
+        for name, result in pending:
+            pdf = render_artifact(result["job"])[1]
+            with self._lock:
+                # Newer data may have replaced the result while it was being rendered
+                if self._results.get(name) is result:
+                    result["pdf"] = pdf
+
+    def get(self, name, version):
+        """A report's result ({"params", "data", "pdf"}, pdf None until rendered) if it was built for `version`"""
+        with self._lock:
+            result = self._results.get(name)
+        if result is None or result["version"] != version:
+            return None
+        return result
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+def _json_default(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+def _write_atomic(path, data):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+def write_reports(jobs, root=REPORTS_DIR):
+    """Write each report ({name: job}) as <name>.json (parameters and data) and <name>.pdf"""
+    os.makedirs(root, exist_ok=True)
+    written = []
+    for name, job in jobs.items():
+        data = json.dumps({"params": job["params"], "data": job["data"]}, indent=4, default=_json_default)
+        _write_atomic(os.path.join(root, f"{name}.json"), data.encode())
+        _write_atomic(os.path.join(root, f"{name}.pdf"), render_artifact(job)[1])
+        written.extend([f"{name}.json", f"{name}.pdf"])
+    return written
@@ -0,0 +1,107 @@
+import html
+import json
+import os
+import shutil
+import threading
+
+# Static site publishing
+# The dashboard, budget summary and event summaries can be published as plain
+# HTML pages with a JSON file of the same figures beside each, so people who only
+# need to look at them can be served by any file server instead of holding a
+# Streamlit session open. Every file is written to a temporary name and moved into
+# place with os.replace, so a reader sees either the old file or the new one,
+# never a partly written one. The JSON files are replaced before the pages that
+# link to them, and index.html last.
+#
+# The app republishes the site at the end of every admin run that changed the
+# data through that session; a session that has only loaded the state never
+# rewrites it, so a new (or empty) session can't replace what was published.
+# There is no timer in the app: data written outside it (the ingestion
+# service, imports) reaches the site through `finance_cli.py publish`, which is
+# meant to be run from cron, e.g. every few minutes.
+
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "site")
+
+# Sessions of one app process share the files
+_lock = threading.Lock()
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 960px; padding: 0 1em; color: #222; }
+nav a { margin-right: 1em; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1.5em; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.4em; text-align: left; }
+.metrics { display: flex; gap: 2em; margin-bottom: 1.5em; }
+.metric .value { font-size: 1.6em; }
+footer { color: #777; font-size: 0.85em; }
+"""
+
+# (file name, title) of the published pages, in navigation order
+PAGES = [("index.html", "Dashboard"), ("budget.html", "Budget"), ("events.html", "Events")]
+
+def site_exists(root=SITE_DIR):
+    return os.path.isfile(os.path.join(root, "index.html"))
+
+def render_page(title, sections, published_at, data_file=None):
+    """Render a page from a list of sections.
+
+    Each section is a dict with a "heading" and either "metrics" ((label, value)
+    pairs), "columns" and "rows" for a table, or "text".
+    """
+    escape = html.escape
+    parts = [
+        "<!DOCTYPE html>",
+        f"<html><head><meta charset=\"utf-8\"><title>{escape(title)}</title><style>{STYLE}</style></head><body>",
+        "<nav>" + "".join(f"<a href=\"{name}\">{escape(label)}</a>" for name, label in PAGES) + "</nav>",
+        f"<h1>{escape(title)}</h1>"
+    ]
+    for section in sections:
+        parts.append(f"<h2>{escape(section['heading'])}</h2>")
+        if "metrics" in section:
+            parts.append("<div class=\"metrics\">" + "".join(
+                f"<div class=\"metric\"><div>{escape(label)}</div><div class=\"value\">{escape(str(value))}</div></div>"
+                for label, value in section["metrics"]) + "</div>")
+        elif "columns" in section:
+            if section["rows"]:
+                parts.append("<table><tr>" + "".join(f"<th>{escape(column)}</th>" for column in section["columns"]) + "</tr>")
+                for row in section["rows"]:
+                    parts.append("<tr>" + "".join(f"<td>{escape(str(value))}</td>" for value in row) + "</tr>")
+                parts.append("</table>")
+            else:
+                parts.append("<p>Nothing to show.</p>")
+        else:
+            parts.append(f"<p>{escape(section['text'])}</p>")
+    footer = f"Published {escape(published_at)}"
+    if data_file:
+        footer += f" &middot; <a href=\"{data_file}\">{escape(data_file)}</a>"
+    parts.append(f"<footer>{footer}</footer></body></html>")
+    return "\n".join(parts)
+
+def _write_atomic(path, data):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+def write_site(files, root=SITE_DIR):
+    """Publish {file name: text} into the site directory, each file replaced atomically"""
+    # Data first, then the pages, then the entry page
+    order = sorted(files, key=lambda name: (name == "index.html", name.endswith(".html"), name))
+    with _lock:
+        os.makedirs(root, exist_ok=True)
+        for name in order:
+            _write_atomic(os.path.join(root, name), files[name].encode())
+
+def render_json(data):
+    return json.dumps(data, indent=4, default=str)
+
+def site_files(root=SITE_DIR):
+    """(file count, bytes on disk) of the published site"""
+    names = [name for name in os.listdir(root) if not name.endswith(".tmp")] if os.path.isdir(root) else []
+    return len(names), sum(os.path.getsize(os.path.join(root, name)) for name in names)
+
+def remove_site(root=SITE_DIR):
+    """Stop publishing, deleting the published files"""
+    with _lock:
+        shutil.rmtree(root, ignore_errors=True)
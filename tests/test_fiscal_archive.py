@@ -0,0 +1,49 @@
+import functools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import finance_core
+import fiscal_archive
+from finance_core import State, use_state
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    """A state without the ledger file, archiving to a temporary directory"""
+    for name in ["is_archived", "read_summaries", "read_year", "rename_category", "write_year"]:
+        monkeypatch.setattr(finance_core, name, functools.partial(getattr(fiscal_archive, name), root=str(tmp_path)))
+    return use_state(State(ledger_file=False))
+
+
+def transaction(category, income, timestamp):
+    return {
+        "date": timestamp[:10], "description": "Payment", "category": category, "income": income, "expense": 0.0,
+        "authorized_by": "Chair", "receipt_num": "", "notes": "", "timestamp": timestamp,
+        "event_id": None, "initiative_id": None
+    }
+
+
+def test_rename_category_relabels_closed_years(state, tmp_path):
+    finance_core.load_archive()
+    finance_core.commit_transactions([
+        transaction("Sponsorships", 100.0, "2024-03-01T10:00:00"),
+        transaction("Sponsorships", 10.0, "2025-03-01T10:00:00")
+    ])
+    assert finance_core.close_fiscal_year(2024)[0]
+
+    ok, message = finance_core.rename_budget_category("income", "Sponsorships", "Sponsors")
+    assert ok, message
+
+    # A new session folds the archived summaries in again
+    finance_core.load_archive()
+    assert state.budget["income"]["Sponsors"]["actual"] == 110.0
+    assert state.budget["income"]["Other Income"]["actual"] == 0
+    assert "Sponsors" in state.monthly_totals[2024]["categories"]
+    assert "Sponsorships" not in fiscal_archive.read_summaries(str(tmp_path))[2024]["categories"]
+
+    archived = finance_core.get_archived_stores(2024)["transactions"]
+    assert [t["category"] for t in archived] == ["Sponsors"]
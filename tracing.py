@@ -0,0 +1,190 @@
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# Hot-path tracing
+# Call counts, latency histograms, rows processed and bytes produced of the
+# domain's hot paths (recording transactions, generating reports, building PDFs,
+# saving and loading backups), kept per process and written as a Prometheus text
+# file for a local scraper, e.g. node_exporter's textfile collector pointed at
+# metrics/:
+#
+#     @traced(rows=lambda report: len(report["transactions"]))
+#     def generate_monthly_report(month=None, year=None): ...
+#
+#     with span("save_data") as traced_call:
+#         ...
+#         traced_call.bytes += len(data)
+#
+# Rows are counted from a function's result (rows=) or its first argument
+# (input_rows=); a function returning bytes produces that many bytes. Calls that
+# raise are counted as errors and still timed.
+#
+# Worker processes start with empty metrics; whatever they trace is handed back
+# with drain() and added to the parent's with merge() (see report_pack).
+#
+# Each process (the app, the API server, the ingestion service, a CLI run) counts
+# from zero, so each writes its own file, metrics/finance-<role>-<pid>.prom, with
+# role and pid labels on every series. The collector reads every file in the
+# directory; totals across processes are a sum in the query, e.g.
+# sum by (function) (finance_calls_total). Files of processes that have stopped
+# keep their last values until they are deleted (e.g. by cron, once old).
+
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics")
+# Upper edges of the latency histogram buckets, in seconds
+BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+_lock = threading.Lock()
+_metrics = {}
+_changed = False
+_written = 0.0
+
+class Span:
+    """One traced call; rows and bytes can be added while it runs"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+
+def _observe(call, seconds, failed):
+    global _changed
+    with _lock:
+        metric = _metrics.get(call.name)
+        if metric is None:
+            metric = _metrics[call.name] = {"calls": 0, "errors": 0, "seconds": 0.0, "buckets": [0] * (len(BUCKETS) + 1), "rows": 0, "bytes": 0}
+        metric["calls"] += 1
+        metric["errors"] += failed
+        metric["seconds"] += seconds
+        metric["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+        metric["rows"] += call.rows
+        metric["bytes"] += call.bytes
+        _changed = True
+
+@contextlib.contextmanager
+def span(name):
+    """Trace a block of code under a name"""
+    call = Span(name)
+    started = time.perf_counter()
+    failed = True
+    try:
+        yield call
+        failed = False
+    finally:
+        _observe(call, time.perf_counter() - started, failed)
+
+def traced(rows=None, input_rows=None):
+    """Decorator tracing every call of a function under its name"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(function.__name__) as call:
+                if input_rows and args:
+                    call.rows += input_rows(args[0])
+                result = function(*args, **kwargs)
+                if rows and result is not None:
+                    call.rows += rows(result)
+                if isinstance(result, bytes):
+                    call.bytes += len(result)
+                return result
+        return wrapper
+    return decorate
+
+def _reset_after_fork():
+    # A forked worker must not count its parent's calls again, nor wait on a lock
+    # another of the parent's threads held at the fork
+    global _lock, _metrics, _changed
+    _lock = threading.Lock()
+    _metrics = {}
+    _changed = False
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def drain():
+    """The metrics traced so far, clearing them (for a worker to hand to its parent)"""
+    global _metrics
+    with _lock:
+        metrics, _metrics = _metrics, {}
+    return metrics
+
+def merge(metrics):
+    """Add metrics traced in another process"""
+    global _changed
+    if not metrics:
+        return
+    with _lock:
+        for name, other in metrics.items():
+            metric = _metrics.get(name)
+            if metric is None:
+                _metrics[name] = {**other, "buckets": list(other["buckets"])}
+                continue
+            for key in ("calls", "errors", "seconds", "rows", "bytes"):
+                metric[key] += other[key]
+            metric["buckets"] = [mine + theirs for mine, theirs in zip(metric["buckets"], other["buckets"])]
+        _changed = True
+
+def snapshot():
+    """The metrics so far, by traced name"""
+    with _lock:
+        return {name: {**metric, "buckets": list(metric["buckets"])} for name, metric in _metrics.items()}
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def metrics_file(role):
+    """This process's metrics file, e.g. metrics/finance-app-1234.prom"""
+    return os.path.join(METRICS_DIR, f"finance-{role}-{os.getpid()}.prom")
+
+def render_prometheus(metrics=None, role=None):
+    """The metrics in the Prometheus text exposition format, with role and pid
+    labels on every series when a role is given"""
+    metrics = snapshot() if metrics is None else metrics
+    names = sorted(metrics)
+    process = f',role="{_label(role)}",pid="{os.getpid()}"' if role else ""
+    lines = []
+
+    def counter(metric, key, description):
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for name in names:
+            lines.append(f'{metric}{{function="{_label(name)}"{process}}} {metrics[name][key]}')
+
+    counter("finance_calls_total", "calls", "Calls of a traced function")
+    counter("finance_errors_total", "errors", "Calls of a traced function that raised")
+    counter("finance_rows_processed_total", "rows", "Rows (transactions, events, report lines) processed by a traced function")
+    counter("finance_bytes_produced_total", "bytes", "Bytes produced by a traced function (PDFs, backups)")
+
+    lines.append("# HELP finance_call_duration_seconds Wall time of a traced function")
+    lines.append("# TYPE finance_call_duration_seconds histogram")
+    for name in names:
+        metric = metrics[name]
+        label = f'function="{_label(name)}"{process}'
+        cumulative = 0
+        for edge, count in zip(BUCKETS + ["+Inf"], metric["buckets"]):
+            cumulative += count
+            lines.append(f'finance_call_duration_seconds_bucket{{{label},le="{edge}"}} {cumulative}')
+        lines.append(f'finance_call_duration_seconds_sum{{{label}}} {metric["seconds"]:.6f}')
+        lines.append(f'finance_call_duration_seconds_count{{{label}}} {metric["calls"]}')
+    return "\n".join(lines) + "\n"
+
+def write_metrics(role, path=None, min_interval=0.0):
+    """Write this process's metrics file (metrics_file(role) unless a path is given)
+    if anything was traced since the last write, at most every min_interval seconds;
+    replaced atomically, so a scraper never reads half a file"""
+    global _changed, _written
+    now = time.monotonic()
+    with _lock:
+        if not _changed or now - _written < min_interval:
+            return False
+        _changed = False
+        _written = now
+    path = path or metrics_file(role)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        f.write(render_prometheus(role=role))
+    os.replace(temporary, path)
+    return True